@@ -13,7 +13,10 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
 
 from core.config import settings
 from core.database import Base
-from models.seo_report import SEOReport
+from models.seo_report import SEOReport, InflightReport
+from models.batch_report import BatchReport
+from models.watched_url import WatchedURL
+from models.report_link import ReportLink
 
 config = context.config
 
@@ -0,0 +1,40 @@
+"""Partial unique index on in-flight reports per URL
+
+Revision ID: 002_inflight_url_unique
+Revises: 001_initial
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '002_inflight_url_unique'
+down_revision = '001_initial'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing duplicates would block the index; keep the oldest in-flight row per URL.
+    op.execute("""
+        UPDATE seo_reports
+        SET status = 'failed',
+            error_message = 'Superseded by an earlier in-flight analysis of the same URL.'
+        WHERE status IN ('pending', 'processing')
+          AND id NOT IN (
+              SELECT min(id) FROM seo_reports
+              WHERE status IN ('pending', 'processing')
+              GROUP BY url
+          )
+    """)
+    op.create_index(
+        'uq_seo_reports_inflight_url',
+        'seo_reports',
+        ['url'],
+        unique=True,
+        postgresql_where=sa.text("status IN ('pending', 'processing')"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_seo_reports_inflight_url', table_name='seo_reports')
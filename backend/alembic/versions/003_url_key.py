@@ -0,0 +1,77 @@
+"""Add hashed canonical url_key and move URL indexes onto it
+
+Revision ID: 003_url_key
+Revises: 002_inflight_url_unique
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from services.url_utils import compute_url_key
+
+revision = '003_url_key'
+down_revision = '002_inflight_url_unique'
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH_SIZE = 5000
+
+
+def upgrade() -> None:
+    op.add_column('seo_reports', sa.Column('url_key', sa.String(length=32), nullable=True))
+
+    conn = op.get_bind()
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.text("SELECT id, url FROM seo_reports WHERE id > :last_id ORDER BY id LIMIT :limit"),
+            {"last_id": last_id, "limit": BACKFILL_BATCH_SIZE},
+        ).fetchall()
+        if not rows:
+            break
+        conn.execute(
+            sa.text("UPDATE seo_reports SET url_key = :url_key WHERE id = :id"),
+            [{"id": row.id, "url_key": compute_url_key(row.url)} for row in rows],
+        )
+        last_id = rows[-1].id
+
+    op.alter_column('seo_reports', 'url_key', nullable=False)
+
+    # URLs that were distinct before canonicalization may now collide while in flight.
+    op.execute("""
+        UPDATE seo_reports
+        SET status = 'failed',
+            error_message = 'Superseded by an earlier in-flight analysis of the same URL.'
+        WHERE status IN ('pending', 'processing')
+          AND id NOT IN (
+              SELECT min(id) FROM seo_reports
+              WHERE status IN ('pending', 'processing')
+              GROUP BY url_key
+          )
+    """)
+
+    op.drop_index('uq_seo_reports_inflight_url', table_name='seo_reports')
+    op.drop_index('ix_seo_reports_url', table_name='seo_reports')
+    op.create_index('ix_seo_reports_url_key', 'seo_reports', ['url_key'], unique=False)
+    op.create_index(
+        'uq_seo_reports_inflight_url_key',
+        'seo_reports',
+        ['url_key'],
+        unique=True,
+        postgresql_where=sa.text("status IN ('pending', 'processing')"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_seo_reports_inflight_url_key', table_name='seo_reports')
+    op.drop_index('ix_seo_reports_url_key', table_name='seo_reports')
+    op.create_index('ix_seo_reports_url', 'seo_reports', ['url'], unique=False)
+    op.create_index(
+        'uq_seo_reports_inflight_url',
+        'seo_reports',
+        ['url'],
+        unique=True,
+        postgresql_where=sa.text("status IN ('pending', 'processing')"),
+    )
+    op.drop_column('seo_reports', 'url_key')
@@ -0,0 +1,30 @@
+"""Create seo_batch_reports membership table
+
+Revision ID: 004_batch_reports
+Revises: 003_url_key
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '004_batch_reports'
+down_revision = '003_url_key'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('seo_batch_reports',
+        sa.Column('batch_id', sa.String(length=32), nullable=False),
+        sa.Column('report_id', sa.Integer(), nullable=False),
+        sa.Column('position', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['report_id'], ['seo_reports.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('batch_id', 'report_id')
+    )
+    op.create_index('ix_seo_batch_reports_report_id', 'seo_batch_reports', ['report_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_seo_batch_reports_report_id', table_name='seo_batch_reports')
+    op.drop_table('seo_batch_reports')
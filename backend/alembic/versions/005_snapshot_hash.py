@@ -0,0 +1,24 @@
+"""Add snapshot_hash referencing the stored HTML snapshot
+
+Revision ID: 005_snapshot_hash
+Revises: 004_batch_reports
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '005_snapshot_hash'
+down_revision = '004_batch_reports'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('seo_reports', sa.Column('snapshot_hash', sa.String(length=64), nullable=True))
+    op.create_index('ix_seo_reports_snapshot_hash', 'seo_reports', ['snapshot_hash'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_seo_reports_snapshot_hash', table_name='seo_reports')
+    op.drop_column('seo_reports', 'snapshot_hash')
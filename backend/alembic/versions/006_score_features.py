@@ -0,0 +1,23 @@
+"""Add score_features vector for bulk re-scoring
+
+Revision ID: 006_score_features
+Revises: 005_snapshot_hash
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = '006_score_features'
+down_revision = '005_snapshot_hash'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('seo_reports', sa.Column('score_features', postgresql.ARRAY(sa.Float()), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('seo_reports', 'score_features')
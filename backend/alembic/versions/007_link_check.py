@@ -0,0 +1,22 @@
+"""Add link_check summary column
+
+Revision ID: 007_link_check
+Revises: 006_score_features
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '007_link_check'
+down_revision = '006_score_features'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('seo_reports', sa.Column('link_check', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('seo_reports', 'link_check')
@@ -0,0 +1,22 @@
+"""Add page_weight audit column
+
+Revision ID: 008_page_weight
+Revises: 007_link_check
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '008_page_weight'
+down_revision = '007_link_check'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('seo_reports', sa.Column('page_weight', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('seo_reports', 'page_weight')
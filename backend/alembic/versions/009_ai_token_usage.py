@@ -0,0 +1,22 @@
+"""Add ai_token_usage column
+
+Revision ID: 009_ai_token_usage
+Revises: 008_page_weight
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '009_ai_token_usage'
+down_revision = '008_page_weight'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('seo_reports', sa.Column('ai_token_usage', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('seo_reports', 'ai_token_usage')
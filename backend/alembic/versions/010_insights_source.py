@@ -0,0 +1,22 @@
+"""Add insights_source column
+
+Revision ID: 010_insights_source
+Revises: 009_ai_token_usage
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '010_insights_source'
+down_revision = '009_ai_token_usage'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('seo_reports', sa.Column('insights_source', sa.String(length=20), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('seo_reports', 'insights_source')
@@ -0,0 +1,32 @@
+"""Split report status into metrics and insights phases
+
+Revision ID: 011_phase_status
+Revises: 010_insights_source
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '011_phase_status'
+down_revision = '010_insights_source'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('seo_reports', sa.Column('metrics_status', sa.String(length=20), nullable=True))
+    op.add_column('seo_reports', sa.Column('insights_status', sa.String(length=20), nullable=True))
+    op.execute("""
+        UPDATE seo_reports
+        SET metrics_status = status,
+            insights_status = CASE
+                WHEN ai_insights IS NOT NULL THEN 'completed'
+                WHEN status = 'completed' THEN 'not_requested'
+            END
+    """)
+
+
+def downgrade() -> None:
+    op.drop_column('seo_reports', 'insights_status')
+    op.drop_column('seo_reports', 'metrics_status')
@@ -0,0 +1,29 @@
+"""Create unlogged seo_url_staging table for bulk URL uploads
+
+Revision ID: 012_url_staging
+Revises: 011_phase_status
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '012_url_staging'
+down_revision = '011_phase_status'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('seo_url_staging',
+        sa.Column('batch_id', sa.String(length=32), nullable=False),
+        sa.Column('position', sa.Integer(), nullable=False),
+        sa.Column('url', sa.String(length=500), nullable=False),
+        sa.Column('url_key', sa.String(length=32), nullable=False),
+        sa.PrimaryKeyConstraint('batch_id', 'position'),
+        prefixes=['UNLOGGED']
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('seo_url_staging')
@@ -0,0 +1,134 @@
+"""Partition seo_reports by created_at month and move the in-flight guard to its own table
+
+Revision ID: 013_partition_seo_reports
+Revises: 012_url_staging
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '013_partition_seo_reports'
+down_revision = '012_url_staging'
+branch_labels = None
+depends_on = None
+
+RELEASE_INFLIGHT_FUNCTION = """
+    CREATE OR REPLACE FUNCTION release_inflight_report() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'DELETE' THEN
+            DELETE FROM seo_inflight_reports WHERE url_key = OLD.url_key AND report_id = OLD.id;
+        ELSIF NEW.status NOT IN ('pending', 'processing') THEN
+            DELETE FROM seo_inflight_reports WHERE url_key = NEW.url_key AND report_id = NEW.id;
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+"""
+
+
+def upgrade() -> None:
+    op.drop_constraint('seo_batch_reports_report_id_fkey', 'seo_batch_reports', type_='foreignkey')
+
+    op.execute("ALTER TABLE seo_reports RENAME TO seo_reports_legacy")
+    op.drop_index('uq_seo_reports_inflight_url_key', table_name='seo_reports_legacy')
+    op.drop_index('ix_seo_reports_snapshot_hash', table_name='seo_reports_legacy')
+    op.drop_index('ix_seo_reports_url_key', table_name='seo_reports_legacy')
+    op.drop_index('ix_seo_reports_id', table_name='seo_reports_legacy')
+    op.execute("ALTER TABLE seo_reports_legacy DROP CONSTRAINT seo_reports_pkey")
+    op.execute("UPDATE seo_reports_legacy SET created_at = now() WHERE created_at IS NULL")
+
+    # Same columns and defaults (including the id sequence), partitioned by month.
+    op.execute("""
+        CREATE TABLE seo_reports (LIKE seo_reports_legacy INCLUDING DEFAULTS)
+        PARTITION BY RANGE (created_at)
+    """)
+    op.execute("ALTER TABLE seo_reports ALTER COLUMN created_at SET NOT NULL")
+    op.execute("ALTER TABLE seo_reports ADD CONSTRAINT seo_reports_pkey PRIMARY KEY (id, created_at)")
+    op.execute("CREATE TABLE seo_reports_default PARTITION OF seo_reports DEFAULT")
+
+    # Monthly partitions (UTC) covering the existing rows and the next three months;
+    # afterwards services.partitions.ensure_partitions keeps them ahead.
+    op.execute("""
+        DO $$
+        DECLARE
+            month date := date_trunc('month', coalesce(
+                (SELECT min(created_at) FROM seo_reports_legacy), now()) AT TIME ZONE 'UTC')::date;
+            last_month date := (date_trunc('month', now() AT TIME ZONE 'UTC') + interval '3 months')::date;
+        BEGIN
+            WHILE month <= last_month LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF seo_reports FOR VALUES FROM (%L) TO (%L)',
+                    'seo_reports_y' || to_char(month, 'YYYY') || 'm' || to_char(month, 'MM'),
+                    month::text || ' 00:00:00+00',
+                    (month + interval '1 month')::date::text || ' 00:00:00+00'
+                );
+                month := (month + interval '1 month')::date;
+            END LOOP;
+        END
+        $$
+    """)
+
+    op.execute("INSERT INTO seo_reports SELECT * FROM seo_reports_legacy")
+    op.execute("ALTER SEQUENCE seo_reports_id_seq OWNED BY seo_reports.id")
+
+    op.create_index('ix_seo_reports_id', 'seo_reports', ['id'], unique=False)
+    op.create_index('ix_seo_reports_url_key', 'seo_reports', ['url_key'], unique=False)
+    op.create_index('ix_seo_reports_snapshot_hash', 'seo_reports', ['snapshot_hash'], unique=False)
+
+    op.create_table('seo_inflight_reports',
+        sa.Column('url_key', sa.String(length=32), nullable=False),
+        sa.Column('report_id', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('url_key')
+    )
+    op.execute("""
+        INSERT INTO seo_inflight_reports (url_key, report_id)
+        SELECT DISTINCT ON (url_key) url_key, id FROM seo_reports
+        WHERE status IN ('pending', 'processing')
+        ORDER BY url_key, id
+    """)
+    op.execute(RELEASE_INFLIGHT_FUNCTION)
+    op.execute("""
+        CREATE TRIGGER trg_release_inflight_report
+        AFTER UPDATE OF status OR DELETE ON seo_reports
+        FOR EACH ROW EXECUTE FUNCTION release_inflight_report()
+    """)
+
+    op.drop_table('seo_reports_legacy')
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_release_inflight_report ON seo_reports")
+    op.execute("DROP FUNCTION IF EXISTS release_inflight_report()")
+    op.drop_table('seo_inflight_reports')
+
+    op.execute("ALTER TABLE seo_reports RENAME TO seo_reports_partitioned")
+    op.drop_index('ix_seo_reports_snapshot_hash', table_name='seo_reports_partitioned')
+    op.drop_index('ix_seo_reports_url_key', table_name='seo_reports_partitioned')
+    op.drop_index('ix_seo_reports_id', table_name='seo_reports_partitioned')
+    op.execute("ALTER TABLE seo_reports_partitioned DROP CONSTRAINT seo_reports_pkey")
+
+    op.execute("CREATE TABLE seo_reports (LIKE seo_reports_partitioned INCLUDING DEFAULTS)")
+    op.execute("ALTER TABLE seo_reports ALTER COLUMN created_at DROP NOT NULL")
+    op.execute("ALTER TABLE seo_reports ADD CONSTRAINT seo_reports_pkey PRIMARY KEY (id)")
+    op.execute("INSERT INTO seo_reports SELECT * FROM seo_reports_partitioned")
+    op.execute("ALTER SEQUENCE seo_reports_id_seq OWNED BY seo_reports.id")
+    # Archived partitions are gone, so some batch memberships may point nowhere.
+    op.execute("DELETE FROM seo_batch_reports WHERE report_id NOT IN (SELECT id FROM seo_reports)")
+
+    op.create_index('ix_seo_reports_id', 'seo_reports', ['id'], unique=False)
+    op.create_index('ix_seo_reports_url_key', 'seo_reports', ['url_key'], unique=False)
+    op.create_index('ix_seo_reports_snapshot_hash', 'seo_reports', ['snapshot_hash'], unique=False)
+    op.create_index(
+        'uq_seo_reports_inflight_url_key',
+        'seo_reports',
+        ['url_key'],
+        unique=True,
+        postgresql_where=sa.text("status IN ('pending', 'processing')"),
+    )
+    op.create_foreign_key(
+        'seo_batch_reports_report_id_fkey', 'seo_batch_reports', 'seo_reports',
+        ['report_id'], ['id'], ondelete='CASCADE'
+    )
+
+    op.execute("DROP TABLE seo_reports_partitioned CASCADE")
@@ -0,0 +1,24 @@
+"""Add stage_timings and stage_profile columns
+
+Revision ID: 014_stage_timings
+Revises: 013_partition_seo_reports
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '014_stage_timings'
+down_revision = '013_partition_seo_reports'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('seo_reports', sa.Column('stage_timings', sa.JSON(), nullable=True))
+    op.add_column('seo_reports', sa.Column('stage_profile', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('seo_reports', 'stage_profile')
+    op.drop_column('seo_reports', 'stage_timings')
@@ -0,0 +1,48 @@
+"""Create seo_watched_urls table for scheduled monitoring
+
+Revision ID: 015_watched_urls
+Revises: 014_stage_timings
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '015_watched_urls'
+down_revision = '014_stage_timings'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('seo_watched_urls',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('url', sa.String(length=500), nullable=False),
+        sa.Column('url_key', sa.String(length=32), nullable=False),
+        sa.Column('interval_seconds', sa.Integer(), nullable=False),
+        sa.Column('enabled', sa.Boolean(), server_default=sa.text('true'), nullable=False),
+        sa.Column('include_ai_insights', sa.Boolean(), nullable=False),
+        sa.Column('rule_set', sa.String(length=20), nullable=False),
+        sa.Column('check_links', sa.Boolean(), nullable=False),
+        sa.Column('audit_page_weight', sa.Boolean(), nullable=False),
+        sa.Column('next_run_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('last_run_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('last_report_id', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('url_key')
+    )
+    op.create_index('ix_seo_watched_urls_id', 'seo_watched_urls', ['id'], unique=False)
+    op.create_index(
+        'ix_seo_watched_urls_due',
+        'seo_watched_urls',
+        ['next_run_at'],
+        unique=False,
+        postgresql_where=sa.text('enabled'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_seo_watched_urls_due', table_name='seo_watched_urls')
+    op.drop_index('ix_seo_watched_urls_id', table_name='seo_watched_urls')
+    op.drop_table('seo_watched_urls')
@@ -0,0 +1,41 @@
+"""Create seo_links table for the link graph
+
+Revision ID: 016_links
+Revises: 015_watched_urls
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '016_links'
+down_revision = '015_watched_urls'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('seo_links',
+        sa.Column('source_url_key', sa.String(length=32), nullable=False),
+        sa.Column('target_url_key', sa.String(length=32), nullable=False),
+        sa.Column('source_report_id', sa.Integer(), nullable=False),
+        sa.Column('source_host', sa.String(length=255), nullable=False),
+        sa.Column('target_url', sa.Text(), nullable=False),
+        sa.Column('internal', sa.Boolean(), nullable=False),
+        sa.Column('nofollow', sa.Boolean(), nullable=False),
+        sa.PrimaryKeyConstraint('source_url_key', 'target_url_key')
+    )
+    op.create_index('ix_seo_links_target_url_key', 'seo_links', ['target_url_key'], unique=False)
+    op.create_index(
+        'ix_seo_links_site_target',
+        'seo_links',
+        ['source_host', 'target_url_key'],
+        unique=False,
+        postgresql_where=sa.text('internal'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_seo_links_site_target', table_name='seo_links')
+    op.drop_index('ix_seo_links_target_url_key', table_name='seo_links')
+    op.drop_table('seo_links')
@@ -0,0 +1,46 @@
+"""Add an indexed host column to seo_reports for domain filters
+
+Revision ID: 017_report_host
+Revises: 016_links
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from services.url_utils import url_host
+
+revision = '017_report_host'
+down_revision = '016_links'
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH_SIZE = 5000
+
+
+def upgrade() -> None:
+    op.add_column('seo_reports', sa.Column('host', sa.String(length=255), nullable=True))
+    op.add_column('seo_url_staging', sa.Column('host', sa.String(length=255), nullable=True))
+
+    conn = op.get_bind()
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.text("SELECT id, created_at, url FROM seo_reports WHERE id > :last_id ORDER BY id LIMIT :limit"),
+            {"last_id": last_id, "limit": BACKFILL_BATCH_SIZE},
+        ).fetchall()
+        if not rows:
+            break
+        conn.execute(
+            sa.text("UPDATE seo_reports SET host = :host WHERE id = :id AND created_at = :created_at"),
+            [{"id": row.id, "created_at": row.created_at, "host": url_host(row.url)} for row in rows],
+        )
+        last_id = rows[-1].id
+
+    op.create_index('ix_seo_reports_host', 'seo_reports', ['host'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_seo_reports_host', table_name='seo_reports')
+    op.drop_column('seo_url_staging', 'host')
+    op.drop_column('seo_reports', 'host')
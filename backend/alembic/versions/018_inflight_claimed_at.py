@@ -0,0 +1,26 @@
+"""Record when each in-flight guard was claimed so abandoned guards can be reclaimed
+
+Revision ID: 018_inflight_claimed_at
+Revises: 017_report_host
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '018_inflight_claimed_at'
+down_revision = '017_report_host'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing guards count as claimed now and expire after one analysis timeout.
+    op.add_column(
+        'seo_inflight_reports',
+        sa.Column('claimed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('seo_inflight_reports', 'claimed_at')
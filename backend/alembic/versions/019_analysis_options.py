@@ -0,0 +1,51 @@
+"""Key in-flight guards by analysis options and record each report's rule set
+
+Revision ID: 019_analysis_options
+Revises: 018_inflight_claimed_at
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '019_analysis_options'
+down_revision = '018_inflight_claimed_at'
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH_SIZE = 5000
+
+
+def upgrade() -> None:
+    op.add_column('seo_reports', sa.Column('rule_set', sa.String(length=20), nullable=True))
+
+    # Existing guards were claimed by default-option runs.
+    op.add_column(
+        'seo_inflight_reports',
+        sa.Column('options', sa.String(length=64), server_default='full', nullable=False),
+    )
+    op.drop_constraint('seo_inflight_reports_pkey', 'seo_inflight_reports', type_='primary')
+    op.create_primary_key('seo_inflight_reports_pkey', 'seo_inflight_reports', ['url_key', 'options'])
+
+    # The analyzer has recorded the rule set in raw_metrics since rule sets were added.
+    conn = op.get_bind()
+    max_id = conn.execute(sa.text("SELECT max(id) FROM seo_reports")).scalar() or 0
+    for lower in range(0, max_id, BACKFILL_BATCH_SIZE):
+        conn.execute(
+            sa.text("""
+                UPDATE seo_reports SET rule_set = CAST(raw_metrics AS jsonb) ->> 'rule_set'
+                WHERE id > :lower AND id <= :upper AND raw_metrics IS NOT NULL
+            """),
+            {"lower": lower, "upper": lower + BACKFILL_BATCH_SIZE},
+        )
+
+
+def downgrade() -> None:
+    op.execute("""
+        DELETE FROM seo_inflight_reports g USING seo_inflight_reports d
+        WHERE g.url_key = d.url_key AND g.report_id > d.report_id
+    """)
+    op.drop_constraint('seo_inflight_reports_pkey', 'seo_inflight_reports', type_='primary')
+    op.create_primary_key('seo_inflight_reports_pkey', 'seo_inflight_reports', ['url_key'])
+    op.drop_column('seo_inflight_reports', 'options')
+    op.drop_column('seo_reports', 'rule_set')
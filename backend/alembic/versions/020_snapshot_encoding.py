@@ -0,0 +1,23 @@
+"""Record the charset each HTML snapshot was decoded with
+
+Revision ID: 020_snapshot_encoding
+Revises: 019_analysis_options
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '020_snapshot_encoding'
+down_revision = '019_analysis_options'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing snapshots keep being decoded as UTF-8.
+    op.add_column('seo_reports', sa.Column('snapshot_encoding', sa.String(length=40), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('seo_reports', 'snapshot_encoding')
@@ -0,0 +1,25 @@
+"""Flag the batch memberships whose report the batch created
+
+Revision ID: 021_batch_report_created
+Revises: 020_snapshot_encoding
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '021_batch_report_created'
+down_revision = '020_snapshot_encoding'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'seo_batch_reports',
+        sa.Column('created', sa.Boolean(), server_default=sa.false(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('seo_batch_reports', 'created')
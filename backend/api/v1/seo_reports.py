@@ -1,32 +1,108 @@
-import httpx
+import asyncio
 import json
 import time
 import logging
 import re
+import shutil
+import tempfile
 import unicodedata
 import os
 from urllib.parse import urlparse
-from datetime import datetime, timezone
-from typing import List, Optional
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query
-from fastapi.responses import Response
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import select, func
+from sqlalchemy import select, func, text, update
 
 # --- Local Imports ---
-from core.database import get_db
-from models.seo_report import SEOReport
+from core.database import get_db, get_read_db
+from models.seo_report import SEOReport, InflightReport
+from models.batch_report import BatchReport
+from models.watched_url import WatchedURL
 from services.seo_analyzer import SEOAnalyzer
+from services.seo_rules import DEFAULT_RULE_SET, RULE_SETS
+from services.url_utils import canonicalize_url, compute_url_key, has_valid_port, url_host
 from schemas.seo_report import ( 
     SEOReportResponse, 
+    SEOReportDebugResponse,
     SEOReportList,
     SEOAnalysisRequest,
-    SEOAnalysisResponse
+    SEOAnalysisResponse,
+    ReanalyzeRequest,
+    RescoreRequest,
+    RetentionRequest,
+    WatchedURLRequest,
+    WatchedURLResponse,
+    JobResponse
 )
-from services.ai_insights import AIInsightGenerator
-from services.pdf_generator import generate_report_pdf
-from core.database import SessionLocal
+from services.ai_insights import get_insight_generator
+from services.insight_stage import schedule_insights
+from services.pdf_generator import render_report_pdf
+from services.portfolio_pdf import PortfolioStats, iter_file_chunks, portfolio_record, render_portfolio_pdf
+from services.process_pool import process_pool_size, run_in_process_pool
+from services.jobs import jobs
+from services.reanalysis import reanalyze_snapshots
+from services.score_model import weights_with_overrides
+from services.score_distribution import build_distribution_queries, shape_distribution
+from services.ttl_cache import TTLCache
+from services.link_checker import link_checker
+from services.link_graph import (
+    INBOUND_LINKS,
+    OUTBOUND_LINKS,
+    SITE_INBOUND_COUNTS,
+    SITE_ORPHAN_PAGES,
+    replace_page_links,
+)
+from services.page_weight import apply_page_weight, asset_prober
+from services.snapshot_store import get_snapshot_store
+from services.stage_timing import SamplingProfiler, StageTimings
+from services.watch_schedule import next_run_at
+from services.report_events import (
+    RESYNC_EVENT,
+    is_settled,
+    publish_report_status,
+    publish_reports_rewritten,
+    report_event_broker,
+)
+from services.report_cache import (
+    CachedReport,
+    cache_report,
+    ensure_invalidation_listener,
+    etag_matches,
+    invalidate_reports,
+    make_etag,
+    report_response_cache,
+)
+from services.partitions import (
+    add_months,
+    archive_partition,
+    ensure_partitions,
+    list_month_tables,
+    month_start,
+    read_archived_reports,
+)
+from services.url_ingest import (
+    CLEAR_STAGED_URLS,
+    COUNT_BATCH_REPORTS,
+    CREATED_BATCH_REPORTS,
+    MERGE_STAGED_URLS,
+    copy_staged_rows,
+    iter_staged_rows,
+    iter_upload_lines,
+)
+from services.report_export import (
+    EXPORT_COLUMNS,
+    ZipStreamWriter,
+    flatten_report_row,
+    format_csv,
+    format_ndjson,
+    load_raw_metrics,
+    parse_metric_fields,
+)
+from core.database import SessionLocal, ReadSessionLocal
 
 
 try:
@@ -41,6 +117,15 @@ except ImportError:
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+distribution_cache = TTLCache(maxsize=256, ttl=settings.STATS_CACHE_TTL_SECONDS)
+
+SSE_HEARTBEAT_SECONDS = 15
+EXPORT_YIELD_PER = 1000
+REANALYZE_CHUNK_SIZE = 200
+RESCORE_CHUNK_SIZE = 10000
+MAX_STREAM_REPORT_IDS = 1000
+URL_UPLOAD_COPY_CHUNK = 5000
+
 @router.post("/analyze", response_model=SEOAnalysisResponse)
 async def analyze_url(
     request: SEOAnalysisRequest,
@@ -51,12 +136,20 @@ async def analyze_url(
     Submit a URL for comprehensive SEO analysis.
     """
     try:
-        result = await db.execute(
-            select(SEOReport).filter(
-                SEOReport.url == str(request.url),
-                SEOReport.status == "completed"
-            ).order_by(SEOReport.created_at.desc())
+        url = canonicalize_url(str(request.url))
+        # A completed report is reused only if it ran the requested rule set and stages.
+        query = select(SEOReport).filter(
+            SEOReport.url_key == compute_url_key(url),
+            SEOReport.status == "completed",
+            SEOReport.rule_set == request.rule_set
         )
+        if request.check_links:
+            query = query.filter(SEOReport.link_check.isnot(None))
+        if request.audit_page_weight:
+            query = query.filter(SEOReport.page_weight.isnot(None))
+        if request.profile:
+            query = query.filter(SEOReport.stage_profile.isnot(None))
+        result = await db.execute(query.order_by(SEOReport.created_at.desc()))
         existing_report = result.scalars().first()
         
         if existing_report:
@@ -66,23 +159,31 @@ async def analyze_url(
                 message="Analysis completed successfully"
             )
         
-        report = SEOReport(
-            url=str(request.url),
-            status="pending"
-        )
-        db.add(report)
-        await db.commit()
-        await db.refresh(report)
+        options = _analysis_options(request.rule_set, request.check_links, request.audit_page_weight, request.profile)
+        report_id, created = await _create_or_attach_report(db, url, options)
+        
+        if not created:
+            return SEOAnalysisResponse(
+                report_id=report_id,
+                status="processing",
+                message="Analysis already in progress for this URL"
+            )
         
         background_tasks.add_task(
             process_seo_analysis,
-            report.id,
-            str(request.url),
+            report_id,
+            url,
             request.include_ai_insights,
+            request.rule_set,
+            request.check_links,
+            request.audit_page_weight,
+            request.ai_latency_budget_ms,
+            profile=request.profile,
+            enqueued_at=time.time(),
         )
         
         return SEOAnalysisResponse(
-            report_id=report.id,
+            report_id=report_id,
             status="processing",
             message="Analysis started successfully"
         )
@@ -91,17 +192,585 @@ async def analyze_url(
         logger.error(f"Error submitting analysis request: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+# Claims the in-flight guard row for a URL key and options and creates the
+# report under the claimed id in one statement; returns no row if they are
+# already in flight. A guard claimed before :stale_before is taken over.
+CLAIM_AND_CREATE_REPORT = text("""
+    WITH new_report AS (
+        SELECT nextval(pg_get_serial_sequence('seo_reports', 'id')) AS id
+    ),
+    claimed AS (
+        INSERT INTO seo_inflight_reports (url_key, options, report_id)
+        SELECT :url_key, :options, id FROM new_report
+        ON CONFLICT (url_key, options) DO UPDATE
+            SET report_id = EXCLUDED.report_id, claimed_at = now()
+            WHERE seo_inflight_reports.claimed_at < :stale_before
+        RETURNING report_id
+    )
+    INSERT INTO seo_reports (id, url, url_key, host, status, metrics_status)
+    SELECT report_id, :url, :url_key, :host, 'pending', 'pending' FROM claimed
+    RETURNING id
+""")
+
+# Re-scoring rewrites the score inside raw_metrics in the same statement as
+# seo_score, merging the recomputed rule penalties over the stored ones.
+RESCORE_REPORT = text("""
+    UPDATE seo_reports
+    SET seo_score = :seo_score,
+        raw_metrics = CAST(jsonb_set(
+            jsonb_set(CAST(raw_metrics AS jsonb), '{score}', CAST(:score AS jsonb)),
+            '{rule_penalties}',
+            COALESCE(CAST(raw_metrics AS jsonb) -> 'rule_penalties', CAST('{}' AS jsonb)) || CAST(:rule_penalties AS jsonb)
+        ) AS json)
+    WHERE id = :id
+""")
+
+def _analysis_options(
+    rule_set: str = DEFAULT_RULE_SET,
+    check_links: bool = False,
+    audit_page_weight: bool = False,
+    profile: bool = False,
+) -> str:
+    """
+    The analysis options as stored on in-flight guards, e.g. "quick+links".
+    Submissions only attach to a run that was started with the same options.
+    """
+    parts = [rule_set]
+    if check_links:
+        parts.append("links")
+    if audit_page_weight:
+        parts.append("weight")
+    if profile:
+        parts.append("profile")
+    return "+".join(parts)
+
+def _analysis_stale_before() -> datetime:
+    """In-flight guards claimed before this belong to runs that died."""
+    return datetime.now(timezone.utc) - timedelta(seconds=settings.ANALYSIS_TIMEOUT_SECONDS)
+
+async def _create_or_attach_report(db: Session, url: str, options: str = DEFAULT_RULE_SET, max_attempts: int = 3):
+    """
+    Creates a pending report for the canonical URL, or attaches to the one
+    already in flight with the same analysis options (see _analysis_options).
+
+    The primary key of seo_inflight_reports makes the guard insert the arbiter,
+    so concurrent submissions cannot both create a report. A run in flight for
+    longer than ANALYSIS_TIMEOUT_SECONDS is not attached to; a new report takes
+    over its guard.
+
+    Returns:
+        A tuple of (report_id, created).
+    """
+    url_key = compute_url_key(url)
+    for _ in range(max_attempts):
+        result = await db.execute(CLAIM_AND_CREATE_REPORT, {
+            "url": url,
+            "url_key": url_key,
+            "options": options,
+            "host": url_host(url),
+            "stale_before": _analysis_stale_before(),
+        })
+        report_id = result.scalar_one_or_none()
+        if report_id is not None:
+            await db.commit()
+            return report_id, True
+
+        result = await db.execute(
+            select(InflightReport.report_id).filter(InflightReport.url_key == url_key, InflightReport.options == options)
+        )
+        report_id = result.scalar_one_or_none()
+        await db.commit()
+        if report_id is not None:
+            return report_id, False
+        # The in-flight report finished between the insert and the lookup; retry.
+
+    raise RuntimeError(f"Could not create or attach a report for {url}")
+
+def _apply_report_filters(
+    query,
+    status: Optional[str] = None,
+    url: Optional[str] = None,
+    domain: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+):
+    """
+    Applies the filters shared by the list and export endpoints.
+    """
+    if status:
+        query = query.filter(SEOReport.status == status)
+    
+    if url:
+        query = query.filter(SEOReport.url.contains(url))
+    
+    if domain:
+        query = query.filter(SEOReport.host == url_host(domain))
+    
+    if created_from:
+        query = query.filter(SEOReport.created_at >= created_from)
+    
+    if created_to:
+        query = query.filter(SEOReport.created_at < created_to)
+    
+    return query
+
+@router.get("/export")
+async def export_reports(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    status: Optional[str] = Query(None),
+    url: Optional[str] = Query(None),
+    domain: Optional[str] = Query(None),
+    created_from: Optional[datetime] = Query(None),
+    created_to: Optional[datetime] = Query(None),
+    metrics: Optional[str] = Query(None, description="Comma-separated raw_metrics fields to flatten into columns"),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Stream every matching report as NDJSON or CSV using a server-side cursor.
+    """
+    metric_fields = parse_metric_fields(metrics)
+    columns = [getattr(SEOReport, column) for column in EXPORT_COLUMNS]
+    query = _apply_report_filters(
+        select(*columns, SEOReport.raw_metrics), status, url, domain, created_from, created_to
+    ).order_by(SEOReport.id).execution_options(yield_per=EXPORT_YIELD_PER)
+
+    fieldnames = EXPORT_COLUMNS + metric_fields
+
+    async def generate():
+        if format == "csv":
+            yield format_csv([], fieldnames, include_header=True)
+        result = await db.stream(query)
+        async for partition in result.partitions():
+            records = [flatten_report_row(row, metric_fields) for row in partition]
+            if format == "csv":
+                yield format_csv(records, fieldnames)
+            else:
+                yield format_ndjson(records)
+
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        generate(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="seo_reports_export.{format}"'}
+    )
+
+async def _pdf_zip_stream(db: Session, report_ids: List[int]):
+    """
+    Renders report PDFs in the process pool and streams each into the ZIP as it finishes.
+    The number of renders in flight is bounded so memory stays flat for large batches.
+    """
+    writer = ZipStreamWriter()
+    max_in_flight = process_pool_size() * 2
+    pending = {}
+    skipped = []
+    seen_ids = set()
+
+    async def drain(return_when):
+        done, _ = await asyncio.wait(pending, return_when=return_when)
+        chunks = []
+        for task in done:
+            report_id, name = pending.pop(task)
+            try:
+                chunks.append(writer.add(name, task.result()))
+            except Exception as e:
+                logger.error(f"PDF rendering failed for report {report_id}: {e}")
+                skipped.append(f"{report_id}: rendering failed")
+        return b"".join(chunks)
+
+    query = select(SEOReport).filter(
+        SEOReport.id.in_(report_ids)
+    ).order_by(SEOReport.id).execution_options(yield_per=100)
+    result = await db.stream(query)
+    async for report in result.scalars():
+        seen_ids.add(report.id)
+        if report.status != "completed":
+            skipped.append(f"{report.id}: status is {report.status}")
+            continue
+        task = asyncio.ensure_future(render_report_pdf(_pdf_analysis_data(report)))
+        pending[task] = (report.id, f"{report.id}_{_pdf_filename(report)}")
+        if len(pending) >= max_in_flight:
+            yield await drain(asyncio.FIRST_COMPLETED)
+
+    while pending:
+        yield await drain(asyncio.FIRST_COMPLETED)
+
+    skipped.extend(f"{report_id}: not found" for report_id in report_ids if report_id not in seen_ids)
+    if skipped:
+        yield writer.add("skipped.txt", ("\n".join(skipped) + "\n").encode("utf-8"))
+    yield writer.close()
+
+def _pdf_zip_response(db: Session, report_ids: List[int], archive_name: str) -> StreamingResponse:
+    if not report_ids:
+        raise HTTPException(status_code=404, detail="No reports found")
+    if len(report_ids) > settings.MAX_PDF_ZIP_REPORTS:
+        raise HTTPException(status_code=400, detail=f"At most {settings.MAX_PDF_ZIP_REPORTS} reports per archive")
+
+    return StreamingResponse(
+        _pdf_zip_stream(db, report_ids),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{archive_name}"'}
+    )
+
+@router.get("/pdfs.zip")
+async def get_reports_pdf_zip(
+    ids: str = Query(..., description="Comma-separated report ids"),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Download the PDFs of several reports as a single streamed ZIP archive.
+    """
+    try:
+        report_ids = sorted({int(part) for part in ids.split(",") if part.strip()})
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be a comma-separated list of integers")
+    return _pdf_zip_response(db, report_ids, "seo_reports.zip")
+
+@router.get("/batches/{batch_id}/pdfs.zip")
+async def get_batch_pdf_zip(batch_id: str, db: Session = Depends(get_read_db)):
+    """
+    Download the PDFs of every report in a batch as a single streamed ZIP archive.
+    """
+    result = await db.execute(
+        select(BatchReport.report_id).filter(BatchReport.batch_id == batch_id)
+    )
+    report_ids = list(result.scalars().all())
+    if not report_ids:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    return _pdf_zip_response(db, report_ids, f"{_sanitize_filename(batch_id)}.zip")
+
+async def _stream_file_and_remove(path: str, workdir: str):
+    try:
+        for chunk in iter_file_chunks(path):
+            yield chunk
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+@router.get("/portfolio.pdf")
+async def get_portfolio_pdf(
+    domain: str = Query(..., description="Site whose completed reports go into the portfolio"),
+    created_from: Optional[datetime] = Query(None),
+    created_to: Optional[datetime] = Query(None),
+    include_appendices: bool = Query(True, description="Add one appendix page per report"),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Download one PDF covering every completed report of a site: an overview
+    with score averages and a histogram, a summary table and per-page appendices.
+
+    Report rows are streamed from the database in chunks and spooled to a
+    temporary file; the renderer reads them back lazily and writes the PDF to
+    disk, which is then streamed to the client.
+    """
+    query = _apply_report_filters(
+        select(
+            SEOReport.id, SEOReport.url, SEOReport.title, SEOReport.seo_score,
+            SEOReport.accessibility_score, SEOReport.performance_score, SEOReport.load_time,
+            SEOReport.ai_insights, SEOReport.ai_recommendations, SEOReport.raw_metrics, SEOReport.created_at,
+        ),
+        status="completed",
+        domain=domain,
+        created_from=created_from,
+        created_to=created_to,
+    ).order_by(SEOReport.url, SEOReport.created_at.desc()).execution_options(yield_per=EXPORT_YIELD_PER)
+
+    workdir = tempfile.mkdtemp(prefix="portfolio_")
+    try:
+        records_path = os.path.join(workdir, "reports.ndjson")
+        stats = PortfolioStats()
+        with open(records_path, "w", encoding="utf-8") as spool:
+            result = await db.stream(query)
+            async for partition in result.partitions():
+                for row in partition:
+                    record = portfolio_record(row)
+                    stats.add(record)
+                    spool.write(json.dumps(record) + "\n")
+                if stats.count > settings.MAX_PORTFOLIO_REPORTS:
+                    raise HTTPException(
+                        status_code=400, detail=f"At most {settings.MAX_PORTFOLIO_REPORTS} reports per portfolio"
+                    )
+        if not stats.count:
+            raise HTTPException(status_code=404, detail="No completed reports found")
+
+        pdf_path = os.path.join(workdir, "portfolio.pdf")
+        pages = await render_portfolio_pdf(records_path, pdf_path, domain, stats.to_dict(), include_appendices)
+        os.remove(records_path)
+        logger.info(f"Rendered portfolio for {domain}: {stats.count} reports, {pages} pages")
+    except Exception:
+        shutil.rmtree(workdir, ignore_errors=True)
+        raise
+
+    return StreamingResponse(
+        _stream_file_and_remove(pdf_path, workdir),
+        media_type="application/pdf",
+        headers={
+            "Content-Disposition": f'attachment; filename="{_sanitize_filename(domain)}_portfolio.pdf"',
+            "Content-Length": str(os.path.getsize(pdf_path)),
+        }
+    )
+
+def _format_sse(event: dict) -> str:
+    return f"event: status\ndata: {json.dumps(event)}\n\n"
+
+async def _report_status_events(db: Session, report_ids: Iterable[int]) -> List[dict]:
+    """Current status of each report as an event; releases the session's connection afterwards."""
+    result = await db.execute(
+        select(SEOReport.id, SEOReport.status, SEOReport.insights_status).filter(SEOReport.id.in_(list(report_ids)))
+    )
+    rows = result.all()
+    # The stream itself only waits on the shared listener.
+    await db.close()
+    return [
+        {"report_id": report_id, "status": status, "insights_status": insights_status}
+        for report_id, status, insights_status in rows
+    ]
+
+async def _report_event_stream(request: Request, db: Session, report_ids: List[int]):
+    """
+    Yields SSE messages for the given reports until all of them are settled:
+    metrics in a terminal status and no insights still being generated.
+    """
+    async with report_event_broker.subscribe(report_ids) as queue:
+        # Snapshot after subscribing so no transition can fall between the two.
+        open_ids = set()
+        for event in await _report_status_events(db, report_ids):
+            yield _format_sse(event)
+            if not is_settled(event):
+                open_ids.add(event["report_id"])
+
+        while open_ids:
+            if await request.is_disconnected():
+                break
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=SSE_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                if report_event_broker.connected:
+                    yield ": keep-alive\n\n"
+                    continue
+                event = RESYNC_EVENT
+            if event is RESYNC_EVENT:
+                # Events may have been lost: reconnect, then re-read what is still open.
+                try:
+                    await report_event_broker.start()
+                except Exception as e:
+                    logger.warning(f"Report event listener unavailable: {e}")
+                for event in await _report_status_events(db, sorted(open_ids)):
+                    yield _format_sse(event)
+                    if is_settled(event):
+                        open_ids.discard(event["report_id"])
+                continue
+            yield _format_sse(event)
+            if is_settled(event):
+                open_ids.discard(event.get("report_id"))
+
+async def _event_stream_response(request: Request, db: Session, report_ids: List[int]) -> StreamingResponse:
+    if not report_ids:
+        raise HTTPException(status_code=404, detail="No reports to stream")
+    if len(report_ids) > MAX_STREAM_REPORT_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_STREAM_REPORT_IDS} reports per stream")
+    try:
+        await report_event_broker.start()
+    except Exception as e:
+        logger.error(f"Report event listener unavailable: {e}")
+        raise HTTPException(status_code=503, detail="Status streaming is temporarily unavailable")
+
+    return StreamingResponse(
+        _report_event_stream(request, db, report_ids),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.post("/watched", response_model=WatchedURLResponse)
+async def watch_url(request: WatchedURLRequest, db: Session = Depends(get_db)):
+    """
+    Re-analyze a URL on a fixed interval. Watching an already watched URL updates its settings.
+    """
+    if request.interval_seconds < settings.WATCH_MIN_INTERVAL_SECONDS:
+        raise HTTPException(
+            status_code=400, detail=f"interval_seconds must be at least {settings.WATCH_MIN_INTERVAL_SECONDS}"
+        )
+    url = canonicalize_url(str(request.url))
+    url_key = compute_url_key(url)
+    result = await db.execute(select(WatchedURL).filter(WatchedURL.url_key == url_key))
+    watch = result.scalars().first()
+    if watch is None:
+        watch = WatchedURL(url=url, url_key=url_key)
+        db.add(watch)
+
+    options = request.model_dump(exclude={"url"})
+    if watch.interval_seconds != request.interval_seconds:
+        watch.next_run_at = next_run_at(url_key, request.interval_seconds, datetime.now(timezone.utc))
+    for name, value in options.items():
+        setattr(watch, name, value)
+    await db.commit()
+    await db.refresh(watch)
+    return watch
+
+@router.get("/watched", response_model=List[WatchedURLResponse])
+async def list_watched_urls(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_read_db)
+):
+    """
+    List watched URLs in the order they are due.
+    """
+    result = await db.execute(select(WatchedURL).order_by(WatchedURL.next_run_at).offset(skip).limit(limit))
+    return result.scalars().all()
+
+@router.delete("/watched/{watch_id}", status_code=204)
+async def unwatch_url(watch_id: int, db: Session = Depends(get_db)):
+    """
+    Stop re-analyzing a watched URL. Its existing reports are kept.
+    """
+    watch = await db.get(WatchedURL, watch_id)
+    if watch is None:
+        raise HTTPException(status_code=404, detail="Watched URL not found")
+    await db.delete(watch)
+    await db.commit()
+    return Response(status_code=204)
+
+@router.get("/links/inbound")
+async def get_inbound_links(
+    url: str = Query(..., description="Page whose inbound links to list"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_read_db)
+):
+    """
+    List the analyzed pages that link to a URL.
+    """
+    url = canonicalize_url(url)
+    result = await db.execute(INBOUND_LINKS, {"url_key": compute_url_key(url), "limit": limit, "offset": skip})
+    return {"url": url, "links": [dict(row._mapping) for row in result.all()]}
+
+@router.get("/links/outbound")
+async def get_outbound_links(
+    url: str = Query(..., description="Analyzed page whose outbound links to list"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_read_db)
+):
+    """
+    List the links found on the latest analysis of a page.
+    """
+    url = canonicalize_url(url)
+    result = await db.execute(OUTBOUND_LINKS, {"url_key": compute_url_key(url), "limit": limit, "offset": skip})
+    return {"url": url, "links": [dict(row._mapping) for row in result.all()]}
+
+@router.get("/sites/{domain}/inbound-counts")
+async def get_site_inbound_counts(
+    domain: str,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Count internal inbound links per page of a site, most linked first.
+    """
+    host = url_host(domain.strip())
+    result = await db.execute(SITE_INBOUND_COUNTS, {"host": host, "limit": limit, "offset": skip})
+    return {"domain": host, "pages": [dict(row._mapping) for row in result.all()]}
+
+@router.get("/sites/{domain}/orphans")
+async def get_site_orphan_pages(
+    domain: str,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_read_db)
+):
+    """
+    List analyzed pages of a site that no other analyzed page of the site links to.
+    """
+    host = url_host(domain.strip())
+    result = await db.execute(SITE_ORPHAN_PAGES, {"host": host, "limit": limit, "offset": skip})
+    return {"domain": host, "orphans": [dict(row._mapping) for row in result.all()]}
+
+@router.get("/events/stream")
+async def stream_reports_events(
+    request: Request,
+    ids: str = Query(..., description="Comma-separated report ids"),
+    db: Session = Depends(get_db)
+):
+    """
+    Stream status changes for a set of reports as Server-Sent Events.
+    """
+    try:
+        report_ids = sorted({int(part) for part in ids.split(",") if part.strip()})
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be a comma-separated list of integers")
+    return await _event_stream_response(request, db, report_ids)
+
+@router.get("/batches/{batch_id}/events")
+async def stream_batch_events(batch_id: str, request: Request, db: Session = Depends(get_db)):
+    """
+    Stream status changes for every report in a batch as Server-Sent Events.
+    """
+    result = await db.execute(
+        select(BatchReport.report_id).filter(BatchReport.batch_id == batch_id).order_by(BatchReport.position)
+    )
+    report_ids = list(result.scalars().all())
+    if not report_ids:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    return await _event_stream_response(request, db, report_ids)
+
+@router.get("/{report_id}/events")
+async def stream_report_events(report_id: int, request: Request, db: Session = Depends(get_db)):
+    """
+    Stream status changes for a single report as Server-Sent Events.
+    """
+    result = await db.execute(select(SEOReport.id).filter(SEOReport.id == report_id))
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(status_code=404, detail="Report not found")
+    return await _event_stream_response(request, db, [report_id])
+
 @router.get("/{report_id}", response_model=SEOReportResponse)
-async def get_report(report_id: int, db: Session = Depends(get_db)):
+async def get_report(
+    report_id: int,
+    request: Request,
+    debug: Optional[str] = Query(None, pattern="^timings$", description="'timings' adds the job's stage breakdown"),
+    db: Session = Depends(get_read_db)
+):
     """
     Retrieve a comprehensive SEO report by ID.
+
+    Settled reports are served from an in-process cache of serialized
+    responses. Every response carries a strong ETag; If-None-Match gets a 304.
     """
-    result = await db.execute(select(SEOReport).filter(SEOReport.id == report_id))
-    report = result.scalars().first()
-    if not report:
-        raise HTTPException(status_code=404, detail="Report not found")
-    
-    return report
+    cached = None if debug else report_response_cache.get(report_id)
+    if cached is None:
+        result = await db.execute(select(SEOReport).filter(SEOReport.id == report_id))
+        report = result.scalars().first()
+        if not report:
+            raise HTTPException(status_code=404, detail="Report not found")
+        
+        if debug == "timings":
+            return JSONResponse(content=jsonable_encoder(SEOReportDebugResponse.model_validate(report)))
+
+        settled = is_settled({"status": report.status, "insights_status": report.insights_status})
+        if settled:
+            # A lagging replica could put a body the last eviction was meant to drop
+            # back in the cache; only the primary's copy is cached.
+            async with SessionLocal() as primary:
+                result = await primary.execute(select(SEOReport).filter(SEOReport.id == report_id))
+                report = result.scalars().first() or report
+            settled = is_settled({"status": report.status, "insights_status": report.insights_status})
+
+        body = SEOReportResponse.model_validate(report).model_dump_json().encode("utf-8")
+        if settled:
+            await ensure_invalidation_listener()
+            cached = cache_report(report_id, body)
+            cache_control = f"public, max-age={settings.REPORT_CACHE_MAX_AGE_SECONDS}"
+        else:
+            # Still changing; let clients revalidate every time.
+            cached = CachedReport(body=body, etag=make_etag(body))
+            cache_control = "no-cache"
+    else:
+        cache_control = f"public, max-age={settings.REPORT_CACHE_MAX_AGE_SECONDS}"
+
+    headers = {"ETag": cached.etag, "Cache-Control": cache_control}
+    if etag_matches(request.headers.get("if-none-match"), cached.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=cached.body, media_type="application/json", headers=headers)
 
 @router.get("/", response_model=SEOReportList)
 async def list_reports(
@@ -109,18 +778,15 @@ async def list_reports(
     limit: int = Query(10, ge=1, le=100),
     status: Optional[str] = Query(None),
     url: Optional[str] = Query(None),
-    db: Session = Depends(get_db)
+    domain: Optional[str] = Query(None),
+    created_from: Optional[datetime] = Query(None),
+    created_to: Optional[datetime] = Query(None),
+    db: Session = Depends(get_read_db)
 ):
     """
     List SEO reports with pagination.
     """
-    query = select(SEOReport)
-    
-    if status:
-        query = query.filter(SEOReport.status == status)
-    
-    if url:
-        query = query.filter(SEOReport.url.contains(url))
+    query = _apply_report_filters(select(SEOReport), status, url, domain, created_from, created_to)
     
     total_result = await db.execute(select(func.count()).select_from(query.alias()))
     total = total_result.scalar_one()
@@ -138,146 +804,261 @@ async def list_reports(
 async def process_seo_analysis(
     report_id: int,
     url: str,
-    include_ai_insights: bool
+    include_ai_insights: bool,
+    rule_set: str = DEFAULT_RULE_SET,
+    check_links: bool = False,
+    audit_page_weight: bool = False,
+    ai_latency_budget_ms: Optional[int] = None,
+    profile: bool = False,
+    enqueued_at: Optional[float] = None
 ):
     """
     Asynchronously process a URL to perform SEO analysis.
     Uses its own independent DB session.
+
+    Records how long each stage took on the report (stage_timings); with
+    `profile`, a sampling profile of the job is stored as well.
     """
+    # Only analysis fetches pages; keep httpx out of API startup.
+    import httpx
+
+    timings = StageTimings()
+    if enqueued_at is not None:
+        timings.record("queue_wait", max(0.0, time.time() - enqueued_at))
+    profiler = SamplingProfiler(settings.PROFILE_SAMPLE_INTERVAL_MS / 1000).start() if profile else None
+
     async with SessionLocal() as db:
         try:
-            result = await db.execute(select(SEOReport).filter(SEOReport.id == report_id))
-            report = result.scalars().first()
+            with timings.stage("status_update"):
+                result = await db.execute(select(SEOReport).filter(SEOReport.id == report_id))
+                report = result.scalars().first()
 
-            if not report:
-                logger.error(f"Report with ID {report_id} not found in background task.")
-                return
+                if not report:
+                    logger.error(f"Report with ID {report_id} not found in background task.")
+                    return
 
-            report.status = "processing"
-            await db.commit()
+                if enqueued_at is None and report.created_at:
+                    timings.record("queue_wait", max(0.0, (datetime.now(timezone.utc) - report.created_at).total_seconds()))
+                report.status = "processing"
+                report.metrics_status = "processing"
+                await publish_report_status(db, report_id, report.status)
+                await db.commit()
+                invalidate_reports([report_id])
 
             try:
                 start_time = time.time()
-                async with httpx.AsyncClient() as client:
-                    headers = {'User-Agent': 'Mozilla/5.0 (compatible; SiteSage/1.0)'}
-                    response = await client.get(url, headers=headers, follow_redirects=True, timeout=30)
-                    response.raise_for_status()
+                with timings.stage("fetch"):
+                    async with httpx.AsyncClient() as client:
+                        headers = {'User-Agent': 'Mozilla/5.0 (compatible; SiteSage/1.0)'}
+                        response = await client.get(url, headers=headers, follow_redirects=True, timeout=30)
+                        response.raise_for_status()
+                        response_time_ms = int((time.time() - start_time) * 1000)
+                with timings.stage("decode"):
                     html_content = response.text
-                    response_time_ms = int((time.time() - start_time) * 1000)
+                    html_bytes = len(response.content)
 
-                analyzer = SEOAnalyzer()
-                analysis_results = analyzer.analyze(html_content, response_time_ms, url)
-
-                ai_summary = None
-                ai_recommendations = None
-                
-                if include_ai_insights:
-                    model_name = settings.MODEL_NAME if hasattr(settings, 'MODEL_NAME') else 'gemini-1.5-flash'
-                    api_key = settings.GOOGLE_API_KEY
-                    
-                    if api_key:
+                if settings.STORE_HTML_SNAPSHOTS and html_content:
+                    with timings.stage("snapshot"):
                         try:
-                            ai_generator = AIInsightGenerator(api_key=api_key, model_name=model_name)
-                            ai_results = ai_generator.generate_insights(analysis_results)
-                            ai_summary = ai_results.get('summary')
-                            ai_recommendations = ai_results.get('recommendations')
-                        except Exception as e:
-                            logger.error(f"AI Generation failed: {e}")
-                            ai_summary = "AI analysis failed during generation."
-                    else:
-                        logger.warning("GOOGLE_API_KEY missing in settings. Skipping AI.")
-                        ai_summary = "AI Configuration missing (API Key)."
+                            report.snapshot_hash = await asyncio.to_thread(
+                                get_snapshot_store().put, response.content
+                            )
+                            # The snapshot holds raw bytes; keep the charset response.text used.
+                            report.snapshot_encoding = response.encoding
+                        except OSError as e:
+                            logger.warning(f"Could not store HTML snapshot for {url}: {e}")
+
+                with timings.stage("analyze"):
+                    analyzer = SEOAnalyzer(rule_set=rule_set)
+                    analysis_results = analyzer.analyze(html_content, response_time_ms, url)
+                    # None when the rule set doesn't collect links (e.g. "quick").
+                    link_targets = analysis_results.pop('link_targets', None)
+                    asset_targets = analysis_results.pop('asset_targets', [])
+
+                if check_links:
+                    with timings.stage("link_check"):
+                        report.link_check = await link_checker.check_page(
+                            link_targets or [], settings.LINK_CHECK_MAX_LINKS
+                        )
+
+                if audit_page_weight:
+                    with timings.stage("page_weight"):
+                        report.page_weight = await asset_prober.audit_page(
+                            html_bytes,
+                            asset_targets,
+                            settings.PAGE_WEIGHT_MAX_ASSETS,
+                            settings.PAGE_WEIGHT_TIME_BUDGET_SECONDS,
+                        )
+                        apply_page_weight(analysis_results, report.page_weight, response_time_ms)
 
+                # Without collected links the page's stored edges are left as they are.
+                if link_targets is not None:
+                    with timings.stage("links"):
+                        await replace_page_links(db, report_id, url, link_targets, settings.LINK_GRAPH_MAX_LINKS)
+
+                # Metrics are committed first; insights follow in their own stage.
                 report.status = "completed"
+                report.metrics_status = "completed"
+                report.insights_status = "pending" if include_ai_insights else "not_requested"
                 report.completed_at = datetime.now(timezone.utc)
+                report.rule_set = rule_set
                 report.seo_score = analysis_results.get('score')
+                report.score_features = analysis_results.get('score_features')
                 report.raw_metrics = json.dumps(analysis_results)
-                report.ai_insights = ai_summary
-                report.ai_recommendations = ai_recommendations
                 
-                report.title = analysis_results.get('title')
-                report.meta_description = analysis_results.get('meta_description')
+                # Cut to the column sizes; the full values stay in raw_metrics.
+                title = analysis_results.get('title')
+                meta_description = analysis_results.get('meta_description')
+                report.title = title[:200] if title else title
+                report.meta_description = meta_description[:500] if meta_description else meta_description
                 report.load_time = response_time_ms / 1000.0 
 
-                await db.commit()
+                # Attributes expire on commit; keep what the insight stage needs.
+                link_check = report.link_check
+                with timings.stage("commit"):
+                    await publish_report_status(db, report_id, report.status, report.insights_status)
+                    await db.commit()
                 logger.info(f"Successfully processed and saved report for {url}")
 
             except httpx.RequestError as e:
                 logger.error(f"HTTP fetch failed for {url}: {e}")
-                report.status = "failed"
-                report.error_message = f"Failed to fetch URL: {str(e)}"
-                await db.commit()
+                with timings.stage("commit"):
+                    await _mark_report_failed(db, report_id, f"Failed to fetch URL: {str(e)}")
+                include_ai_insights = False
             except Exception as e:
                 logger.error(f"Unexpected error during analysis for {url}: {e}")
-                report.status = "failed"
-                report.error_message = f"An unexpected error occurred: {str(e)}"
-                await db.commit()
+                with timings.stage("commit"):
+                    await _mark_report_failed(db, report_id, f"An unexpected error occurred: {str(e)}")
+                include_ai_insights = False
+
+            # The final commit's own duration is part of the breakdown, so the
+            # timings go out in a small follow-up update.
+            if profiler:
+                profiler.stop()
+            values = {"stage_timings": timings.to_dict()}
+            if profiler:
+                values["stage_profile"] = profiler.to_dict()
+            await db.execute(update(SEOReport).where(SEOReport.id == report_id).values(**values))
+            await db.commit()
+
+            if include_ai_insights:
+                schedule_insights(report_id, analysis_results, link_check, ai_latency_budget_ms)
                 
         except Exception as outer_e:
             logger.error(f"Critical DB error in background task: {outer_e}")
+        finally:
+            if profiler:
+                profiler.stop()
 
-@router.get("/{report_id}/pdf")
-async def get_report_pdf(report_id: int, db: Session = Depends(get_db)):
+async def _mark_report_failed(db: Session, report_id: int, error_message: str) -> None:
     """
-    Generate and download a PDF report.
+    Records a failed analysis. The failure may have left the session unusable
+    (e.g. a failed flush), so whatever the attempt left pending is rolled back
+    and the report is updated by id.
     """
-    result = await db.execute(select(SEOReport).filter(SEOReport.id == report_id))
-    report = result.scalars().first()
-    if not report:
-        raise HTTPException(status_code=404, detail="Report not found")
+    await db.rollback()
+    await db.execute(
+        update(SEOReport)
+        .where(SEOReport.id == report_id)
+        .values(status="failed", metrics_status="failed", error_message=error_message)
+    )
+    await publish_report_status(db, report_id, "failed")
+    await db.commit()
 
-    if report.status != "completed":
-        raise HTTPException(status_code=400, detail="Report analysis is still in progress or failed.")
+# Fails reports whose in-flight guard outlived the analysis timeout; the
+# release trigger drops their guards. Guards left without an in-flight report
+# are dropped directly.
+FAIL_STRANDED_REPORTS = text("""
+    UPDATE seo_reports
+    SET status = 'failed', metrics_status = 'failed', error_message = :error_message
+    WHERE id IN (SELECT report_id FROM seo_inflight_reports WHERE claimed_at < :stale_before)
+      AND status IN ('pending', 'processing')
+    RETURNING id
+""")
+DROP_STALE_GUARDS = text("DELETE FROM seo_inflight_reports WHERE claimed_at < :stale_before")
 
-    try:
-        raw_metrics = json.loads(report.raw_metrics) if report.raw_metrics else {}
-    except json.JSONDecodeError:
-        raw_metrics = {}
+async def recover_stranded_reports() -> int:
+    """
+    Fails reports left pending or processing by a run that never finished
+    (a crash or restart between claim and completion), so their URLs can be
+    analyzed again. Returns the number of reports failed.
+    """
+    params = {"stale_before": _analysis_stale_before()}
+    async with SessionLocal() as db:
+        result = await db.execute(
+            FAIL_STRANDED_REPORTS, {**params, "error_message": "Analysis did not finish"}
+        )
+        report_ids = result.scalars().all()
+        await db.execute(DROP_STALE_GUARDS, params)
+        for report_id in report_ids:
+            await publish_report_status(db, report_id, "failed")
+        await db.commit()
+    invalidate_reports(report_ids)
+    if report_ids:
+        logger.info(f"Failed {len(report_ids)} stranded reports")
+    return len(report_ids)
 
-    analysis_data = {
+def _sanitize_filename(name: str) -> str:
+    """
+    Robust sanitization for filenames:
+    1. Normalize Unicode (converts accents, removes weird symbols like ■).
+    2. Convert to ASCII (strip remaining non-ascii).
+    3. Replace symbols with underscores.
+    """
+    if not name:
+        return "report"
+        
+    normalized = unicodedata.normalize('NFKD', name)
+    
+    ascii_name = normalized.encode('ascii', 'ignore').decode('ascii')
+    
+    s = re.sub(r'[\\/:*?"<>|\s]+', '_', ascii_name)
+    
+    s = re.sub(r'_+', '_', s)
+    s = s.strip('_')
+    
+    if not s:
+        return "report"
+        
+    return s[:100]
+
+def _pdf_filename(report: SEOReport) -> str:
+    if report.title and report.title.strip():
+        base_name = report.title
+    else:
+        parsed_url = urlparse(report.url)
+        base_name = parsed_url.hostname or "report"
+
+    return f"{_sanitize_filename(base_name)}.pdf"
+
+def _pdf_analysis_data(report: SEOReport) -> dict:
+    return {
         "url": report.url,
         "seo_score": report.seo_score,
         "ai_insights": report.ai_insights,
         "ai_recommendations": report.ai_recommendations,
-        "raw_metrics": raw_metrics,
+        "insights_status": report.insights_status,
+        "raw_metrics": load_raw_metrics(report.raw_metrics),
         "load_time": report.load_time,
         "created_at": report.created_at
     }
 
-    pdf_bytes = generate_report_pdf(analysis_data)
-
-    def sanitize_filename(name: str) -> str:
-        """
-        Robust sanitization for filenames:
-        1. Normalize Unicode (converts accents, removes weird symbols like ■).
-        2. Convert to ASCII (strip remaining non-ascii).
-        3. Replace symbols with underscores.
-        """
-        if not name:
-            return "report"
-            
-        normalized = unicodedata.normalize('NFKD', name)
-        
-        ascii_name = normalized.encode('ascii', 'ignore').decode('ascii')
-        
-        s = re.sub(r'[\\/:*?"<>|\s]+', '_', ascii_name)
-        
-        s = re.sub(r'_+', '_', s)
-        s = s.strip('_')
-        
-        if not s:
-            return "report"
-            
-        return s[:100]
+@router.get("/{report_id}/pdf")
+async def get_report_pdf(report_id: int, db: Session = Depends(get_read_db)):
+    """
+    Generate and download a PDF report.
+    """
+    result = await db.execute(select(SEOReport).filter(SEOReport.id == report_id))
+    report = result.scalars().first()
+    if not report:
+        raise HTTPException(status_code=404, detail="Report not found")
 
-    if report.title and report.title.strip():
-        base_name = report.title
-    else:
-        parsed_url = urlparse(report.url)
-        base_name = parsed_url.hostname or "report"
+    if report.status != "completed":
+        raise HTTPException(status_code=400, detail="Report analysis is still in progress or failed.")
+
+    pdf_bytes = await render_report_pdf(_pdf_analysis_data(report))
 
-    sanitized_name = sanitize_filename(base_name)
-    filename = f"{sanitized_name}.pdf"
+    filename = _pdf_filename(report)
 
     logger.info(f"Generated filename: {filename}")
 
@@ -293,34 +1074,56 @@ async def get_report_pdf(report_id: int, db: Session = Depends(get_db)):
 async def batch_analyze_urls(
     urls: List[str],
     include_ai_insights: bool = True,
+    rule_set: str = Query(DEFAULT_RULE_SET),
+    check_links: bool = False,
+    audit_page_weight: bool = False,
+    ai_latency_budget_ms: Optional[int] = Query(None, ge=0),
     background_tasks: BackgroundTasks = BackgroundTasks(),
     db: Session = Depends(get_db)
 ):
     """
     Analyze multiple URLs in batch.
     """
+    if rule_set not in RULE_SETS:
+        raise HTTPException(status_code=400, detail=f"Unknown rule set. Available: {', '.join(RULE_SETS)}")
+    invalid_urls = [raw_url for raw_url in urls if not has_valid_port(raw_url)]
+    if invalid_urls:
+        raise HTTPException(status_code=400, detail=f"Invalid port in URL: {invalid_urls[0][:100]}")
     try:
         import uuid
         batch_id = f"batch_{uuid.uuid4().hex[:8]}"
         report_ids = []
+        report_id_by_key = {}
+        created_report_ids = set()
+        options = _analysis_options(rule_set, check_links, audit_page_weight)
         
-        for url in urls:
-            report = SEOReport(
-                url=url,
-                status="pending"
-            )
-            db.add(report)
-            db.commit()
-            db.refresh(report)
-            report_ids.append(report.id)
-            
-            background_tasks.add_task(
-                process_seo_analysis,
-                report.id,
-                url,
-                include_ai_insights,
-                # db
-            )
+        for raw_url in urls:
+            url = canonicalize_url(raw_url)
+            url_key = compute_url_key(url)
+            # Duplicates within the batch share the first report.
+            if url_key not in report_id_by_key:
+                report_id, created = await _create_or_attach_report(db, url, options)
+                report_id_by_key[url_key] = report_id
+                if created:
+                    created_report_ids.add(report_id)
+                    background_tasks.add_task(
+                        process_seo_analysis,
+                        report_id,
+                        url,
+                        include_ai_insights,
+                        rule_set,
+                        check_links,
+                        audit_page_weight,
+                        ai_latency_budget_ms,
+                        enqueued_at=time.time(),
+                    )
+            report_ids.append(report_id_by_key[url_key])
+        
+        db.add_all([
+            BatchReport(batch_id=batch_id, report_id=report_id, position=position, created=report_id in created_report_ids)
+            for position, report_id in enumerate(report_id_by_key.values())
+        ])
+        await db.commit()
         
         return {
             "batch_id": batch_id,
@@ -334,11 +1137,146 @@ async def batch_analyze_urls(
         logger.error(f"Error submitting batch analysis: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+@router.post("/batch-upload", status_code=202)
+async def batch_upload_urls(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    include_ai_insights: bool = True,
+    rule_set: str = Query(DEFAULT_RULE_SET),
+    check_links: bool = False,
+    audit_page_weight: bool = False,
+    db: Session = Depends(get_db)
+):
+    """
+    Analyze a large list of URLs uploaded as CSV (URL in the first column) or
+    one URL per line. The body is streamed, validated and COPY'd into a
+    staging table; merging and analysis run in a background job.
+    """
+    if rule_set not in RULE_SETS:
+        raise HTTPException(status_code=400, detail=f"Unknown rule set. Available: {', '.join(RULE_SETS)}")
+
+    import uuid
+    batch_id = f"batch_{uuid.uuid4().hex[:8]}"
+    stats = {"accepted": 0, "invalid": 0}
+    lines = iter_upload_lines(request.stream())
+    async for rows in iter_staged_rows(batch_id, lines, URL_UPLOAD_COPY_CHUNK, stats):
+        if stats["accepted"] > settings.MAX_BATCH_UPLOAD_URLS:
+            await db.rollback()
+            raise HTTPException(status_code=413, detail=f"At most {settings.MAX_BATCH_UPLOAD_URLS} URLs per upload")
+        await copy_staged_rows(db, rows)
+
+    if not stats["accepted"]:
+        raise HTTPException(status_code=400, detail="No valid URLs in upload")
+    await db.commit()
+
+    job = jobs.create("batch_upload", batch_id=batch_id, accepted_urls=stats["accepted"], invalid_urls=stats["invalid"])
+    background_tasks.add_task(
+        run_batch_upload_job, job.id, batch_id, include_ai_insights, rule_set, check_links, audit_page_weight
+    )
+    return {
+        "batch_id": batch_id,
+        "job_id": job.id,
+        "accepted_urls": stats["accepted"],
+        "invalid_urls": stats["invalid"],
+        "status": "processing",
+        "message": f"Batch upload accepted with {stats['accepted']} URLs"
+    }
+
+async def _iter_created_batch_reports(batch_id: str):
+    """Yields (report_id, url) of the reports a batch created, one short read per page."""
+    after_report_id = 0
+    while True:
+        async with SessionLocal() as db:
+            result = await db.execute(CREATED_BATCH_REPORTS, {
+                "batch_id": batch_id,
+                "after_report_id": after_report_id,
+                "limit": URL_UPLOAD_COPY_CHUNK,
+            })
+            rows = result.all()
+        if not rows:
+            return
+        for row in rows:
+            yield row.report_id, row.url
+        after_report_id = rows[-1].report_id
+
+async def run_batch_upload_job(
+    job_id: str,
+    batch_id: str,
+    include_ai_insights: bool,
+    rule_set: str,
+    check_links: bool,
+    audit_page_weight: bool
+):
+    """
+    Merges a staged upload into seo_reports in one statement, then analyzes
+    the newly created reports with a fixed number of concurrent workers. The
+    merge only returns the URLs it couldn't resolve; the created reports are
+    read back from seo_batch_reports a page at a time, so memory stays flat
+    however large the upload.
+    """
+    job = jobs.get(job_id)
+    job.status = "running"
+    try:
+        async with SessionLocal() as db:
+            options = _analysis_options(rule_set, check_links, audit_page_weight)
+            result = await db.execute(MERGE_STAGED_URLS, {
+                "batch_id": batch_id,
+                "options": options,
+                "stale_before": _analysis_stale_before(),
+            })
+            unresolved = result.all()
+            await db.execute(CLEAR_STAGED_URLS, {"batch_id": batch_id})
+            await db.commit()
+
+            # Their in-flight report settled mid-merge; go through the one-URL path instead.
+            for row in unresolved:
+                report_id, created = await _create_or_attach_report(db, row.url, options)
+                db.add(BatchReport(batch_id=batch_id, report_id=report_id, position=row.position, created=created))
+            if unresolved:
+                await db.commit()
+
+            counts = (await db.execute(COUNT_BATCH_REPORTS, {"batch_id": batch_id})).one()
+
+        merged_at = time.time()
+        job.details.update(
+            reports=counts.reports,
+            created=counts.created,
+            attached=counts.reports - counts.created,
+            unresolved=len(unresolved),
+        )
+
+        pending = _iter_created_batch_reports(batch_id)
+        next_lock = asyncio.Lock()
+        async def worker():
+            while True:
+                # The page reader is shared; one worker at a time advances it.
+                async with next_lock:
+                    item = await anext(pending, None)
+                if item is None:
+                    return
+                report_id, url = item
+                await process_seo_analysis(
+                    report_id, url, include_ai_insights, rule_set, check_links, audit_page_weight,
+                    enqueued_at=merged_at,
+                )
+                job.processed += 1
+
+        await asyncio.gather(*(worker() for _ in range(settings.BATCH_UPLOAD_CONCURRENCY)))
+        job.status = "completed"
+        logger.info(f"Batch upload {batch_id}: {counts.reports} reports, {counts.created} analyzed")
+    except Exception as e:
+        logger.error(f"Batch upload job {job.id} failed: {e}")
+        job.status = "failed"
+        job.error_message = str(e)
+    finally:
+        job.finished_at = datetime.now(timezone.utc)
+
 @router.get("/historical/{url:path}")
 async def get_historical_reports(
     url: str,
     days: int = 30,
-    db: Session = Depends(get_db)
+    include_archived: bool = Query(False, description="Also read reports archived by the retention job"),
+    db: Session = Depends(get_read_db)
 ):
     """
     Retrieve historical SEO analysis for a specific URL.
@@ -346,14 +1284,43 @@ async def get_historical_reports(
     try:
         from datetime import timedelta
         
-        days = min(days, 365)
+        days = min(days, 3650 if include_archived else 365)
         start_date = datetime.now(timezone.utc) - timedelta(days=days)
+        url_key = compute_url_key(url)
         
-        reports = db.query(SEOReport).filter(
-            SEOReport.url == url,
-            SEOReport.status == "completed",
-            SEOReport.created_at >= start_date
-        ).order_by(SEOReport.created_at.desc()).all()
+        result = await db.execute(
+            select(SEOReport).filter(
+                SEOReport.url_key == url_key,
+                SEOReport.status == "completed",
+                SEOReport.created_at >= start_date
+            ).order_by(SEOReport.created_at.desc())
+        )
+        reports = [
+            {
+                "id": report.id,
+                "seo_score": report.seo_score,
+                "accessibility_score": report.accessibility_score,
+                "performance_score": report.performance_score,
+                "created_at": report.created_at,
+            }
+            for report in result.scalars().all()
+        ]
+        if include_archived:
+            archived = await asyncio.to_thread(
+                lambda: list(read_archived_reports(start_date, url_key=url_key, status="completed"))
+            )
+            reports.extend(
+                {
+                    "id": report["id"],
+                    "seo_score": report.get("seo_score"),
+                    "accessibility_score": report.get("accessibility_score"),
+                    "performance_score": report.get("performance_score"),
+                    "created_at": report["created_at"],
+                    "archived": True,
+                }
+                for report in archived
+            )
+            reports.sort(key=lambda report: report["created_at"], reverse=True)
         
         if not reports:
             return {
@@ -372,9 +1339,9 @@ async def get_historical_reports(
             latest = reports[0]
             earliest = reports[-1]
             trends = {
-                "seo_score_change": (latest.seo_score or 0) - (earliest.seo_score or 0),
-                "accessibility_change": (latest.accessibility_score or 0) - (earliest.accessibility_score or 0),
-                "performance_change": (latest.performance_score or 0) - (earliest.performance_score or 0)
+                "seo_score_change": (latest["seo_score"] or 0) - (earliest["seo_score"] or 0),
+                "accessibility_change": (latest["accessibility_score"] or 0) - (earliest["accessibility_score"] or 0),
+                "performance_change": (latest["performance_score"] or 0) - (earliest["performance_score"] or 0)
             }
         else:
             trends = {
@@ -388,13 +1355,7 @@ async def get_historical_reports(
             "total_reports": len(reports),
             "time_period_days": days,
             "reports": [
-                {
-                    "id": report.id,
-                    "seo_score": report.seo_score,
-                    "accessibility_score": report.accessibility_score,
-                    "performance_score": report.performance_score,
-                    "created_at": report.created_at.isoformat() if report.created_at else None
-                }
+                {**report, "created_at": report["created_at"].isoformat() if report["created_at"] else None}
                 for report in reports
             ],
             "trends": trends
@@ -405,36 +1366,47 @@ async def get_historical_reports(
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @router.get("/stats/summary")
-async def get_stats_summary(db: Session = Depends(get_db)):
+async def get_stats_summary(db: Session = Depends(get_read_db)):
     """
     Get comprehensive statistics and summary of all SEO analyses.
     """
     try:
-        from sqlalchemy import func
-        
-        total_analyses = db.query(SEOReport).count()
-        completed_analyses = db.query(SEOReport).filter(SEOReport.status == "completed").count()
+        total_analyses = (await db.execute(select(func.count(SEOReport.id)))).scalar_one()
+        completed_analyses = (await db.execute(
+            select(func.count(SEOReport.id)).filter(SEOReport.status == "completed")
+        )).scalar_one()
         success_rate = (completed_analyses / total_analyses * 100) if total_analyses > 0 else 0
         
-        avg_seo_score = db.query(func.avg(SEOReport.seo_score)).filter(SEOReport.status == "completed").scalar() or 0
-        avg_accessibility_score = db.query(func.avg(SEOReport.accessibility_score)).filter(SEOReport.status == "completed").scalar() or 0
-        avg_performance_score = db.query(func.avg(SEOReport.performance_score)).filter(SEOReport.status == "completed").scalar() or 0
+        averages = (await db.execute(
+            select(
+                func.avg(SEOReport.seo_score),
+                func.avg(SEOReport.accessibility_score),
+                func.avg(SEOReport.performance_score)
+            ).filter(SEOReport.status == "completed")
+        )).one()
+        avg_seo_score = averages[0] or 0
+        avg_accessibility_score = averages[1] or 0
+        avg_performance_score = averages[2] or 0
         
         from datetime import timedelta
         recent_cutoff = datetime.now(timezone.utc) - timedelta(days=7)
-        recent_analyses = db.query(SEOReport).filter(SEOReport.created_at >= recent_cutoff).count()
+        recent_analyses = (await db.execute(
+            select(func.count(SEOReport.id)).filter(SEOReport.created_at >= recent_cutoff)
+        )).scalar_one()
         
-        top_urls_query = db.query(
-            SEOReport.url,
-            func.count(SEOReport.id).label('analysis_count'),
-            func.avg(SEOReport.seo_score).label('avg_seo_score')
-        ).filter(
-            SEOReport.status == "completed"
-        ).group_by(
-            SEOReport.url
-        ).order_by(
-            func.count(SEOReport.id).desc()
-        ).limit(5).all()
+        top_urls_query = (await db.execute(
+            select(
+                func.min(SEOReport.url).label('url'),
+                func.count(SEOReport.id).label('analysis_count'),
+                func.avg(SEOReport.seo_score).label('avg_seo_score')
+            ).filter(
+                SEOReport.status == "completed"
+            ).group_by(
+                SEOReport.url_key
+            ).order_by(
+                func.count(SEOReport.id).desc()
+            ).limit(5)
+        )).all()
         
         top_urls = [
             {
@@ -458,4 +1430,354 @@ async def get_stats_summary(db: Session = Depends(get_db)):
         
     except Exception as e:
         logger.error(f"Error generating stats summary: {str(e)}")
-        raise HTTPException(status_code=500, detail="Internal server error")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.get("/stats/distribution")
+async def get_stats_distribution(
+    domain: Optional[str] = Query(None),
+    created_from: Optional[datetime] = Query(None),
+    created_to: Optional[datetime] = Query(None),
+    batch_id: Optional[str] = Query(None),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Get p50/p90/p99 and fixed-bin histograms of scores, load time and score features.
+    Aggregation runs in Postgres; results are cached briefly per filter combination.
+    """
+    cache_key = (domain, created_from, created_to, batch_id)
+    cached = distribution_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    try:
+        query = _apply_report_filters(
+            select(SEOReport),
+            status="completed",
+            domain=domain,
+            created_from=created_from,
+            created_to=created_to,
+        )
+        if batch_id:
+            query = query.join(BatchReport, BatchReport.report_id == SEOReport.id).filter(
+                BatchReport.batch_id == batch_id
+            )
+
+        percentile_query, histogram_query = build_distribution_queries(query)
+        percentile_row = (await db.execute(percentile_query)).one()
+        histogram_rows = (await db.execute(histogram_query)).all()
+
+        distribution = shape_distribution(percentile_row, histogram_rows)
+        distribution["filters"] = {
+            "domain": domain,
+            "created_from": created_from.isoformat() if created_from else None,
+            "created_to": created_to.isoformat() if created_to else None,
+            "batch_id": batch_id,
+        }
+        distribution_cache.set(cache_key, distribution)
+        return distribution
+
+    except Exception as e:
+        logger.error(f"Error generating score distribution: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.post("/reanalyze", response_model=JobResponse)
+async def reanalyze_reports(request: ReanalyzeRequest, background_tasks: BackgroundTasks):
+    """
+    Re-score completed reports from their stored HTML snapshots, without refetching.
+    """
+    job = jobs.create("reanalyze", rule_set=request.rule_set, missing_snapshots=0)
+    background_tasks.add_task(run_reanalysis_job, job.id, request)
+    return job.to_dict()
+
+@router.get("/jobs/{job_id}", response_model=JobResponse)
+async def get_job(job_id: str):
+    """
+    Get the progress of a re-analysis or re-scoring job.
+    """
+    job = jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
+
+@router.get("/ai/stats")
+async def get_ai_stats():
+    """
+    Call, retry, hedge and latency counters of the shared AI insight client.
+    """
+    return get_insight_generator().caller.stats.to_dict()
+
+async def _write_reanalysis_results(job, results):
+    """
+    Writes one chunk of re-analysis results back with a single batched UPDATE.
+    """
+    updates = []
+    for report_id, analysis_results in results:
+        if analysis_results is None:
+            job.details["missing_snapshots"] += 1
+            continue
+        analysis_results.pop('link_targets', None)
+        analysis_results.pop('asset_targets', None)
+        values = {
+            "id": report_id,
+            "seo_score": analysis_results.get('score'),
+            "raw_metrics": json.dumps(analysis_results),
+            "score_features": analysis_results.get('score_features'),
+            "rule_set": analysis_results.get('rule_set'),
+        }
+        for column in ("title", "meta_description"):
+            if column in analysis_results:
+                values[column] = analysis_results[column]
+        updates.append(values)
+
+    if updates:
+        async with SessionLocal() as db:
+            await db.execute(update(SEOReport), updates)
+            await publish_reports_rewritten(db, [values["id"] for values in updates])
+            await db.commit()
+        invalidate_reports(values["id"] for values in updates)
+
+    job.processed += len(results)
+    job.updated += len(updates)
+
+async def run_reanalysis_job(job_id: str, request: ReanalyzeRequest):
+    """
+    Streams snapshot references of matching reports and re-runs the analyzer on
+    them in the process pool, one chunk per task, with no network I/O.
+    """
+    job = jobs.get(job_id)
+    job.status = "running"
+    try:
+        query = _apply_report_filters(
+            select(
+                SEOReport.id,
+                SEOReport.snapshot_hash,
+                SEOReport.snapshot_encoding,
+                SEOReport.load_time,
+                SEOReport.url,
+                SEOReport.page_weight,
+            ),
+            status="completed",
+            domain=request.domain,
+            created_from=request.created_from,
+            created_to=request.created_to,
+        ).filter(SEOReport.snapshot_hash.isnot(None))
+        if request.report_ids:
+            query = query.filter(SEOReport.id.in_(request.report_ids))
+        query = query.order_by(SEOReport.id).execution_options(yield_per=REANALYZE_CHUNK_SIZE)
+
+        max_in_flight = process_pool_size() * 2
+        pending = set()
+        async with ReadSessionLocal() as db:
+            result = await db.stream(query)
+            async for partition in result.partitions():
+                items = [
+                    (
+                        row.id,
+                        row.snapshot_hash,
+                        row.snapshot_encoding,
+                        int((row.load_time or 0) * 1000),
+                        row.url,
+                        row.page_weight,
+                    )
+                    for row in partition
+                ]
+                pending.add(asyncio.ensure_future(
+                    run_in_process_pool(reanalyze_snapshots, items, request.rule_set)
+                ))
+                if len(pending) >= max_in_flight:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        await _write_reanalysis_results(job, task.result())
+
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                await _write_reanalysis_results(job, task.result())
+
+        job.status = "completed"
+        logger.info(f"Re-analysis job {job.id} updated {job.updated} of {job.processed} reports")
+    except Exception as e:
+        logger.error(f"Re-analysis job {job.id} failed: {e}")
+        job.status = "failed"
+        job.error_message = str(e)
+    finally:
+        job.finished_at = datetime.now(timezone.utc)
+
+
+@router.post("/rescore", response_model=JobResponse)
+async def rescore_reports(request: RescoreRequest, background_tasks: BackgroundTasks):
+    """
+    Recompute scores of completed reports from their stored feature vectors with new weights.
+    """
+    try:
+        weights = weights_with_overrides(request.weights)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    job = jobs.create("rescore", dry_run=request.dry_run)
+    background_tasks.add_task(run_rescore_job, job.id, request, weights)
+    return job.to_dict()
+
+async def run_rescore_job(job_id: str, request: RescoreRequest, weights):
+    """
+    Loads feature vectors in columnar chunks, scores each chunk with NumPy and
+    writes changed scores back with one batched UPDATE per chunk.
+    """
+    # NumPy is only needed by re-scoring jobs; keep it out of API startup.
+    from services.rescoring import ScoreDistributionDiff, json_number, rescore_chunk, rule_penalties_at
+
+    job = jobs.get(job_id)
+    job.status = "running"
+    diff = ScoreDistributionDiff()
+    try:
+        query = _apply_report_filters(
+            select(SEOReport.id, SEOReport.seo_score, SEOReport.score_features),
+            status="completed",
+            domain=request.domain,
+            created_from=request.created_from,
+            created_to=request.created_to,
+        ).filter(SEOReport.score_features.isnot(None))
+        query = query.order_by(SEOReport.id).execution_options(yield_per=RESCORE_CHUNK_SIZE)
+
+        async with ReadSessionLocal() as db:
+            result = await db.stream(query)
+            async for partition in result.partitions():
+                ids, old_scores, new_scores, penalties = rescore_chunk(partition, weights)
+                diff.add(old_scores, new_scores)
+                job.processed += len(ids)
+
+                if request.dry_run:
+                    continue
+                updates = [
+                    {
+                        "id": int(ids[i]),
+                        "seo_score": float(new_scores[i]),
+                        "score": json.dumps(json_number(new_scores[i])),
+                        "rule_penalties": json.dumps(rule_penalties_at(penalties, i)),
+                    }
+                    for i in range(len(ids))
+                    if old_scores[i] != new_scores[i]
+                ]
+                if updates:
+                    async with SessionLocal() as write_db:
+                        await write_db.execute(RESCORE_REPORT, updates)
+                        await publish_reports_rewritten(write_db, [values["id"] for values in updates])
+                        await write_db.commit()
+                    invalidate_reports(values["id"] for values in updates)
+                    job.updated += len(updates)
+
+        job.details.update(diff.summary())
+        job.status = "completed"
+    except Exception as e:
+        logger.error(f"Rescore job {job.id} failed: {e}")
+        job.status = "failed"
+        job.error_message = str(e)
+    finally:
+        job.finished_at = datetime.now(timezone.utc)
+
+
+@router.post("/maintenance/retention", response_model=JobResponse)
+async def run_retention(request: RetentionRequest, background_tasks: BackgroundTasks):
+    """
+    Create upcoming monthly partitions and archive partitions older than the retention window.
+    """
+    retention_months = request.retention_months or settings.REPORT_RETENTION_MONTHS
+    job = jobs.create("retention", dry_run=request.dry_run, retention_months=retention_months)
+    background_tasks.add_task(run_retention_job, job.id, retention_months, request.dry_run)
+    return job.to_dict()
+
+async def run_retention_job(job_id: str, retention_months: int, dry_run: bool):
+    """
+    Archives whole monthly partitions past the retention window to gzip NDJSON
+    files and drops them, which avoids row-by-row deletes on the hot table.
+    Tables detached by an interrupted run are picked up again.
+    """
+    job = jobs.get(job_id)
+    job.status = "running"
+    try:
+        cutoff = add_months(month_start(datetime.now(timezone.utc).date()), -retention_months)
+        async with SessionLocal() as db:
+            if not dry_run:
+                job.details["created_partitions"] = await ensure_partitions(db)
+            expired = [(name, month) for name, month, attached in await list_month_tables(db) if month < cutoff or not attached]
+            job.details["cutoff"] = cutoff.isoformat()
+            job.details["partitions"] = [name for name, _ in expired]
+            if not dry_run:
+                for name, month in expired:
+                    job.updated += await archive_partition(db, name, month)
+                    job.processed += 1
+                if expired:
+                    report_response_cache.clear()
+
+        job.status = "completed"
+        logger.info(f"Retention job {job.id} archived {job.updated} reports from {job.processed} partitions")
+    except Exception as e:
+        logger.error(f"Retention job {job.id} failed: {e}")
+        job.status = "failed"
+        job.error_message = str(e)
+    finally:
+        job.finished_at = datetime.now(timezone.utc)
+
+
+# Analyses started by the watch scheduler, kept referenced until they finish.
+_watch_tasks: set = set()
+
+async def run_watch_tick(now: Optional[datetime] = None) -> int:
+    """
+    Claims up to WATCH_MAX_STARTS_PER_TICK due watched URLs, moves each to its
+    next slot and enqueues an analysis through the same path as /analyze.
+    Rows are claimed with SKIP LOCKED, so several processes can run the
+    scheduler without starting a URL twice; the cap applies per process, so
+    the cluster-wide rate is the cap times the number of schedulers. A run
+    that can't be started is put back to its due time for the next tick.
+    Returns the number of runs handled.
+    """
+    now = now or datetime.now(timezone.utc)
+    async with SessionLocal() as db:
+        result = await db.execute(
+            select(WatchedURL).filter(
+                # Bare column, to match the due index's "WHERE enabled" predicate.
+                WatchedURL.enabled,
+                WatchedURL.next_run_at <= now
+            ).order_by(WatchedURL.next_run_at).limit(settings.WATCH_MAX_STARTS_PER_TICK).with_for_update(skip_locked=True)
+        )
+        runs = []
+        for watch in result.scalars().all():
+            runs.append((watch.id, watch.url, watch.next_run_at, (
+                watch.include_ai_insights, watch.rule_set, watch.check_links, watch.audit_page_weight
+            ), _analysis_options(watch.rule_set, watch.check_links, watch.audit_page_weight)))
+            watch.next_run_at = next_run_at(watch.url_key, watch.interval_seconds, now)
+            watch.last_run_at = now
+        await db.commit()
+
+        for watch_id, url, due_at, args, options in runs:
+            try:
+                report_id, created = await _create_or_attach_report(db, url, options)
+                await db.execute(update(WatchedURL).where(WatchedURL.id == watch_id).values(last_report_id=report_id))
+                await db.commit()
+            except Exception as e:
+                logger.error(f"Could not start watched run for {url}: {e}")
+                await db.rollback()
+                try:
+                    await db.execute(update(WatchedURL).where(WatchedURL.id == watch_id).values(next_run_at=due_at))
+                    await db.commit()
+                except Exception as reset_error:
+                    logger.error(f"Could not reschedule watched URL {watch_id}: {reset_error}")
+                    await db.rollback()
+                continue
+            if created:
+                task = asyncio.ensure_future(process_seo_analysis(report_id, url, *args, enqueued_at=due_at.timestamp()))
+                _watch_tasks.add(task)
+                task.add_done_callback(_watch_tasks.discard)
+
+    if runs:
+        logger.info(f"Watch scheduler started {len(runs)} analyses")
+    return len(runs)
+
+async def run_watch_scheduler():
+    """Runs a scheduler tick every WATCH_TICK_SECONDS until cancelled."""
+    while True:
+        try:
+            await run_watch_tick()
+        except Exception as e:
+            logger.error(f"Watch scheduler tick failed: {e}")
+        await asyncio.sleep(settings.WATCH_TICK_SECONDS)
@@ -18,10 +18,97 @@ class Settings(BaseSettings):
     
     DATABASE_URL: str = os.getenv("DATABASE_URL")
     TEST_DATABASE_URL: str = os.getenv("TEST_DATABASE_URL")
+    READ_DATABASE_URL: Optional[str] = os.getenv("READ_DATABASE_URL") or None
+
+    # Connection pool settings (writer and read replica are sized separately)
+    DB_ECHO: bool = os.getenv("DB_ECHO", "False").lower() == "true"
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    READ_DB_POOL_SIZE: int = int(os.getenv("READ_DB_POOL_SIZE", "20"))
+    READ_DB_MAX_OVERFLOW: int = int(os.getenv("READ_DB_MAX_OVERFLOW", "40"))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "True").lower() == "true"
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_STATEMENT_CACHE_SIZE: int = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100"))
     
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
     GOOGLE_API_KEY: str = os.getenv("GOOGLE_API_KEY", "")
     MODEL_NAME: str = os.getenv("MODEL_NAME", "gemini-2.5-flash")
+    AI_MAX_INPUT_TOKENS: int = int(os.getenv("AI_MAX_INPUT_TOKENS", "4000"))
+
+    # Deadlines and retries for LLM calls; hedging sends a second request past the p95 latency
+    AI_DEADLINE_SECONDS: float = float(os.getenv("AI_DEADLINE_SECONDS", "90"))
+    AI_ATTEMPT_TIMEOUT_SECONDS: float = float(os.getenv("AI_ATTEMPT_TIMEOUT_SECONDS", "30"))
+    AI_MAX_RETRIES: int = int(os.getenv("AI_MAX_RETRIES", "2"))
+    AI_RETRY_BACKOFF_SECONDS: float = float(os.getenv("AI_RETRY_BACKOFF_SECONDS", "0.5"))
+    AI_RETRY_BACKOFF_MAX_SECONDS: float = float(os.getenv("AI_RETRY_BACKOFF_MAX_SECONDS", "8"))
+    AI_HEDGE_ENABLED: bool = os.getenv("AI_HEDGE_ENABLED", "False").lower() == "true"
+    AI_HEDGE_MIN_SAMPLES: int = int(os.getenv("AI_HEDGE_MIN_SAMPLES", "20"))
+    AI_INSIGHT_CONCURRENCY: int = int(os.getenv("AI_INSIGHT_CONCURRENCY", "20"))
+    # How long a report waits for LLM insights before completing with rule-based ones; 0 waits for the LLM
+    AI_LATENCY_BUDGET_MS: int = int(os.getenv("AI_LATENCY_BUDGET_MS", "0"))
+    # Insights still pending/processing this long after the report's last update are re-queued at startup
+    AI_INSIGHTS_STALE_SECONDS: int = int(os.getenv("AI_INSIGHTS_STALE_SECONDS", "600"))
+
+    # Concurrent insight requests are sent to the model together
+    AI_BATCH_ENABLED: bool = os.getenv("AI_BATCH_ENABLED", "True").lower() == "true"
+    AI_BATCH_WINDOW_MS: int = int(os.getenv("AI_BATCH_WINDOW_MS", "250"))
+    AI_BATCH_MAX_ITEMS: int = int(os.getenv("AI_BATCH_MAX_ITEMS", "10"))
+    AI_BATCH_MAX_INPUT_TOKENS: int = int(os.getenv("AI_BATCH_MAX_INPUT_TOKENS", "20000"))
+
+    # Worker processes for CPU-bound jobs (PDF rendering, re-analysis); 0 means one per core
+    CPU_POOL_WORKERS: int = int(os.getenv("CPU_POOL_WORKERS", "0"))
+    MAX_PDF_ZIP_REPORTS: int = int(os.getenv("MAX_PDF_ZIP_REPORTS", "5000"))
+    MAX_PORTFOLIO_REPORTS: int = int(os.getenv("MAX_PORTFOLIO_REPORTS", "20000"))
+
+    # Streamed bulk URL uploads
+    MAX_BATCH_UPLOAD_URLS: int = int(os.getenv("MAX_BATCH_UPLOAD_URLS", "1000000"))
+    BATCH_UPLOAD_CONCURRENCY: int = int(os.getenv("BATCH_UPLOAD_CONCURRENCY", "20"))
+
+    # A report still in flight this long is treated as abandoned: its in-flight guard can be
+    # reclaimed and startup marks the report failed
+    ANALYSIS_TIMEOUT_SECONDS: int = int(os.getenv("ANALYSIS_TIMEOUT_SECONDS", "900"))
+
+    # Scheduled re-analysis of watched URLs, run by every API process
+    WATCH_SCHEDULER_ENABLED: bool = os.getenv("WATCH_SCHEDULER_ENABLED", "True").lower() == "true"
+    WATCH_TICK_SECONDS: float = float(os.getenv("WATCH_TICK_SECONDS", "15"))
+    # Per scheduler process; with several API processes the cluster starts up to this many each per tick
+    WATCH_MAX_STARTS_PER_TICK: int = int(os.getenv("WATCH_MAX_STARTS_PER_TICK", "20"))
+    WATCH_MIN_INTERVAL_SECONDS: int = int(os.getenv("WATCH_MIN_INTERVAL_SECONDS", "300"))
+
+    # Content-addressed store for fetched HTML, used for re-analysis without refetching
+    STORE_HTML_SNAPSHOTS: bool = os.getenv("STORE_HTML_SNAPSHOTS", "True").lower() == "true"
+    SNAPSHOT_STORE_DIR: str = os.getenv("SNAPSHOT_STORE_DIR", "snapshots")
+    SNAPSHOT_COMPRESSION_LEVEL: int = int(os.getenv("SNAPSHOT_COMPRESSION_LEVEL", "6"))
+
+    # seo_reports is partitioned by month; older partitions are archived to gzip NDJSON and dropped
+    REPORT_RETENTION_MONTHS: int = int(os.getenv("REPORT_RETENTION_MONTHS", "12"))
+    REPORT_ARCHIVE_DIR: str = os.getenv("REPORT_ARCHIVE_DIR", "archive")
+    PARTITION_MONTHS_AHEAD: int = int(os.getenv("PARTITION_MONTHS_AHEAD", "3"))
+
+    # Outbound link edges stored per page for the link graph endpoints
+    LINK_GRAPH_MAX_LINKS: int = int(os.getenv("LINK_GRAPH_MAX_LINKS", "1000"))
+
+    # Optional broken-link checking stage
+    LINK_CHECK_MAX_LINKS: int = int(os.getenv("LINK_CHECK_MAX_LINKS", "200"))
+    LINK_CHECK_MAX_CONCURRENCY: int = int(os.getenv("LINK_CHECK_MAX_CONCURRENCY", "50"))
+    LINK_CHECK_PER_HOST_CONCURRENCY: int = int(os.getenv("LINK_CHECK_PER_HOST_CONCURRENCY", "4"))
+    LINK_CHECK_TIMEOUT_SECONDS: float = float(os.getenv("LINK_CHECK_TIMEOUT_SECONDS", "10"))
+    LINK_CHECK_CACHE_TTL_SECONDS: int = int(os.getenv("LINK_CHECK_CACHE_TTL_SECONDS", "3600"))
+    LINK_CHECK_ERROR_CACHE_TTL_SECONDS: int = int(os.getenv("LINK_CHECK_ERROR_CACHE_TTL_SECONDS", "300"))
+    PAGE_WEIGHT_MAX_ASSETS: int = int(os.getenv("PAGE_WEIGHT_MAX_ASSETS", "100"))
+    PAGE_WEIGHT_MAX_CONCURRENCY: int = int(os.getenv("PAGE_WEIGHT_MAX_CONCURRENCY", "20"))
+    PAGE_WEIGHT_TIME_BUDGET_SECONDS: float = float(os.getenv("PAGE_WEIGHT_TIME_BUDGET_SECONDS", "5"))
+    PAGE_WEIGHT_CACHE_TTL_SECONDS: int = int(os.getenv("PAGE_WEIGHT_CACHE_TTL_SECONDS", "86400"))
+
+    # Sampling interval of the opt-in per-job profiler
+    PROFILE_SAMPLE_INTERVAL_MS: float = float(os.getenv("PROFILE_SAMPLE_INTERVAL_MS", "5"))
+
+    STATS_CACHE_TTL_SECONDS: int = int(os.getenv("STATS_CACHE_TTL_SECONDS", "30"))
+
+    # Serialized responses of settled reports kept per process for GET /{report_id}
+    REPORT_CACHE_MAX_ENTRIES: int = int(os.getenv("REPORT_CACHE_MAX_ENTRIES", "5000"))
+    REPORT_CACHE_TTL_SECONDS: int = int(os.getenv("REPORT_CACHE_TTL_SECONDS", "300"))
+    REPORT_CACHE_MAX_AGE_SECONDS: int = int(os.getenv("REPORT_CACHE_MAX_AGE_SECONDS", "60"))
 
     ALLOWED_ORIGINS: str = '["http://localhost:3000"]' 
     
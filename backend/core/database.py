@@ -2,7 +2,34 @@ from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
 from core.config import settings
 
-engine = create_async_engine(settings.DATABASE_URL, echo=settings.DEBUG)
+def _create_engine(url: str, pool_size: int, max_overflow: int):
+    """
+    Creates an async engine with the pool settings shared by every database role.
+    """
+    connect_args = {}
+    if url.startswith("postgresql+asyncpg"):
+        # Set to 0 when running behind PgBouncer in transaction pooling mode.
+        connect_args["statement_cache_size"] = settings.DB_STATEMENT_CACHE_SIZE
+
+    return create_async_engine(
+        url,
+        echo=settings.DB_ECHO,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        connect_args=connect_args,
+    )
+
+engine = _create_engine(settings.DATABASE_URL, settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW)
+
+# Read-only endpoints use the replica when one is configured, otherwise the writer.
+if settings.READ_DATABASE_URL:
+    read_engine = _create_engine(
+        settings.READ_DATABASE_URL, settings.READ_DB_POOL_SIZE, settings.READ_DB_MAX_OVERFLOW
+    )
+else:
+    read_engine = engine
 
 SessionLocal = sessionmaker(
     autocommit=False,
@@ -11,6 +38,13 @@ SessionLocal = sessionmaker(
     class_=AsyncSession
 )
 
+ReadSessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    bind=read_engine,
+    class_=AsyncSession
+)
+
 class Base(DeclarativeBase):
     pass
 
@@ -19,4 +53,12 @@ async def get_db():
     Dependency that provides an async database session.
     """
     async with SessionLocal() as session:
-        yield session
\ No newline at end of file
+        yield session
+
+async def get_read_db():
+    """
+    Dependency that provides an async session bound to the read replica.
+    Falls back to the primary database when no replica is configured.
+    """
+    async with ReadSessionLocal() as session:
+        yield session
@@ -1,13 +1,50 @@
+import asyncio
 import json
+import logging
 import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from core.config import settings
-from core.database import engine, Base
+from core.database import engine, Base, SessionLocal
 from api.v1 import seo_reports
+from services.report_events import report_event_broker
+from services.process_pool import shutdown_process_pool
+from services.link_checker import link_checker
+from services.page_weight import asset_prober
+from services.partitions import ensure_partitions
+from services.insight_stage import resume_stale_insights
+
+logger = logging.getLogger(__name__)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    try:
+        async with SessionLocal() as db:
+            await ensure_partitions(db)
+    except Exception as e:
+        # The default partition still accepts rows; the retention job retries this.
+        logger.error(f"Could not create report partitions: {e}")
+    try:
+        await seo_reports.recover_stranded_reports()
+    except Exception as e:
+        logger.error(f"Could not recover stranded reports: {e}")
+    try:
+        await resume_stale_insights()
+    except Exception as e:
+        logger.error(f"Could not re-queue stale insights: {e}")
+    scheduler = asyncio.create_task(seo_reports.run_watch_scheduler()) if settings.WATCH_SCHEDULER_ENABLED else None
+    yield
+    if scheduler:
+        scheduler.cancel()
+    await report_event_broker.close()
+    await link_checker.close()
+    await asset_prober.close()
+    shutdown_process_pool()
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
+    lifespan=lifespan,
     version="1.0.0",
     description="""
     ## SEO Performance Analyzer API
@@ -80,6 +117,7 @@ app.add_middleware(
 )
 
 app.include_router(seo_reports.router, prefix=f"{settings.API_V1_STR}/seo-reports", tags=["seo-reports"])
+
 @app.get("/")
 async def root():
     return {"message": "SEO Performance Analyzer API", "version": "1.0.0"}
@@ -0,0 +1,34 @@
+from sqlalchemy import Boolean, Column, Integer, String, false
+from core.database import Base
+
+class BatchReport(Base):
+    """
+    Membership of a report in a batch submission.
+
+    Reports are coalesced across batches, so one report may belong to several batches.
+    report_id has no foreign key: seo_reports is partitioned and its key includes
+    created_at. The retention job removes memberships of archived reports.
+    """
+    __tablename__ = "seo_batch_reports"
+
+    batch_id = Column(String(32), primary_key=True)
+    report_id = Column(Integer, primary_key=True, index=True)
+    position = Column(Integer, nullable=False)
+    created = Column(Boolean, nullable=False, default=False, server_default=false())  # the batch created the report
+
+    def __repr__(self):
+        return f"<BatchReport(batch_id='{self.batch_id}', report_id={self.report_id})>"
+
+class URLStaging(Base):
+    """
+    Landing table for bulk URL uploads, loaded with COPY and merged into
+    seo_reports in one statement. Unlogged: rows only live until the merge.
+    """
+    __tablename__ = "seo_url_staging"
+    __table_args__ = {"prefixes": ["UNLOGGED"]}
+
+    batch_id = Column(String(32), primary_key=True)
+    position = Column(Integer, primary_key=True)
+    url = Column(String(500), nullable=False)
+    url_key = Column(String(32), nullable=False)
+    host = Column(String(255), nullable=True)
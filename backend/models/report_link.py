@@ -0,0 +1,28 @@
+from sqlalchemy import Column, Integer, String, Text, Boolean, Index, text
+from core.database import Base
+
+class ReportLink(Base):
+    """
+    One link edge of the site graph: page `source_url_key` links to
+    `target_url_key`. Edges describe the latest analysis of each source page;
+    they are replaced whenever that page is analyzed again.
+    source_report_id has no foreign key because seo_reports is partitioned.
+    """
+    __tablename__ = "seo_links"
+
+    source_url_key = Column(String(32), primary_key=True)  # outbound lookups use the primary key
+    target_url_key = Column(String(32), primary_key=True)
+    source_report_id = Column(Integer, nullable=False)
+    source_host = Column(String(255), nullable=False)
+    target_url = Column(Text, nullable=False)
+    internal = Column(Boolean, nullable=False)
+    nofollow = Column(Boolean, nullable=False)
+
+    __table_args__ = (
+        Index("ix_seo_links_target_url_key", "target_url_key"),
+        # Inbound counts and orphan checks within one site.
+        Index("ix_seo_links_site_target", "source_host", "target_url_key", postgresql_where=text("internal")),
+    )
+
+    def __repr__(self):
+        return f"<ReportLink(source_url_key='{self.source_url_key}', target_url='{self.target_url}')>"
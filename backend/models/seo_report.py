@@ -1,12 +1,30 @@
-from sqlalchemy import Column, Integer, String, Text, Float, DateTime, JSON, Boolean
+from sqlalchemy import Column, Integer, String, Text, Float, DateTime, JSON, DDL, event
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.sql import func
 from core.database import Base
+from services.url_utils import compute_url_key, url_host
 
 class SEOReport(Base):
+    """
+    Range-partitioned by created_at month (see services.partitions). The table's
+    primary key must include the partition key, but rows are identified by id.
+    """
     __tablename__ = "seo_reports"
     
-    id = Column(Integer, primary_key=True, index=True)
-    url = Column(String(500), nullable=False, index=True)
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
+    url = Column(String(500), nullable=False)
+    url_key = Column(
+        String(32),
+        nullable=False,
+        index=True,
+        default=lambda context: compute_url_key(context.get_current_parameters()["url"]),
+    )
+    host = Column(
+        String(255),
+        nullable=True,
+        index=True,
+        default=lambda context: url_host(context.get_current_parameters()["url"]),
+    )
     title = Column(String(200))
     meta_description = Column(String(500))
     h1_tags = Column(JSON)
@@ -18,13 +36,71 @@ class SEOReport(Base):
     performance_score = Column(Float)
     seo_score = Column(Float)
     raw_metrics = Column(JSON, nullable=True)
+    rule_set = Column(String(20), nullable=True)  # rule set of the latest analysis
+    link_check = Column(JSON, nullable=True)  # {"checked", "skipped", "broken_count", "broken": [{"url", "status"}]}
+    page_weight = Column(JSON, nullable=True)  # {"total_bytes", "html_bytes", "largest_asset", "by_type", "assets_*"}
+    score_features = Column(ARRAY(Float), nullable=True)  # ordered as services.score_model.FEATURE_NAMES
+    snapshot_hash = Column(String(64), nullable=True, index=True)  # sha256 of the stored HTML snapshot
+    snapshot_encoding = Column(String(40), nullable=True)  # charset the snapshot was decoded with when fetched
     ai_insights = Column(Text)
     ai_recommendations = Column(JSON)
-    status = Column(String(50), default="pending")  # pending, processing, completed, failed
+    insights_source = Column(String(20), nullable=True)  # llm, rules
+    ai_token_usage = Column(JSON, nullable=True)  # {"estimated_input_tokens", "input_tokens", "output_tokens"}
+    stage_timings = Column(JSON, nullable=True)  # {"queue_wait_ms", "fetch_ms", ..., "ai_ms", "total_ms"}
+    stage_profile = Column(JSON, nullable=True)  # {"interval_ms", "samples", "stacks": [{"stack", "count"}]}
+    status = Column(String(50), default="pending")  # pending, processing, completed, failed; follows the metrics phase
+    metrics_status = Column(String(20), default="pending")  # pending, processing, completed, failed
+    insights_status = Column(String(20), nullable=True)  # not_requested, pending, processing, completed, failed
     error_message = Column(Text)
     completed_at = Column(DateTime(timezone=True), nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), primary_key=True, server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    __table_args__ = {"postgresql_partition_by": "RANGE (created_at)"}
+    __mapper_args__ = {"primary_key": [id]}
     
     def __repr__(self):
-        return f"<SEOReport(url='{self.url}', status='{self.status}', seo_score={self.seo_score})>"
\ No newline at end of file
+        return f"<SEOReport(url='{self.url}', status='{self.status}', seo_score={self.seo_score})>"
+
+class InflightReport(Base):
+    """
+    At most one in-flight report per URL key and set of analysis options
+    (rule set, link check, ...). A unique index on the partitioned
+    seo_reports would have to include created_at, so the guarantee lives in
+    this small table: a report is created only by whoever inserts the guard
+    row, and a trigger removes it when the report leaves the in-flight statuses.
+    A guard claimed longer ago than ANALYSIS_TIMEOUT_SECONDS belongs to a run
+    that died and may be reclaimed by the next submission.
+    """
+    __tablename__ = "seo_inflight_reports"
+
+    url_key = Column(String(32), primary_key=True)
+    options = Column(String(64), primary_key=True, server_default="full")  # see api.v1.seo_reports._analysis_options
+    report_id = Column(Integer, nullable=False)
+    claimed_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+DEFAULT_PARTITION_DDL = DDL("CREATE TABLE IF NOT EXISTS seo_reports_default PARTITION OF seo_reports DEFAULT")
+
+RELEASE_INFLIGHT_FUNCTION_DDL = DDL("""
+CREATE OR REPLACE FUNCTION release_inflight_report() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        DELETE FROM seo_inflight_reports WHERE url_key = OLD.url_key AND report_id = OLD.id;
+    ELSIF NEW.status NOT IN ('pending', 'processing') THEN
+        DELETE FROM seo_inflight_reports WHERE url_key = NEW.url_key AND report_id = NEW.id;
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+""")
+
+RELEASE_INFLIGHT_TRIGGER_DDL = DDL("""
+CREATE TRIGGER trg_release_inflight_report
+AFTER UPDATE OF status OR DELETE ON seo_reports
+FOR EACH ROW EXECUTE FUNCTION release_inflight_report()
+""")
+
+# Keep metadata.create_all (used by the tests) in line with the migrations.
+event.listen(SEOReport.__table__, "after_create", DEFAULT_PARTITION_DDL.execute_if(dialect="postgresql"))
+event.listen(SEOReport.__table__, "after_create", RELEASE_INFLIGHT_FUNCTION_DDL.execute_if(dialect="postgresql"))
+event.listen(SEOReport.__table__, "after_create", RELEASE_INFLIGHT_TRIGGER_DDL.execute_if(dialect="postgresql"))
@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Index, text
+from sqlalchemy.sql import func
+from core.database import Base
+
+class WatchedURL(Base):
+    """
+    A URL re-analyzed on a fixed interval. The scheduler picks up rows whose
+    next_run_at has passed; each URL keeps a stable offset within its interval
+    (see services.watch_schedule) so runs are spread instead of aligned.
+    """
+    __tablename__ = "seo_watched_urls"
+
+    id = Column(Integer, primary_key=True, index=True)
+    url = Column(String(500), nullable=False)
+    url_key = Column(String(32), nullable=False, unique=True)
+    interval_seconds = Column(Integer, nullable=False)
+    enabled = Column(Boolean, nullable=False, default=True, server_default=text("true"))
+    include_ai_insights = Column(Boolean, nullable=False, default=True)
+    rule_set = Column(String(20), nullable=False)
+    check_links = Column(Boolean, nullable=False, default=False)
+    audit_page_weight = Column(Boolean, nullable=False, default=False)
+    next_run_at = Column(DateTime(timezone=True), nullable=False)
+    last_run_at = Column(DateTime(timezone=True), nullable=True)
+    last_report_id = Column(Integer, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # Only enabled rows are ever due; the scheduler scans this index in next_run_at order.
+    __table_args__ = (Index("ix_seo_watched_urls_due", "next_run_at", postgresql_where=text("enabled")),)
+
+    def __repr__(self):
+        return f"<WatchedURL(url='{self.url}', interval_seconds={self.interval_seconds})>"
@@ -1,6 +1,15 @@
-from pydantic import BaseModel, HttpUrl, Field
-from typing import Optional, List, Dict, Any
+from pydantic import AfterValidator, BaseModel, HttpUrl, Field
+from typing import Annotated, Optional, List, Dict, Any
 from datetime import datetime
+from services.seo_rules import DEFAULT_RULE_SET, RULE_SETS
+
+def _validate_rule_set(value: str) -> str:
+    if value not in RULE_SETS:
+        raise ValueError(f"Unknown rule set. Available: {', '.join(RULE_SETS)}")
+    return value
+
+# Name of a scoring rule set, validated against services.seo_rules.RULE_SETS
+RuleSetName = Annotated[str, AfterValidator(_validate_rule_set)]
 
 class SEOReportCreate(BaseModel):
     url: HttpUrl = Field(..., description="Website URL to analyze")
@@ -20,13 +29,24 @@ class SEOReportResponse(BaseModel):
     seo_score: Optional[float] = None
     ai_insights: Optional[str] = None
     ai_recommendations: Optional[List[str]] = None
+    ai_token_usage: Optional[Dict[str, Any]] = None
+    insights_source: Optional[str] = None
+    link_check: Optional[Dict[str, Any]] = None
+    page_weight: Optional[Dict[str, Any]] = None
     status: str
+    metrics_status: Optional[str] = None
+    insights_status: Optional[str] = None
     error_message: Optional[str] = None
     created_at: datetime
     updated_at: Optional[datetime] = None
     
     model_config = {"from_attributes": True}
 
+class SEOReportDebugResponse(SEOReportResponse):
+    """A report with the job's stage breakdown, returned for ?debug=timings."""
+    stage_timings: Optional[Dict[str, Any]] = None
+    stage_profile: Optional[Dict[str, Any]] = None  # only for jobs submitted with profile=true
+
 class SEOReportList(BaseModel):
     reports: List[SEOReportResponse]
     total: int
@@ -36,8 +56,69 @@ class SEOReportList(BaseModel):
 class SEOAnalysisRequest(BaseModel):
     url: HttpUrl = Field(..., description="Website URL to analyze")
     include_ai_insights: bool = Field(True, description="Include AI-generated insights")
+    rule_set: RuleSetName = Field(DEFAULT_RULE_SET, description="Scoring rule set, e.g. 'full' or 'quick'")
+    check_links: bool = Field(False, description="Check the page's links for broken targets")
+    audit_page_weight: bool = Field(False, description="Measure the total size of the page and its assets")
+    ai_latency_budget_ms: Optional[int] = Field(
+        None, ge=0, description="Complete with rule-based insights if the LLM hasn't answered in time; upgraded when it does"
+    )
+    profile: bool = Field(False, description="Capture a sampling profile of the analysis job (see ?debug=timings)")
 
 class SEOAnalysisResponse(BaseModel):
     report_id: int
     status: str
-    message: str
\ No newline at end of file
+    message: str
+
+class ReanalyzeRequest(BaseModel):
+    report_ids: Optional[List[int]] = Field(None, description="Limit re-analysis to these reports")
+    domain: Optional[str] = Field(None, description="Limit re-analysis to one domain")
+    created_from: Optional[datetime] = None
+    created_to: Optional[datetime] = None
+    rule_set: RuleSetName = Field(DEFAULT_RULE_SET, description="Scoring rule set to apply")
+
+class RescoreRequest(BaseModel):
+    weights: Dict[str, float] = Field(default_factory=dict, description="Score weight overrides, e.g. {\"h1_missing\": 25}")
+    dry_run: bool = Field(True, description="Only report the change in score distribution")
+    domain: Optional[str] = None
+    created_from: Optional[datetime] = None
+    created_to: Optional[datetime] = None
+
+class RetentionRequest(BaseModel):
+    retention_months: Optional[int] = Field(None, ge=1, description="Months of reports to keep in the database (default REPORT_RETENTION_MONTHS)")
+    dry_run: bool = Field(True, description="Only list the partitions that would be archived")
+
+class WatchedURLRequest(BaseModel):
+    url: HttpUrl = Field(..., description="URL to re-analyze on a schedule")
+    interval_seconds: int = Field(3600, gt=0, description="Time between runs, e.g. 3600 for hourly or 86400 for daily")
+    enabled: bool = True
+    include_ai_insights: bool = True
+    rule_set: RuleSetName = Field(DEFAULT_RULE_SET, description="Scoring rule set to apply")
+    check_links: bool = False
+    audit_page_weight: bool = False
+
+class WatchedURLResponse(BaseModel):
+    id: int
+    url: str
+    interval_seconds: int
+    enabled: bool
+    include_ai_insights: bool
+    rule_set: str
+    check_links: bool
+    audit_page_weight: bool
+    next_run_at: datetime
+    last_run_at: Optional[datetime] = None
+    last_report_id: Optional[int] = None
+    created_at: Optional[datetime] = None
+
+    model_config = {"from_attributes": True}
+
+class JobResponse(BaseModel):
+    id: str
+    kind: str
+    status: str
+    processed: int
+    updated: int
+    details: Dict[str, Any] = {}
+    error_message: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
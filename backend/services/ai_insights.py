@@ -1,11 +1,12 @@
-import json
-from typing import Dict, List, Optional
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import JsonOutputParser
+import asyncio
+from typing import Any, Callable, Dict, List, Optional
 from pydantic import BaseModel, Field
 import logging
 
+from core.config import settings
+from services.llm_client import ResilientLLMCaller
+from services.prompt_builder import PromptBuilder, compact_metrics, encode_metrics, estimate_tokens
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -15,34 +16,72 @@ class AIResponse(BaseModel):
     summary: str = Field(description="A 2-3 paragraph executive summary of the SEO analysis.")
     recommendations: List[str] = Field(description="A list of 3 to 5 actionable recommendations to improve the SEO score.")
 
+class AIBatchItem(AIResponse):
+    """Insights for one report inside a batched response."""
+    report_id: int = Field(description="The report_id of the metrics these insights are for.")
+
+class AIBatchResponse(BaseModel):
+    """Pydantic model for a batched request covering several reports."""
+    results: List[AIBatchItem] = Field(description="One entry per report_id in the input, in any order.")
+
+SYSTEM_PROMPT = (
+    "You are an expert Technical SEO Auditor. Your task is to analyze a set of SEO metrics and provide a critical but helpful summary and a list of actionable recommendations. "
+    "Focus on the issues that caused penalties in the SEO score. Metrics that are absent were zero or not measured. Your response must be in valid JSON format. "
+    "Here are the formatting instructions: {format_instructions}"
+)
+BATCH_SYSTEM_PROMPT = SYSTEM_PROMPT + " Analyze every report independently and return one result per report_id."
+
+def _token_usage(estimated_input_tokens: int, message: Any, share: float = 1.0) -> Dict[str, Optional[int]]:
+    """Estimated vs. reported token counts; a batched call's usage is split by each report's share."""
+    usage = getattr(message, "usage_metadata", None) or {}
+    def part(key: str) -> Optional[int]:
+        return round(usage[key] * share) if usage.get(key) is not None else None
+    return {
+        "estimated_input_tokens": estimated_input_tokens,
+        "input_tokens": part("input_tokens"),
+        "output_tokens": part("output_tokens"),
+    }
+
 class AIInsightGenerator:
     """
     A service to generate human-readable SEO insights from raw metrics using Gemini.
     """
-    def __init__(self, api_key: str, model_name: str = "gemini-1.5-flash"):
+    def __init__(
+        self,
+        api_key: str,
+        model_name: str = "gemini-1.5-flash",
+        max_input_tokens: Optional[int] = None,
+        caller: Optional[ResilientLLMCaller] = None,
+    ):
         """
         Initializes the AI Insight Generator with the Gemini model and output parser.
+        Model calls go through `caller`, which owns deadlines, retries and hedging.
         """
+        self.max_input_tokens = max_input_tokens or settings.AI_MAX_INPUT_TOKENS
+        self.caller = caller or ResilientLLMCaller(
+            deadline_seconds=settings.AI_DEADLINE_SECONDS,
+            max_retries=settings.AI_MAX_RETRIES,
+            backoff_seconds=settings.AI_RETRY_BACKOFF_SECONDS,
+            backoff_max_seconds=settings.AI_RETRY_BACKOFF_MAX_SECONDS,
+            hedge=settings.AI_HEDGE_ENABLED,
+            hedge_min_samples=settings.AI_HEDGE_MIN_SAMPLES,
+        )
         try:
             if not api_key:
                 raise ValueError("API Key is missing or empty.")
             
+            # LangChain and the GenAI client are slow to import, so load them only when a generator is built.
+            from langchain_google_genai import ChatGoogleGenerativeAI
+
+            # Retries are handled by the caller, so the client itself makes one attempt.
             self.model = ChatGoogleGenerativeAI(
                 model=model_name,
                 google_api_key=api_key, 
-                temperature=0.7
+                temperature=0.7,
+                timeout=settings.AI_ATTEMPT_TIMEOUT_SECONDS,
+                max_retries=0,
             )
-            self.parser = JsonOutputParser(pydantic_object=AIResponse)
-            
-            self.prompt = ChatPromptTemplate.from_messages([
-                ("system", 
-                 "You are an expert Technical SEO Auditor. Your task is to analyze a set of SEO metrics and provide a critical but helpful summary and a list of actionable recommendations. "
-                 "Focus on the issues that caused penalties in the SEO score. Your response must be in valid JSON format. "
-                 "Here are the formatting instructions: {format_instructions}"),
-                ("human", "Please analyze the following SEO metrics and generate your insights: \n\n```json\n{metrics}\n```")
-            ])
-            
-            self.chain = self.prompt | self.model | self.parser
+            self._build_chains()
 
         except ValueError as ve:
             logger.error(ve)
@@ -51,26 +90,98 @@ class AIInsightGenerator:
             logger.error(f"Failed to initialize AIInsightGenerator: {e}")
             self.chain = None
 
-    def generate_insights(self, metrics: Dict) -> Dict:
+    def _build_chains(self) -> None:
+        """
+        Builds the prompts with their format instructions filled in once, so
+        each call only encodes the metrics. Parsing happens outside the chain
+        to keep the model's token usage.
+        """
+        from langchain_core.output_parsers import JsonOutputParser
+        from langchain_core.prompts import ChatPromptTemplate
+
+        self.parser = JsonOutputParser(pydantic_object=AIResponse)
+        format_instructions = self.parser.get_format_instructions()
+        self.prompt = ChatPromptTemplate.from_messages([
+            ("system", SYSTEM_PROMPT),
+            ("human", "Please analyze the following SEO metrics and generate your insights: \n\n```json\n{metrics}\n```")
+        ]).partial(format_instructions=format_instructions)
+        self.chain = self.prompt | self.model
+        self.prompt_builder = PromptBuilder(
+            self.max_input_tokens,
+            static_tokens=estimate_tokens(SYSTEM_PROMPT.format(format_instructions=format_instructions)),
+        )
+
+        self.batch_parser = JsonOutputParser(pydantic_object=AIBatchResponse)
+        batch_format_instructions = self.batch_parser.get_format_instructions()
+        self.batch_prompt = ChatPromptTemplate.from_messages([
+            ("system", BATCH_SYSTEM_PROMPT),
+            ("human", "Please analyze the SEO metrics of each of the following reports and generate your insights: \n\n```json\n{reports}\n```")
+        ]).partial(format_instructions=batch_format_instructions)
+        self.batch_chain = self.batch_prompt | self.model
+        self.batch_static_tokens = estimate_tokens(BATCH_SYSTEM_PROMPT.format(format_instructions=batch_format_instructions))
+
+    async def generate_insights(self, metrics: Dict) -> Dict:
         """
         Generates SEO insights and recommendations from a dictionary of metrics.
+        The result includes the estimated and actual token usage of the call.
         """
         if not self.chain:
             return self._get_fallback_response("AI Insight Generator not initialized.")
 
         try:
-            metrics_str = json.dumps(metrics, indent=2)
-            
-            result = self.chain.invoke({
-                "metrics": metrics_str,
-                "format_instructions": self.parser.get_format_instructions()
-            })
+            metrics_str, estimated_tokens = self.prompt_builder.build(metrics)
+            message = await self.caller.call(lambda: self.chain.ainvoke({"metrics": metrics_str}))
+            result = self.parser.invoke(message)
+            result["token_usage"] = _token_usage(estimated_tokens, message)
+            result["source"] = "llm"
+            logger.info(f"AI insights token usage: {result['token_usage']}")
             return result
         
         except Exception as e:
             logger.error(f"AI insight generation failed: {e}", exc_info=True)
             return self._get_fallback_response(str(e))
 
+    async def generate_insights_batch(self, metrics_by_report: Dict[int, Dict]) -> Dict[int, Dict]:
+        """
+        Generates insights for several reports in one request. Reports missing
+        from the response, or all of them if it doesn't parse, fall back to
+        individual generate_insights calls.
+        """
+        if not self.chain:
+            return {
+                report_id: self._get_fallback_response("AI Insight Generator not initialized.")
+                for report_id in metrics_by_report
+            }
+
+        results: Dict[int, Dict] = {}
+        try:
+            encoded = {report_id: self.prompt_builder.build(metrics) for report_id, metrics in metrics_by_report.items()}
+            item_tokens = {report_id: tokens - self.prompt_builder.static_tokens for report_id, (_, tokens) in encoded.items()}
+            total_item_tokens = sum(item_tokens.values())
+            reports_str = "[" + ",".join(
+                f'{{"report_id":{report_id},"metrics":{metrics_str}}}' for report_id, (metrics_str, _) in encoded.items()
+            ) + "]"
+            message = await self.caller.call(lambda: self.batch_chain.ainvoke({"reports": reports_str}))
+            response = self.batch_parser.invoke(message)
+            for item in AIBatchResponse.model_validate(response).results:
+                if item.report_id in metrics_by_report:
+                    # Each report carries the shared prompt overhead split evenly plus its own metrics.
+                    share = item_tokens[item.report_id] / total_item_tokens
+                    estimated = round(self.batch_static_tokens / len(encoded)) + item_tokens[item.report_id]
+                    results[item.report_id] = {
+                        "summary": item.summary,
+                        "recommendations": item.recommendations,
+                        "token_usage": {**_token_usage(estimated, message, share), "batch_size": len(encoded)},
+                        "source": "llm",
+                    }
+        except Exception as e:
+            logger.warning(f"Batched AI insight generation failed, retrying per report: {e}")
+
+        missing = [report_id for report_id in metrics_by_report if report_id not in results]
+        fallbacks = await asyncio.gather(*(self.generate_insights(metrics_by_report[report_id]) for report_id in missing))
+        results.update(zip(missing, fallbacks))
+        return results
+
     def _get_fallback_response(self, error_message: str) -> Dict:
         """Returns a default dictionary when AI analysis fails."""
         logger.warning(f"Returning fallback response due to error: {error_message}")
@@ -80,5 +191,97 @@ class AIInsightGenerator:
                 "Please try again later.",
                 "Verify API key configuration.",
                 f"Error: {error_message[:100]}..."
-            ]
-        }
\ No newline at end of file
+            ],
+            "source": "fallback",
+        }
+
+class InsightBatcher:
+    """
+    Collects insight requests from concurrent analyses for a short window and
+    sends them to the model together, so the shared prompt and round-trip are
+    paid once per batch. A batch is flushed when the window ends, or earlier
+    once it reaches max_items or max_input_tokens.
+    """
+    def __init__(
+        self,
+        generator_factory: Callable[[], AIInsightGenerator],
+        window_seconds: float,
+        max_items: int,
+        max_input_tokens: int,
+    ):
+        self.generator_factory = generator_factory
+        self.window_seconds = window_seconds
+        self.max_items = max_items
+        self.max_input_tokens = max_input_tokens
+        self._generator: Optional[AIInsightGenerator] = None
+        self._pending: List[Dict[str, Any]] = []
+        self._pending_tokens = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: set = set()
+
+    def _get_generator(self) -> AIInsightGenerator:
+        if self._generator is None:
+            self._generator = self.generator_factory()
+        return self._generator
+
+    async def submit(self, report_id: int, metrics: Dict) -> Dict:
+        """Queues a report's metrics and waits for its insights."""
+        loop = asyncio.get_running_loop()
+        tokens = estimate_tokens(encode_metrics(compact_metrics(metrics)))
+        if self._pending and self._pending_tokens + tokens > self.max_input_tokens:
+            self._flush()
+
+        future = loop.create_future()
+        self._pending.append({"report_id": report_id, "metrics": metrics, "future": future})
+        self._pending_tokens += tokens
+
+        if len(self._pending) >= self.max_items or self._pending_tokens >= self.max_input_tokens:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window_seconds, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending, self._pending_tokens = self._pending, [], 0
+        if batch:
+            task = asyncio.ensure_future(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[Dict[str, Any]]) -> None:
+        try:
+            generator = self._get_generator()
+            if len(batch) == 1:
+                item = batch[0]
+                results = {item["report_id"]: await generator.generate_insights(item["metrics"])}
+            else:
+                logger.info(f"Sending batched AI insight request for {len(batch)} reports")
+                results = await generator.generate_insights_batch(
+                    {item["report_id"]: item["metrics"] for item in batch}
+                )
+            for item in batch:
+                if not item["future"].done():
+                    item["future"].set_result(results[item["report_id"]])
+        except Exception as e:
+            for item in batch:
+                if not item["future"].done():
+                    item["future"].set_exception(e)
+
+_shared_generator: Optional[AIInsightGenerator] = None
+
+def get_insight_generator() -> AIInsightGenerator:
+    """Returns the process-wide generator, creating it on first use."""
+    global _shared_generator
+    if _shared_generator is None:
+        _shared_generator = AIInsightGenerator(api_key=settings.GOOGLE_API_KEY, model_name=settings.MODEL_NAME)
+    return _shared_generator
+
+insight_batcher = InsightBatcher(
+    generator_factory=get_insight_generator,
+    window_seconds=settings.AI_BATCH_WINDOW_MS / 1000,
+    max_items=settings.AI_BATCH_MAX_ITEMS,
+    max_input_tokens=settings.AI_BATCH_MAX_INPUT_TOKENS,
+)
@@ -0,0 +1,168 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from sqlalchemy import JSON, Float, Text, cast, func, update
+from sqlalchemy.dialects.postgresql import JSONB
+
+from core.config import settings
+from core.database import SessionLocal
+from models.seo_report import SEOReport
+from services.ai_insights import get_insight_generator, insight_batcher
+from services.report_cache import invalidate_reports
+from services.report_events import INSIGHTS_IN_PROGRESS, publish_report_status
+from services.report_export import load_raw_metrics
+from services.rule_insights import generate_rule_insights
+
+logger = logging.getLogger(__name__)
+
+# Limits how many reports are in the insight stage at once, independently of metric analysis.
+_stage_limit = asyncio.Semaphore(settings.AI_INSIGHT_CONCURRENCY)
+# Running stages and upgrades, kept referenced until they finish.
+_stage_tasks: set = set()
+
+def _track(coro) -> asyncio.Future:
+    task = asyncio.ensure_future(coro)
+    _stage_tasks.add(task)
+    task.add_done_callback(_stage_tasks.discard)
+    return task
+
+def _with_stage_timing(stage: str, ms: float):
+    """stage_timings with one entry set, merged in SQL so it doesn't race the metrics job's write."""
+    current = func.coalesce(cast(SEOReport.stage_timings, JSONB), func.jsonb_build_object())
+    entry = func.jsonb_build_object(cast(stage, Text), cast(round(ms, 1), Float))
+    return cast(current.op("||")(entry), JSON)
+
+async def store_insights(
+    report_id: int,
+    insights_status: str,
+    ai_results: Optional[Dict[str, Any]] = None,
+    ai_ms: Optional[float] = None,
+) -> None:
+    """Writes the insight fields and insights_status of a report, and notifies listeners."""
+    values: Dict[str, Any] = {"insights_status": insights_status}
+    if ai_results:
+        values.update(
+            ai_insights=ai_results.get('summary'),
+            ai_recommendations=ai_results.get('recommendations'),
+            ai_token_usage=ai_results.get('token_usage'),
+            insights_source=ai_results.get('source'),
+        )
+    if ai_ms is not None:
+        values["stage_timings"] = _with_stage_timing("ai_ms", ai_ms)
+    async with SessionLocal() as db:
+        await db.execute(update(SEOReport).where(SEOReport.id == report_id).values(**values))
+        await publish_report_status(db, report_id, "completed", insights_status)
+        await db.commit()
+    invalidate_reports([report_id])
+
+async def _request_llm_insights(report_id: int, analysis_results: Dict[str, Any]) -> Dict[str, Any]:
+    if settings.AI_BATCH_ENABLED:
+        return await insight_batcher.submit(report_id, analysis_results)
+    return await get_insight_generator().generate_insights(analysis_results)
+
+def _usable_llm_insights(task: asyncio.Future) -> Optional[Dict[str, Any]]:
+    """The finished LLM result, or None if the call failed or returned the canned fallback."""
+    if task.cancelled():
+        return None
+    if task.exception() is not None:
+        logger.error(f"AI Generation failed: {task.exception()}")
+        return None
+    result = task.result()
+    return result if result.get('source') == 'llm' else None
+
+async def _upgrade_insights(report_id: int, llm_task: asyncio.Future, started: float) -> None:
+    """
+    Waits for an LLM call that missed its latency budget and replaces the
+    report's rule-based insights with its result.
+    """
+    try:
+        await asyncio.wait({llm_task})
+        ai_results = _usable_llm_insights(llm_task)
+        if ai_results:
+            await store_insights(report_id, "completed", ai_results, ai_ms=(time.perf_counter() - started) * 1000)
+            logger.info(f"Upgraded report {report_id} to LLM insights")
+    except Exception as e:
+        logger.error(f"Failed to upgrade insights for report {report_id}: {e}")
+
+async def run_insight_stage(
+    report_id: int,
+    analysis_results: Dict[str, Any],
+    link_check: Optional[Dict[str, Any]] = None,
+    latency_budget_ms: Optional[int] = None,
+) -> None:
+    """
+    Produces insights for a report whose metrics are already stored. If the
+    LLM misses the latency budget, rule-based insights are stored first and
+    replaced when the LLM answers.
+    """
+    llm_task = None
+    upgrade = False
+    try:
+        async with _stage_limit:
+            await store_insights(report_id, "processing")
+
+            started = time.perf_counter()
+            ai_results = None
+            if settings.GOOGLE_API_KEY:
+                if latency_budget_ms is None:
+                    latency_budget_ms = settings.AI_LATENCY_BUDGET_MS
+                llm_task = asyncio.ensure_future(_request_llm_insights(report_id, analysis_results))
+                done, _ = await asyncio.wait({llm_task}, timeout=latency_budget_ms / 1000 if latency_budget_ms else None)
+                if done:
+                    ai_results = _usable_llm_insights(llm_task)
+                else:
+                    upgrade = True
+            else:
+                logger.warning("GOOGLE_API_KEY missing in settings. Using rule-based insights.")
+
+            if not ai_results:
+                ai_results = generate_rule_insights(analysis_results, link_check)
+            await store_insights(report_id, "completed", ai_results, ai_ms=(time.perf_counter() - started) * 1000)
+            if upgrade:
+                # Only once the rule-based write has committed, so it can't land after the LLM result.
+                _track(_upgrade_insights(report_id, llm_task, started))
+    except Exception as e:
+        logger.error(f"Insight stage failed for report {report_id}: {e}")
+        if upgrade:
+            llm_task.cancel()
+        try:
+            await store_insights(report_id, "failed")
+        except Exception as store_error:
+            logger.error(f"Could not mark insights failed for report {report_id}: {store_error}")
+
+def schedule_insights(
+    report_id: int,
+    analysis_results: Dict[str, Any],
+    link_check: Optional[Dict[str, Any]] = None,
+    latency_budget_ms: Optional[int] = None,
+) -> asyncio.Future:
+    """Starts the insight stage for a report in the background."""
+    return _track(run_insight_stage(report_id, analysis_results, link_check, latency_budget_ms))
+
+async def resume_stale_insights(stale_seconds: Optional[int] = None) -> int:
+    """
+    Re-queues the insight stage of reports left pending or processing by a
+    process that stopped, using their stored metrics. The claim bumps
+    updated_at, so processes starting together don't pick up the same reports.
+    Returns the number of reports re-queued.
+    """
+    if stale_seconds is None:
+        stale_seconds = settings.AI_INSIGHTS_STALE_SECONDS
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=stale_seconds)
+    async with SessionLocal() as db:
+        result = await db.execute(
+            update(SEOReport)
+            .where(SEOReport.insights_status.in_(INSIGHTS_IN_PROGRESS), SEOReport.updated_at < cutoff)
+            .values(insights_status="pending")
+            .returning(SEOReport.id, SEOReport.raw_metrics, SEOReport.link_check)
+        )
+        rows = result.all()
+        await db.commit()
+    for report_id, raw_metrics, link_check in rows:
+        schedule_insights(report_id, load_raw_metrics(raw_metrics), link_check)
+    if rows:
+        logger.info(f"Re-queued insights for {len(rows)} stale reports")
+    return len(rows)
@@ -0,0 +1,38 @@
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field, asdict
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+@dataclass
+class BackgroundJob:
+    id: str
+    kind: str
+    status: str = "pending"  # pending, running, completed, failed
+    processed: int = 0
+    updated: int = 0
+    details: Dict[str, Any] = field(default_factory=dict)
+    error_message: Optional[str] = None
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    finished_at: Optional[datetime] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+class JobRegistry:
+    """Keeps the most recent background jobs of this process for status polling."""
+    def __init__(self, max_jobs: int = 100):
+        self.max_jobs = max_jobs
+        self._jobs: "OrderedDict[str, BackgroundJob]" = OrderedDict()
+
+    def create(self, kind: str, **details: Any) -> BackgroundJob:
+        job = BackgroundJob(id=f"{kind}_{uuid.uuid4().hex[:8]}", kind=kind, details=dict(details))
+        self._jobs[job.id] = job
+        while len(self._jobs) > self.max_jobs:
+            self._jobs.popitem(last=False)
+        return job
+
+    def get(self, job_id: str) -> Optional[BackgroundJob]:
+        return self._jobs.get(job_id)
+
+jobs = JobRegistry()
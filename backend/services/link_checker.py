@@ -0,0 +1,137 @@
+import asyncio
+import logging
+import weakref
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+from core.config import settings
+from services.ttl_cache import TTLCache
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+# HEAD responses that often mean "HEAD not supported" rather than "broken".
+HEAD_FALLBACK_STATUSES = {403, 405, 501}
+
+class LinkChecker:
+    """
+    Checks link targets with HEAD (falling back to GET) under global and per-host
+    concurrency limits. Results are cached across reports, and concurrent checks
+    of the same URL share one request.
+    """
+    def __init__(
+        self,
+        max_concurrency: int,
+        per_host_concurrency: int,
+        timeout: float,
+        cache_ttl: float,
+        error_cache_ttl: float,
+        cache_size: int = 100_000,
+    ):
+        self.per_host_concurrency = per_host_concurrency
+        self.timeout = timeout
+        self.error_cache_ttl = error_cache_ttl
+        self.cache = TTLCache(maxsize=cache_size, ttl=cache_ttl)
+        self._global_limit = asyncio.Semaphore(max_concurrency)
+        self._host_limits: "weakref.WeakValueDictionary[str, asyncio.Semaphore]" = weakref.WeakValueDictionary()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._client: Optional["httpx.AsyncClient"] = None
+
+    def _get_client(self) -> "httpx.AsyncClient":
+        if self._client is None:
+            # httpx is loaded on first use to keep API startup fast.
+            import httpx
+
+            self._client = httpx.AsyncClient(
+                headers={'User-Agent': 'Mozilla/5.0 (compatible; SiteSage/1.0)'},
+                follow_redirects=True,
+                timeout=self.timeout,
+            )
+        return self._client
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        host = urlparse(url).netloc
+        semaphore = self._host_limits.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.per_host_concurrency)
+            self._host_limits[host] = semaphore
+        return semaphore
+
+    async def _fetch_status(self, url: str) -> Optional[int]:
+        """Returns the final HTTP status of a URL, or None if it couldn't be reached."""
+        import httpx
+
+        client = self._get_client()
+        try:
+            host_limit = self._host_limit(url)
+            # Take the host slot first so a busy host doesn't pin global slots while waiting.
+            async with host_limit, self._global_limit:
+                response = await client.head(url)
+                if response.status_code not in HEAD_FALLBACK_STATUSES:
+                    return response.status_code
+                # Stream the GET so only the headers are read.
+                async with client.stream("GET", url) as response:
+                    return response.status_code
+        # A malformed href (bad IDNA label, control characters) fails before any
+        # request is sent, with InvalidURL or a ValueError; it counts as unreachable.
+        except (httpx.HTTPError, httpx.InvalidURL, ValueError) as e:
+            logger.debug(f"Link check failed for {url}: {e}")
+            return None
+
+    async def check_url(self, url: str) -> Optional[int]:
+        cached = self.cache.get(url)
+        if cached is not None:
+            return cached["status"]
+
+        inflight = self._inflight.get(url)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[url] = future
+        try:
+            status = await self._fetch_status(url)
+        except BaseException:
+            future.cancel()
+            raise
+        finally:
+            del self._inflight[url]
+
+        broken = status is None or status >= 400
+        self.cache.set(url, {"status": status}, ttl=self.error_cache_ttl if broken else None)
+        future.set_result(status)
+        return status
+
+    async def check_page(self, link_targets: List[Dict[str, Any]], max_links: int) -> Dict[str, Any]:
+        """
+        Checks a page's link targets and returns a compact summary that only
+        lists the broken ones.
+        """
+        urls = [target["url"] for target in link_targets[:max_links]]
+        statuses = await asyncio.gather(*(self.check_url(url) for url in urls))
+        broken = [
+            {"url": url, "status": status}
+            for url, status in zip(urls, statuses)
+            if status is None or status >= 400
+        ]
+        return {
+            "checked": len(urls),
+            "skipped": max(0, len(link_targets) - len(urls)),
+            "broken_count": len(broken),
+            "broken": broken,
+        }
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+link_checker = LinkChecker(
+    max_concurrency=settings.LINK_CHECK_MAX_CONCURRENCY,
+    per_host_concurrency=settings.LINK_CHECK_PER_HOST_CONCURRENCY,
+    timeout=settings.LINK_CHECK_TIMEOUT_SECONDS,
+    cache_ttl=settings.LINK_CHECK_CACHE_TTL_SECONDS,
+    error_cache_ttl=settings.LINK_CHECK_ERROR_CACHE_TTL_SECONDS,
+)
@@ -0,0 +1,95 @@
+from typing import Any, Dict, List
+
+from sqlalchemy import delete, insert, text
+
+from models.report_link import ReportLink
+from services.url_utils import compute_url_key, has_valid_port, url_host
+
+def link_rows(report_id: int, url: str, link_targets: List[Dict[str, Any]], max_links: int) -> List[Dict[str, Any]]:
+    """
+    Turns the analyzer's link targets into seo_links rows for one page, one row
+    per distinct target page (spellings that canonicalize to the same key collapse).
+    Targets that can't be parsed (e.g. an out-of-range port) are skipped.
+    """
+    source_url_key = compute_url_key(url)
+    source_host = url_host(url)
+    rows: Dict[str, Dict[str, Any]] = {}
+    for target in link_targets:
+        if not has_valid_port(target["url"]):
+            continue
+        try:
+            target_url_key = compute_url_key(target["url"])
+        except ValueError:
+            continue
+        if target_url_key in rows:
+            continue
+        rows[target_url_key] = {
+            "source_url_key": source_url_key,
+            "target_url_key": target_url_key,
+            "source_report_id": report_id,
+            "source_host": source_host,
+            "target_url": target["url"],
+            "internal": bool(target.get("internal")),
+            "nofollow": bool(target.get("nofollow")),
+        }
+        if len(rows) >= max_links:
+            break
+    return list(rows.values())
+
+async def replace_page_links(db, report_id: int, url: str, link_targets: List[Dict[str, Any]], max_links: int) -> int:
+    """
+    Replaces a page's outbound edges with those of its latest analysis, on the
+    caller's transaction. Returns the number of edges written.
+    """
+    rows = link_rows(report_id, url, link_targets, max_links)
+    await db.execute(delete(ReportLink).where(ReportLink.source_url_key == compute_url_key(url)))
+    if rows:
+        await db.execute(insert(ReportLink), rows)
+    return len(rows)
+
+# Pages whose latest analysis links to the target.
+INBOUND_LINKS = text("""
+    SELECT l.source_report_id, r.url AS source_url, l.internal, l.nofollow
+    FROM seo_links l
+    JOIN seo_reports r ON r.id = l.source_report_id
+    WHERE l.target_url_key = :url_key
+    ORDER BY r.url
+    LIMIT :limit OFFSET :offset
+""")
+
+OUTBOUND_LINKS = text("""
+    SELECT target_url, internal, nofollow
+    FROM seo_links
+    WHERE source_url_key = :url_key
+    ORDER BY target_url
+    LIMIT :limit OFFSET :offset
+""")
+
+# Internal inbound links per page of a site; self-links don't count.
+SITE_INBOUND_COUNTS = text("""
+    SELECT target_url_key, min(target_url) AS url, count(*) AS inbound_links,
+           count(*) FILTER (WHERE NOT nofollow) AS followed_inbound_links
+    FROM seo_links
+    WHERE source_host = :host AND internal AND source_url_key <> target_url_key
+    GROUP BY target_url_key
+    ORDER BY inbound_links DESC, url
+    LIMIT :limit OFFSET :offset
+""")
+
+# Analyzed pages of a site that no other analyzed page of the site links to.
+SITE_ORPHAN_PAGES = text("""
+    SELECT p.id AS report_id, p.url
+    FROM (
+        SELECT DISTINCT ON (url_key) id, url, url_key
+        FROM seo_reports
+        WHERE host = :host AND status = 'completed'
+        ORDER BY url_key, created_at DESC
+    ) p
+    WHERE NOT EXISTS (
+        SELECT 1 FROM seo_links l
+        WHERE l.source_host = :host AND l.internal
+          AND l.target_url_key = p.url_key AND l.source_url_key <> p.url_key
+    )
+    ORDER BY p.url
+    LIMIT :limit OFFSET :offset
+""")
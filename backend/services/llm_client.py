@@ -0,0 +1,151 @@
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# HTTP statuses worth retrying: rate limiting and transient server errors.
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+RETRYABLE_ERROR_NAMES = {
+    "DeadlineExceeded", "InternalServerError", "ResourceExhausted", "ServiceUnavailable",
+    "TooManyRequests", "ServerError", "ConnectError", "ReadTimeout", "RemoteProtocolError",
+}
+
+def is_retryable(error: BaseException) -> bool:
+    """Timeouts, connection failures, rate limits and 5xx responses are retryable."""
+    if isinstance(error, (asyncio.TimeoutError, ConnectionError)):
+        return True
+    for attr in ("status_code", "code"):
+        value = getattr(error, attr, None)
+        if isinstance(value, int) and value in RETRYABLE_STATUS_CODES:
+            return True
+    return type(error).__name__ in RETRYABLE_ERROR_NAMES
+
+class LLMCallStats:
+    """Counters and a rolling latency window for the calls made through one caller."""
+    def __init__(self, window: int = 200):
+        self.latencies = deque(maxlen=window)
+        self.calls = 0
+        self.attempts = 0
+        self.retries = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.timeouts = 0
+        self.failures = 0
+
+    def record_latency(self, seconds: float) -> None:
+        self.latencies.append(seconds)
+
+    def p95(self) -> Optional[float]:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+    def to_dict(self) -> Dict[str, Any]:
+        p95 = self.p95()
+        return {
+            "calls": self.calls,
+            "attempts": self.attempts,
+            "retries": self.retries,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "timeouts": self.timeouts,
+            "failures": self.failures,
+            "latency_samples": len(self.latencies),
+            "p95_latency_ms": round(p95 * 1000, 1) if p95 is not None else None,
+        }
+
+class ResilientLLMCaller:
+    """
+    Runs LLM calls under an overall deadline, retrying retryable errors with
+    jittered exponential backoff. With hedging on, an attempt still running
+    past the observed p95 latency gets a second identical request, and the
+    first to answer wins.
+    """
+    def __init__(
+        self,
+        deadline_seconds: float,
+        max_retries: int,
+        backoff_seconds: float,
+        backoff_max_seconds: float,
+        hedge: bool = False,
+        hedge_min_samples: int = 20,
+    ):
+        self.deadline_seconds = deadline_seconds
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self.hedge = hedge
+        self.hedge_min_samples = hedge_min_samples
+        self.stats = LLMCallStats()
+
+    def _hedge_delay(self) -> Optional[float]:
+        if not self.hedge or len(self.stats.latencies) < self.hedge_min_samples:
+            return None
+        return self.stats.p95()
+
+    async def _attempt(self, make_call: Callable[[], Awaitable[T]]) -> T:
+        start = time.perf_counter()
+        self.stats.attempts += 1
+        primary = asyncio.ensure_future(make_call())
+        tasks = {primary}
+        try:
+            hedge_delay = self._hedge_delay()
+            if hedge_delay is not None:
+                done, _ = await asyncio.wait(tasks, timeout=hedge_delay)
+                if not done:
+                    self.stats.hedges += 1
+                    self.stats.attempts += 1
+                    tasks.add(asyncio.ensure_future(make_call()))
+
+            while True:
+                done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                winner = next((task for task in done if not task.exception()), None)
+                if winner is not None:
+                    if winner is not primary:
+                        self.stats.hedge_wins += 1
+                    self.stats.record_latency(time.perf_counter() - start)
+                    return winner.result()
+                tasks -= done
+                if not tasks:
+                    # Every request failed; surface the primary's error when it has one.
+                    failed = primary if primary.done() else next(iter(done))
+                    raise failed.exception()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _call_with_retries(self, make_call: Callable[[], Awaitable[T]]) -> T:
+        for attempt in range(self.max_retries + 1):
+            try:
+                return await self._attempt(make_call)
+            except Exception as e:
+                if attempt >= self.max_retries or not is_retryable(e):
+                    raise
+                self.stats.retries += 1
+                delay = min(self.backoff_max_seconds, self.backoff_seconds * 2 ** attempt)
+                delay = random.uniform(0, delay)
+                logger.warning(f"Retryable LLM error ({e!r}), retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+
+    async def call(self, make_call: Callable[[], Awaitable[T]]) -> T:
+        """
+        Calls `make_call` (which must start a fresh request each time) and
+        returns its result, raising asyncio.TimeoutError past the deadline.
+        """
+        self.stats.calls += 1
+        try:
+            return await asyncio.wait_for(self._call_with_retries(make_call), timeout=self.deadline_seconds)
+        except asyncio.TimeoutError:
+            self.stats.timeouts += 1
+            self.stats.failures += 1
+            raise
+        except Exception:
+            self.stats.failures += 1
+            raise
@@ -0,0 +1,132 @@
+import asyncio
+import logging
+import re
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from core.config import settings
+from services.score_model import extract_score_features, page_weight_penalty
+from services.ttl_cache import TTLCache
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+CONTENT_RANGE_TOTAL = re.compile(r"/(\d+)\s*$")
+
+class AssetProber:
+    """
+    Finds asset sizes without downloading them: HEAD for Content-Length, then a
+    one-byte ranged GET whose Content-Range carries the total size. Sizes are
+    cached per asset URL across reports.
+    """
+    def __init__(self, max_concurrency: int, timeout: float, cache_ttl: float, cache_size: int = 100_000):
+        self.timeout = timeout
+        self.cache = TTLCache(maxsize=cache_size, ttl=cache_ttl)
+        self._limit = asyncio.Semaphore(max_concurrency)
+        self._client: Optional["httpx.AsyncClient"] = None
+
+    def _get_client(self) -> "httpx.AsyncClient":
+        if self._client is None:
+            # httpx is loaded on first use to keep API startup fast.
+            import httpx
+
+            self._client = httpx.AsyncClient(
+                headers={'User-Agent': 'Mozilla/5.0 (compatible; SiteSage/1.0)'},
+                follow_redirects=True,
+                timeout=self.timeout,
+            )
+        return self._client
+
+    async def _fetch_size(self, url: str) -> Optional[int]:
+        import httpx
+
+        client = self._get_client()
+        async with self._limit:
+            try:
+                response = await client.head(url)
+                length = response.headers.get("content-length")
+                if response.status_code < 400 and length and length.isdigit() and int(length) > 0:
+                    return int(length)
+
+                async with client.stream("GET", url, headers={"Range": "bytes=0-0"}) as response:
+                    if response.status_code == 206:
+                        match = CONTENT_RANGE_TOTAL.search(response.headers.get("content-range", ""))
+                        if match:
+                            return int(match.group(1))
+                    length = response.headers.get("content-length")
+                    if response.status_code < 400 and length and length.isdigit():
+                        return int(length)
+            except httpx.HTTPError as e:
+                logger.debug(f"Asset size probe failed for {url}: {e}")
+        return None
+
+    async def asset_size(self, url: str) -> Optional[int]:
+        cached = self.cache.get(url)
+        if cached is not None:
+            return cached["bytes"]
+        size = await self._fetch_size(url)
+        if size is not None:
+            self.cache.set(url, {"bytes": size})
+        return size
+
+    async def audit_page(self, html_bytes: int, asset_targets: List[Dict[str, Any]], max_assets: int, time_budget: float) -> Dict[str, Any]:
+        """
+        Probes the page's assets within the time budget. Assets not sized in time
+        count as unknown and are left out of the totals.
+        """
+        targets = asset_targets[:max_assets]
+        tasks = {asyncio.ensure_future(self.asset_size(target["url"])): target for target in targets}
+        done, pending = await asyncio.wait(tasks, timeout=time_budget) if tasks else (set(), set())
+        for task in pending:
+            task.cancel()
+
+        total_bytes = html_bytes
+        by_type: Dict[str, int] = {"html": html_bytes}
+        largest: Optional[Dict[str, Any]] = None
+        sized = 0
+        for task in done:
+            size = None if task.exception() else task.result()
+            if size is None:
+                continue
+            target = tasks[task]
+            sized += 1
+            total_bytes += size
+            by_type[target["type"]] = by_type.get(target["type"], 0) + size
+            if largest is None or size > largest["bytes"]:
+                largest = {"url": target["url"], "bytes": size}
+
+        return {
+            "total_bytes": total_bytes,
+            "html_bytes": html_bytes,
+            "largest_asset": largest,
+            "by_type": by_type,
+            "assets_found": len(asset_targets),
+            "assets_sized": sized,
+            "assets_unknown": len(asset_targets) - sized,
+        }
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+def apply_page_weight(analysis_results: Dict[str, Any], page_weight: Dict[str, Any], response_time_ms: int) -> None:
+    """
+    Folds the page-weight audit into the analysis results: adds the weight
+    metrics, the page_weight penalty, the adjusted score and feature vector.
+    """
+    largest = page_weight.get("largest_asset") or {}
+    analysis_results["page_weight_bytes"] = page_weight["total_bytes"]
+    analysis_results["largest_asset_bytes"] = largest.get("bytes")
+
+    penalty = page_weight_penalty(page_weight["total_bytes"], largest.get("bytes"))
+    analysis_results.setdefault("rule_penalties", {})["page_weight"] = penalty
+    analysis_results["score"] = max(0, analysis_results.get("score", 0) - penalty)
+    analysis_results["score_features"] = extract_score_features(analysis_results, response_time_ms)
+
+asset_prober = AssetProber(
+    max_concurrency=settings.PAGE_WEIGHT_MAX_CONCURRENCY,
+    timeout=settings.PAGE_WEIGHT_TIME_BUDGET_SECONDS,
+    cache_ttl=settings.PAGE_WEIGHT_CACHE_TTL_SECONDS,
+)
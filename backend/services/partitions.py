@@ -0,0 +1,185 @@
+import gzip
+import json
+import logging
+import os
+import re
+from datetime import date, datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import text
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = "seo_reports"
+DEFAULT_PARTITION = "seo_reports_default"
+PARTITION_NAME = re.compile(r"^seo_reports_y(\d{4})m(\d{2})$")
+ARCHIVE_YIELD_PER = 1000
+
+def month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+def add_months(value: date, months: int) -> date:
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+def partition_name(month: date) -> str:
+    return f"{PARENT_TABLE}_y{month.year:04d}m{month.month:02d}"
+
+def partition_month(name: str) -> Optional[date]:
+    match = PARTITION_NAME.match(name)
+    return date(int(match.group(1)), int(match.group(2)), 1) if match else None
+
+def _utc_bound(month: date) -> str:
+    return f"{month.isoformat()} 00:00:00+00"
+
+def _utc_datetime(month: date) -> datetime:
+    return datetime(month.year, month.month, 1, tzinfo=timezone.utc)
+
+async def ensure_partitions(db, months_ahead: int = None, today: Optional[date] = None) -> List[str]:
+    """
+    Creates the monthly partitions from the current month through
+    `months_ahead` months ahead, so new rows never land in the default partition.
+    Rows that already landed there are moved into the new partition.
+    """
+    months_ahead = settings.PARTITION_MONTHS_AHEAD if months_ahead is None else months_ahead
+    current = month_start(today or datetime.now(timezone.utc).date())
+    created = []
+    for offset in range(months_ahead + 1):
+        month = add_months(current, offset)
+        name = partition_name(month)
+        exists = await db.scalar(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": name})
+        if exists:
+            continue
+        lower, upper = _utc_bound(month), _utc_bound(add_months(month, 1))
+        create = text(f"CREATE TABLE {name} PARTITION OF {PARENT_TABLE} FOR VALUES FROM ('{lower}') TO ('{upper}')")
+        bounds = {"lower": _utc_datetime(month), "upper": _utc_datetime(add_months(month, 1))}
+        stranded = await db.scalar(
+            text(f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE created_at >= :lower AND created_at < :upper)"),
+            bounds,
+        )
+        if stranded:
+            await _create_from_default(db, name, create, bounds)
+        else:
+            await db.execute(create)
+        created.append(name)
+    await db.commit()
+    if created:
+        logger.info(f"Created report partitions: {', '.join(created)}")
+    return created
+
+async def _create_from_default(db, name: str, create, bounds: Dict[str, datetime]) -> None:
+    """
+    Creates a month partition whose range already has rows in the default
+    partition, which Postgres refuses while those rows are attached: detaches
+    the default, creates the month, moves the rows over and reattaches the
+    default, all in one transaction. A detached table loses the parent's
+    cloned triggers, so the move doesn't release in-flight guards.
+    """
+    await db.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {DEFAULT_PARTITION}"))
+    await db.execute(create)
+    await db.execute(
+        text(f"INSERT INTO {name} SELECT * FROM {DEFAULT_PARTITION} WHERE created_at >= :lower AND created_at < :upper"),
+        bounds,
+    )
+    await db.execute(
+        text(f"DELETE FROM {DEFAULT_PARTITION} WHERE created_at >= :lower AND created_at < :upper"), bounds
+    )
+    await db.execute(text(f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT"))
+    logger.warning(f"Moved rows of {name} out of {DEFAULT_PARTITION}")
+
+async def list_month_tables(db) -> List[Tuple[str, date, bool]]:
+    """Returns (name, month, attached) for every monthly report table, attached or detached."""
+    result = await db.execute(text("""
+        SELECT c.relname, EXISTS (
+            SELECT 1 FROM pg_inherits i
+            JOIN pg_class p ON p.oid = i.inhparent
+            WHERE i.inhrelid = c.oid AND p.relname = :parent
+        ) AS attached
+        FROM pg_class c
+        WHERE c.relkind = 'r' AND c.relname LIKE 'seo\\_reports\\_y%'
+        ORDER BY c.relname
+    """), {"parent": PARENT_TABLE})
+    tables = []
+    for name, attached in result.all():
+        month = partition_month(name)
+        if month:
+            tables.append((name, month, attached))
+    return tables
+
+def archive_path(month: date, archive_dir: Optional[str] = None) -> str:
+    return os.path.join(archive_dir or settings.REPORT_ARCHIVE_DIR, f"{partition_name(month)}.ndjson.gz")
+
+def _archive_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot archive {type(value).__name__}")
+
+async def archive_partition(db, name: str, month: date, archive_dir: Optional[str] = None) -> int:
+    """
+    Archives one monthly partition: detaches it if still attached, writes its
+    rows to a gzip NDJSON file, removes batch memberships and in-flight guards
+    of its reports, and drops it. Safe to re-run after a failure part-way.
+    Returns the number of archived rows.
+    """
+    path = archive_path(month, archive_dir)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    attached = await db.scalar(
+        text("SELECT EXISTS (SELECT 1 FROM pg_inherits WHERE inhrelid = to_regclass(:name))"), {"name": name}
+    )
+    if attached:
+        await db.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}"))
+        await db.commit()
+
+    rows = 0
+    tmp_path = f"{path}.tmp"
+    with gzip.open(tmp_path, "wt", encoding="utf-8", compresslevel=settings.SNAPSHOT_COMPRESSION_LEVEL) as archive:
+        result = await db.stream(text(f"SELECT * FROM {name} ORDER BY id").execution_options(yield_per=ARCHIVE_YIELD_PER))
+        async for partition in result.partitions():
+            for row in partition:
+                archive.write(json.dumps(dict(row._mapping), default=_archive_value) + "\n")
+                rows += 1
+    os.replace(tmp_path, path)
+
+    await db.execute(text(f"DELETE FROM seo_batch_reports WHERE report_id IN (SELECT id FROM {name})"))
+    await db.execute(text(f"DELETE FROM seo_inflight_reports WHERE report_id IN (SELECT id FROM {name})"))
+    await db.execute(text(f"DELETE FROM seo_links WHERE source_report_id IN (SELECT id FROM {name})"))
+    await db.execute(text(f"DROP TABLE {name}"))
+    await db.commit()
+    logger.info(f"Archived {rows} reports from {name} to {path}")
+    return rows
+
+def _parse_time(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+def read_archived_reports(
+    created_from: datetime,
+    created_to: Optional[datetime] = None,
+    url_key: Optional[str] = None,
+    status: Optional[str] = None,
+    archive_dir: Optional[str] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yields archived reports created in [created_from, created_to), reading only
+    the monthly files that overlap the range. Blocking; run it in a thread.
+    """
+    created_to = created_to or datetime.now(timezone.utc)
+    month = month_start(created_from.astimezone(timezone.utc).date())
+    while month <= created_to.astimezone(timezone.utc).date():
+        path = archive_path(month, archive_dir)
+        if os.path.exists(path):
+            with gzip.open(path, "rt", encoding="utf-8") as archive:
+                for line in archive:
+                    record = json.loads(line)
+                    if url_key and record.get("url_key") != url_key:
+                        continue
+                    if status and record.get("status") != status:
+                        continue
+                    created_at = _parse_time(record.get("created_at"))
+                    if created_at and created_from <= created_at < created_to:
+                        record["created_at"] = created_at
+                        record["archived"] = True
+                        yield record
+        month = add_months(month, 1)
@@ -1,16 +1,19 @@
 from io import BytesIO
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.enums import TA_CENTER, TA_LEFT
-from reportlab.lib import colors
 from datetime import datetime
+from services.process_pool import run_in_process_pool
 
 def generate_report_pdf(analysis_data: dict) -> bytes:
     """
     Generates a professional PDF report from SEO analysis data.
     Matches the data structure provided by api/v1/seo_reports.py.
     """
+    # ReportLab is imported on first use so API processes that never render don't pay for it.
+    from reportlab.lib.pagesizes import letter
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.enums import TA_CENTER, TA_LEFT
+    from reportlab.lib import colors
+
     buffer = BytesIO()
     doc = SimpleDocTemplate(
         buffer, 
@@ -82,7 +85,10 @@ def generate_report_pdf(analysis_data: dict) -> bytes:
     story.append(Paragraph("Executive Summary", styles['SectionHeader']))
     summary_text = analysis_data.get('ai_insights')
     if not summary_text:
-        summary_text = "No AI summary available."
+        if analysis_data.get('insights_status') in ('pending', 'processing'):
+            summary_text = "AI insights are still being generated. Download the report again shortly for the full summary."
+        else:
+            summary_text = "No AI summary available."
     story.append(Paragraph(str(summary_text), styles['BodyTextLeft'])) 
     story.append(Spacer(1, 12))
 
@@ -152,4 +158,8 @@ def generate_report_pdf(analysis_data: dict) -> bytes:
     doc.build(story)
     pdf_bytes = buffer.getvalue()
     buffer.close()
-    return pdf_bytes
\ No newline at end of file
+    return pdf_bytes
+
+async def render_report_pdf(analysis_data: dict) -> bytes:
+    """Renders a report PDF in the shared process pool, off the event loop."""
+    return await run_in_process_pool(generate_report_pdf, analysis_data)
@@ -0,0 +1,232 @@
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from xml.sax.saxutils import escape
+
+from services.process_pool import run_in_process_pool
+from services.report_export import load_raw_metrics
+
+SCORE_BINS = 10  # histogram buckets of width 10 over 0-100
+SUMMARY_TABLE_ROWS = 40  # rows per summary table flowable; each chunk is laid out on its own
+STORY_LOOKAHEAD = 32  # flowables kept materialized ahead of the layout engine
+FILE_CHUNK_SIZE = 64 * 1024
+
+SCORE_FIELDS = ("seo_score", "accessibility_score", "performance_score")
+
+class PortfolioStats:
+    """Running aggregates over the spooled reports, used for the portfolio overview."""
+    def __init__(self):
+        self.count = 0
+        self.totals = {field: 0.0 for field in SCORE_FIELDS}
+        self.scored = {field: 0 for field in SCORE_FIELDS}
+        self.histogram = [0] * SCORE_BINS
+
+    def add(self, record: Dict[str, Any]) -> None:
+        self.count += 1
+        for field in SCORE_FIELDS:
+            if record.get(field) is not None:
+                self.totals[field] += record[field]
+                self.scored[field] += 1
+        score = record.get("seo_score")
+        if score is not None:
+            self.histogram[min(SCORE_BINS - 1, max(0, int(score // (100 / SCORE_BINS))))] += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "averages": {
+                field: round(self.totals[field] / self.scored[field], 1) if self.scored[field] else None
+                for field in SCORE_FIELDS
+            },
+            "histogram": list(self.histogram),
+        }
+
+def portfolio_record(row: Any) -> Dict[str, Any]:
+    """The fields of one report row the portfolio needs, as a JSON-serializable dict."""
+    raw_metrics = load_raw_metrics(row.raw_metrics)
+    return {
+        "id": row.id,
+        "url": row.url,
+        "title": row.title,
+        "seo_score": row.seo_score,
+        "accessibility_score": row.accessibility_score,
+        "performance_score": row.performance_score,
+        "load_time": row.load_time,
+        "ai_insights": row.ai_insights,
+        "ai_recommendations": row.ai_recommendations,
+        "meta_description": raw_metrics.get("meta_description"),
+        "h1_count": raw_metrics.get("h1_count"),
+        "images_missing_alt": raw_metrics.get("images_missing_alt"),
+        "created_at": row.created_at.isoformat() if row.created_at else None,
+    }
+
+def iter_spooled_records(path: str) -> Iterator[Dict[str, Any]]:
+    with open(path, encoding="utf-8") as spool:
+        for line in spool:
+            yield json.loads(line)
+
+class LazyStory(list):
+    """
+    A flowable list that ReportLab's build loop consumes from the front and
+    refills from a generator, so only a small window of flowables exists at once.
+    The build loop checks len() before each flowable, which is where we refill.
+    """
+    def __init__(self, flowables: Iterable[Any], lookahead: int = STORY_LOOKAHEAD):
+        super().__init__()
+        self._source = iter(flowables)
+        self._lookahead = lookahead
+
+    def __len__(self) -> int:
+        while self._source is not None and super().__len__() < self._lookahead:
+            flowable = next(self._source, None)
+            if flowable is None:
+                self._source = None
+            else:
+                self.append(flowable)
+        return super().__len__()
+
+def _text(value: Any, default: str = "N/A") -> str:
+    return escape(str(value)) if value not in (None, "") else default
+
+def _score(value: Optional[float]) -> str:
+    return f"{value:.0f}" if value is not None else "-"
+
+def _portfolio_flowables(
+    title: str, summary: Dict[str, Any], records_path: str, include_appendices: bool
+) -> Iterator[Any]:
+    from reportlab.graphics.charts.barcharts import VerticalBarChart
+    from reportlab.graphics.shapes import Drawing
+    from reportlab.lib import colors
+    from reportlab.lib.enums import TA_CENTER
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+    from reportlab.platypus import PageBreak, Paragraph, Spacer, Table, TableStyle
+
+    styles = getSampleStyleSheet()
+    header = ParagraphStyle(name='ReportHeader', fontSize=24, leading=28, fontName='Helvetica-Bold',
+                            alignment=TA_CENTER, spaceAfter=8, textColor=colors.darkblue)
+    sub_header = ParagraphStyle(name='SubHeader', fontSize=10, fontName='Helvetica', alignment=TA_CENTER,
+                                spaceAfter=20, textColor=colors.darkgrey)
+    section = ParagraphStyle(name='SectionHeader', fontSize=16, leading=20, fontName='Helvetica-Bold',
+                             spaceBefore=16, spaceAfter=10)
+    body = ParagraphStyle(name='BodyTextLeft', parent=styles['Normal'], leading=14)
+    cell = ParagraphStyle(name='Cell', parent=styles['Normal'], fontSize=8, leading=10)
+    page_width = letter[0] - 72 * 2
+
+    yield Paragraph("SiteSage SEO Portfolio", header)
+    yield Paragraph(_text(title), sub_header)
+    yield Paragraph(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", sub_header)
+
+    averages = summary["averages"]
+    yield Paragraph("Overview", section)
+    yield Paragraph(
+        f"Pages analyzed: {summary['count']}<br/>"
+        f"Average SEO score: {_score(averages['seo_score'])}<br/>"
+        f"Average accessibility score: {_score(averages['accessibility_score'])}<br/>"
+        f"Average performance score: {_score(averages['performance_score'])}",
+        body,
+    )
+
+    yield Paragraph("SEO Score Distribution", section)
+    chart = VerticalBarChart()
+    chart.x, chart.y, chart.width, chart.height = 40, 30, page_width - 60, 160
+    chart.data = [summary["histogram"]]
+    chart.categoryAxis.categoryNames = [f"{i * 10}-{i * 10 + 9}" for i in range(SCORE_BINS)]
+    chart.categoryAxis.labels.fontSize = 7
+    chart.valueAxis.valueMin = 0
+    chart.bars[0].fillColor = colors.HexColor('#4A78B5')
+    drawing = Drawing(page_width, 200)
+    drawing.add(chart)
+    yield drawing
+
+    yield PageBreak()
+    yield Paragraph("Pages", section)
+    col_widths = [page_width * w for w in (0.08, 0.5, 0.1, 0.1, 0.1, 0.12)]
+    table_style = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#F2F2F2')),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 8),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#CCCCCC')),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ])
+    header_row = ["#", "URL", "SEO", "Access.", "Perf.", "Date"]
+    rows: List[List[Any]] = []
+    for number, record in enumerate(iter_spooled_records(records_path), start=1):
+        rows.append([
+            str(number),
+            Paragraph(_text(record["url"]), cell),
+            _score(record["seo_score"]),
+            _score(record["accessibility_score"]),
+            _score(record["performance_score"]),
+            (record["created_at"] or "")[:10],
+        ])
+        if len(rows) >= SUMMARY_TABLE_ROWS:
+            yield Table([header_row] + rows, colWidths=col_widths, style=table_style)
+            rows = []
+    if rows:
+        yield Table([header_row] + rows, colWidths=col_widths, style=table_style)
+
+    if not include_appendices:
+        return
+    for number, record in enumerate(iter_spooled_records(records_path), start=1):
+        yield PageBreak()
+        yield Paragraph(f"Appendix {number}: {_text(record['title'] or record['url'])}", section)
+        yield Paragraph(f"URL: {_text(record['url'])}", body)
+        load_time = record.get("load_time")
+        yield Paragraph(
+            f"SEO score: {_score(record['seo_score'])} &nbsp; "
+            f"Accessibility: {_score(record['accessibility_score'])} &nbsp; "
+            f"Performance: {_score(record['performance_score'])} &nbsp; "
+            f"Load time: {f'{load_time * 1000:.0f} ms' if load_time else 'N/A'}",
+            body,
+        )
+        yield Paragraph(
+            f"Meta description: {_text(record.get('meta_description'))}<br/>"
+            f"H1 count: {_text(record.get('h1_count'))} &nbsp; "
+            f"Images missing alt: {_text(record.get('images_missing_alt'))}",
+            body,
+        )
+        yield Spacer(1, 8)
+        yield Paragraph(_text(record.get("ai_insights"), "No AI summary available."), body)
+        for rec in (record.get("ai_recommendations") or [])[:5]:
+            yield Paragraph(f"• {_text(rec)}", body)
+
+def generate_portfolio_pdf(
+    records_path: str, output_path: str, title: str, summary: Dict[str, Any], include_appendices: bool = True
+) -> int:
+    """
+    Renders a portfolio PDF of the reports spooled to `records_path` (one JSON
+    record per line) into `output_path`. Flowables are generated while the
+    document is laid out, and the output goes to disk, so the summary table and
+    appendices never exist in memory all at once. Returns the page count.
+    """
+    from reportlab.lib.pagesizes import letter
+    from reportlab.platypus import SimpleDocTemplate
+
+    doc = SimpleDocTemplate(
+        output_path,
+        pagesize=letter,
+        rightMargin=72,
+        leftMargin=72,
+        topMargin=72,
+        bottomMargin=72,
+        pageCompression=1,
+    )
+    doc.build(LazyStory(_portfolio_flowables(title, summary, records_path, include_appendices)))
+    return doc.page
+
+async def render_portfolio_pdf(
+    records_path: str, output_path: str, title: str, summary: Dict[str, Any], include_appendices: bool = True
+) -> int:
+    """Renders a portfolio PDF in the shared process pool; only file paths cross the process boundary."""
+    return await run_in_process_pool(
+        generate_portfolio_pdf, records_path, output_path, title, summary, include_appendices
+    )
+
+def iter_file_chunks(path: str, chunk_size: int = FILE_CHUNK_SIZE) -> Iterator[bytes]:
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
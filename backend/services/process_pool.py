@@ -0,0 +1,37 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Optional
+
+from core.config import settings
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+def process_pool_size() -> int:
+    return settings.CPU_POOL_WORKERS or os.cpu_count() or 1
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """
+    Returns the process pool shared by CPU-bound work (PDF rendering, re-analysis),
+    creating it on first use. Workers are spawned rather than forked so they don't
+    inherit the event loop or open database connections.
+    """
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(
+            max_workers=process_pool_size(),
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _process_pool
+
+async def run_in_process_pool(func: Callable[..., Any], *args: Any) -> Any:
+    """Runs a picklable function in the shared process pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_process_pool(), func, *args)
+
+def shutdown_process_pool() -> None:
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+        _process_pool = None
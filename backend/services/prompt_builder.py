@@ -0,0 +1,64 @@
+import json
+from typing import Any, Dict, Optional, Tuple
+
+# Analyzer bookkeeping that says nothing about the page's SEO.
+EXCLUDED_METRICS = {"rule_set", "rule_timings_ms", "traversal_ms", "score_features", "link_targets", "asset_targets"}
+
+# Kept even when the token budget forces other metrics out.
+ESSENTIAL_METRICS = ("score", "rule_penalties", "title", "meta_description")
+
+MAX_STRING_LENGTH = 300
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token) used for budgeting."""
+    return len(text) // 4 + 1
+
+def _is_empty(value: Any) -> bool:
+    return value is None or value == 0 or value == "" or value == [] or value == {}
+
+def compact_metrics(metrics: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Drops bookkeeping fields, empty or zero values and rules that cost no
+    points, and shortens long strings. Zero counts carry no signal that the
+    penalties don't already.
+    """
+    compact: Dict[str, Any] = {}
+    for key, value in metrics.items():
+        if key in EXCLUDED_METRICS or (key != "score" and _is_empty(value)):
+            continue
+        if key == "rule_penalties":
+            value = {name: penalty for name, penalty in value.items() if penalty}
+        elif isinstance(value, str) and len(value) > MAX_STRING_LENGTH:
+            value = value[:MAX_STRING_LENGTH] + "..."
+        compact[key] = value
+    return compact
+
+def encode_metrics(metrics: Dict[str, Any]) -> str:
+    return json.dumps(metrics, separators=(",", ":"), default=str)
+
+class PromptBuilder:
+    """
+    Encodes metrics for the insight prompt within a fixed input-token budget.
+    `static_tokens` covers the system prompt and format instructions, which are
+    built once by the caller.
+    """
+    def __init__(self, max_input_tokens: int, static_tokens: int = 0):
+        self.max_input_tokens = max_input_tokens
+        self.static_tokens = static_tokens
+
+    def build(self, metrics: Dict[str, Any], budget: Optional[int] = None) -> Tuple[str, int]:
+        """
+        Returns the encoded metrics and the estimated input tokens of the whole
+        prompt. The largest non-essential metrics are dropped until it fits.
+        """
+        budget = (budget if budget is not None else self.max_input_tokens) - self.static_tokens
+        compact = compact_metrics(metrics)
+        encoded = encode_metrics(compact)
+        while estimate_tokens(encoded) > budget:
+            optional = [key for key in compact if key not in ESSENTIAL_METRICS]
+            if not optional:
+                break
+            largest = max(optional, key=lambda key: len(encode_metrics(compact[key])))
+            del compact[largest]
+            encoded = encode_metrics(compact)
+        return encoded, self.static_tokens + estimate_tokens(encoded)
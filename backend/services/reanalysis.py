@@ -0,0 +1,44 @@
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from services.page_weight import apply_page_weight
+from services.seo_analyzer import SEOAnalyzer
+from services.snapshot_store import get_snapshot_store
+
+logger = logging.getLogger(__name__)
+
+# (report_id, snapshot_hash, snapshot_encoding, response_time_ms, url, page_weight)
+SnapshotItem = Tuple[int, str, Optional[str], int, str, Optional[Dict[str, Any]]]
+
+def decode_snapshot(body: bytes, encoding: Optional[str]) -> str:
+    """
+    Decodes a snapshot with the charset of the original response, like
+    httpx's response.text; UTF-8 when none was recorded or it is unknown.
+    """
+    try:
+        return body.decode(encoding or "utf-8", errors="replace")
+    except LookupError:
+        return body.decode("utf-8", errors="replace")
+
+def reanalyze_snapshots(items: List[SnapshotItem], rule_set: str) -> List[Tuple[int, Optional[Dict[str, Any]]]]:
+    """
+    Re-runs the analyzer over stored snapshots. Runs inside a pool worker, so it
+    takes and returns only picklable values; a missing snapshot yields None.
+    The stored fetch time and page-weight audit are applied again, so scores
+    stay comparable with those of the original analysis.
+    """
+    store = get_snapshot_store()
+    analyzer = SEOAnalyzer(rule_set=rule_set)
+    results = []
+    for report_id, snapshot_hash, snapshot_encoding, response_time_ms, url, page_weight in items:
+        try:
+            html_content = decode_snapshot(store.get(snapshot_hash), snapshot_encoding)
+        except OSError as e:
+            logger.warning(f"Snapshot {snapshot_hash} for report {report_id} unreadable: {e}")
+            results.append((report_id, None))
+            continue
+        analysis_results = analyzer.analyze(html_content, response_time_ms, url)
+        if page_weight:
+            apply_page_weight(analysis_results, page_weight, response_time_ms)
+        results.append((report_id, analysis_results))
+    return results
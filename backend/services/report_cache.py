@@ -0,0 +1,68 @@
+import hashlib
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional
+
+from core.config import settings
+from services.report_events import report_event_broker
+from services.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+LISTENER_RETRY_SECONDS = 60
+
+@dataclass(frozen=True)
+class CachedReport:
+    body: bytes
+    etag: str
+
+# Serialized responses of settled reports, keyed by report id, filled from the
+# primary. Entries are dropped on status and bulk-rewrite events from any
+# process (via the LISTEN connection); the TTL bounds staleness while that
+# connection is down.
+report_response_cache = TTLCache(maxsize=settings.REPORT_CACHE_MAX_ENTRIES, ttl=settings.REPORT_CACHE_TTL_SECONDS)
+
+_listener_failed_at: Optional[float] = None
+
+def make_etag(body: bytes) -> str:
+    """Strong validator: identical bytes give identical tags in every process."""
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match uses weak comparison, so a W/ prefix on the client's tag is ignored."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+def cache_report(report_id: int, body: bytes) -> CachedReport:
+    cached = CachedReport(body=body, etag=make_etag(body))
+    report_response_cache.set(report_id, cached)
+    return cached
+
+def invalidate_reports(report_ids: Iterable[int]) -> None:
+    for report_id in report_ids:
+        report_response_cache.invalidate(report_id)
+
+def _on_report_event(event: Dict) -> None:
+    report_response_cache.invalidate(int(event["report_id"]))
+
+report_event_broker.add_event_listener(_on_report_event)
+
+async def ensure_invalidation_listener() -> None:
+    """
+    Starts the shared LISTEN connection so status changes made by other
+    processes evict cached reports. Failures are retried at most once a minute;
+    until then entries rely on their TTL.
+    """
+    global _listener_failed_at
+    if _listener_failed_at is not None and time.monotonic() - _listener_failed_at < LISTENER_RETRY_SECONDS:
+        return
+    try:
+        await report_event_broker.start()
+        _listener_failed_at = None
+    except Exception as e:
+        _listener_failed_at = time.monotonic()
+        logger.warning(f"Report cache invalidation listener unavailable: {e}")
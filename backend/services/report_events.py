@@ -0,0 +1,152 @@
+import asyncio
+import json
+import logging
+from contextlib import asynccontextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+import asyncpg
+from sqlalchemy import text
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+STATUS_CHANNEL = "seo_report_status"
+TERMINAL_STATUSES = ("completed", "failed")
+INSIGHTS_IN_PROGRESS = ("pending", "processing")
+
+# Delivered to a subscriber in place of events it may have missed (its queue
+# overflowed, or the LISTEN connection dropped); it should re-read statuses.
+RESYNC_EVENT = {"resync": True}
+
+def is_settled(event: Dict) -> bool:
+    """True once a report's metrics are terminal and its insights are not still being generated."""
+    return event.get("status") in TERMINAL_STATUSES and event.get("insights_status") not in INSIGHTS_IN_PROGRESS
+
+async def publish_report_status(db, report_id: int, status: str, insights_status: Optional[str] = None) -> None:
+    """
+    Queues a status-change notification on the session's transaction.
+    Postgres delivers it to listeners only when the transaction commits.
+    """
+    event = {"report_id": report_id, "status": status}
+    if insights_status is not None:
+        event["insights_status"] = insights_status
+    payload = json.dumps(event)
+    await db.execute(
+        text("SELECT pg_notify(:channel, :payload)"),
+        {"channel": STATUS_CHANNEL, "payload": payload}
+    )
+
+async def publish_reports_rewritten(db, report_ids: List[int]) -> None:
+    """
+    Queues one notification per report whose stored results were rewritten in
+    bulk (re-analysis, re-scoring), so every process evicts its cached copy.
+    These carry no status and aren't passed on to status subscribers.
+    """
+    await db.execute(
+        text("""
+            SELECT pg_notify(:channel, CAST(json_build_object('report_id', id, 'rewritten', true) AS text))
+            FROM unnest(CAST(:ids AS integer[])) AS id
+        """),
+        {"channel": STATUS_CHANNEL, "ids": list(report_ids)}
+    )
+
+class ReportEventBroker:
+    """
+    Fans out report status notifications from a single LISTEN connection
+    to any number of in-process subscribers.
+    """
+    def __init__(self, dsn: str, channel: str = STATUS_CHANNEL, queue_size: int = 100):
+        self.dsn = dsn
+        self.channel = channel
+        self.queue_size = queue_size
+        self._conn: Optional[asyncpg.Connection] = None
+        self._lock = asyncio.Lock()
+        self._subscribers: Dict[int, Set[asyncio.Queue]] = {}
+        self._event_listeners: List[Callable[[Dict], None]] = []
+
+    def add_event_listener(self, callback: Callable[[Dict], None]) -> None:
+        """Calls `callback` with every event received, for process-wide reactions such as cache eviction."""
+        self._event_listeners.append(callback)
+
+    async def start(self) -> None:
+        """Opens the shared LISTEN connection if it isn't already open."""
+        async with self._lock:
+            if self._conn is not None and not self._conn.is_closed():
+                return
+            self._conn = await asyncpg.connect(self.dsn)
+            self._conn.add_termination_listener(self._on_terminate)
+            await self._conn.add_listener(self.channel, self._on_notify)
+            logger.info(f"Listening for report status events on '{self.channel}'")
+
+    @property
+    def connected(self) -> bool:
+        return self._conn is not None and not self._conn.is_closed()
+
+    def _on_terminate(self, conn) -> None:
+        logger.warning("Report event LISTEN connection closed; it will reconnect on next subscribe.")
+        self._conn = None
+        for queue in {queue for queues in self._subscribers.values() for queue in queues}:
+            self._resync(queue)
+
+    @staticmethod
+    def _resync(queue: asyncio.Queue) -> None:
+        """Replaces whatever the queue holds with a single resync marker."""
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(RESYNC_EVENT)
+
+    def _on_notify(self, conn, pid, channel, payload) -> None:
+        try:
+            event = json.loads(payload)
+            report_id = int(event["report_id"])
+        except (ValueError, KeyError, TypeError):
+            logger.warning(f"Ignoring malformed report event payload: {payload!r}")
+            return
+
+        for callback in self._event_listeners:
+            try:
+                callback(event)
+            except Exception as e:
+                logger.error(f"Report event listener failed: {e}")
+
+        if "status" not in event:
+            return
+        for queue in self._subscribers.get(report_id, ()):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Slow consumer; it re-reads statuses instead of the dropped events.
+                self._resync(queue)
+
+    @asynccontextmanager
+    async def subscribe(self, report_ids: Iterable[int]):
+        """
+        Yields a queue that receives status events for the given report ids.
+        """
+        await self.start()
+        ids = set(report_ids)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        for report_id in ids:
+            self._subscribers.setdefault(report_id, set()).add(queue)
+        try:
+            yield queue
+        finally:
+            for report_id in ids:
+                queues = self._subscribers.get(report_id)
+                if queues is not None:
+                    queues.discard(queue)
+                    if not queues:
+                        del self._subscribers[report_id]
+
+    async def close(self) -> None:
+        async with self._lock:
+            if self._conn is not None and not self._conn.is_closed():
+                await self._conn.close()
+            self._conn = None
+
+def _listener_dsn(database_url: str) -> str:
+    """Strips the SQLAlchemy driver suffix so asyncpg can use the URL directly."""
+    return database_url.replace("postgresql+asyncpg://", "postgresql://", 1)
+
+report_event_broker = ReportEventBroker(_listener_dsn(settings.DATABASE_URL))
@@ -0,0 +1,121 @@
+import csv
+import io
+import json
+import zipfile
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+# Report columns written for every exported row, in output order.
+EXPORT_COLUMNS = [
+    "id",
+    "url",
+    "status",
+    "title",
+    "meta_description",
+    "seo_score",
+    "accessibility_score",
+    "performance_score",
+    "load_time",
+    "created_at",
+    "completed_at",
+]
+
+# raw_metrics keys flattened into columns when the caller doesn't choose any.
+DEFAULT_METRIC_FIELDS = [
+    "h1_count",
+    "h2_count",
+    "image_count",
+    "images_missing_alt",
+    "internal_links_count",
+    "external_links_count",
+    "load_time_score",
+]
+
+def load_raw_metrics(raw_metrics: Any) -> Dict[str, Any]:
+    """
+    Returns raw_metrics as a dict. Reports store it as a JSON-encoded string
+    inside the JSON column, so both forms are accepted.
+    """
+    if not raw_metrics:
+        return {}
+    if isinstance(raw_metrics, dict):
+        return raw_metrics
+    try:
+        value = json.loads(raw_metrics)
+    except (TypeError, json.JSONDecodeError):
+        return {}
+    return value if isinstance(value, dict) else {}
+
+def _json_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+def flatten_report_row(row: Any, metric_fields: Sequence[str]) -> Dict[str, Any]:
+    """
+    Builds one flat export record from a result row carrying EXPORT_COLUMNS and raw_metrics.
+    """
+    record = {column: _json_value(getattr(row, column)) for column in EXPORT_COLUMNS}
+    metrics = load_raw_metrics(row.raw_metrics)
+    for field in metric_fields:
+        value = metrics.get(field)
+        # Nested values would break the flat CSV layout; keep them as JSON text.
+        record[field] = json.dumps(value) if isinstance(value, (dict, list)) else value
+    return record
+
+def format_ndjson(records: Iterable[Dict[str, Any]]) -> str:
+    return "".join(json.dumps(record, default=str) + "\n" for record in records)
+
+def format_csv(records: Iterable[Dict[str, Any]], fieldnames: List[str], include_header: bool = False) -> str:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames, extrasaction="ignore")
+    if include_header:
+        writer.writeheader()
+    writer.writerows(records)
+    return buffer.getvalue()
+
+def parse_metric_fields(metrics: Optional[str]) -> List[str]:
+    """Parses a comma-separated metrics query value, falling back to the defaults."""
+    if not metrics:
+        return list(DEFAULT_METRIC_FIELDS)
+    fields = []
+    for field in metrics.split(","):
+        field = field.strip()
+        if field and field not in fields and field not in EXPORT_COLUMNS:
+            fields.append(field)
+    return fields
+
+class _ChunkSink(io.RawIOBase):
+    """Unseekable write target that hands back whatever was written since the last drain."""
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+class ZipStreamWriter:
+    """
+    Builds a ZIP archive incrementally, returning the bytes for each member as it is added.
+    Only the member being written is held in memory, never the whole archive.
+    """
+    def __init__(self, compression: int = zipfile.ZIP_STORED):
+        self._sink = _ChunkSink()
+        self._zip = zipfile.ZipFile(self._sink, mode="w", compression=compression)
+
+    def add(self, name: str, data: bytes) -> bytes:
+        self._zip.writestr(name, data)
+        return self._sink.drain()
+
+    def close(self) -> bytes:
+        """Writes the central directory and returns the final bytes of the archive."""
+        self._zip.close()
+        return self._sink.drain()
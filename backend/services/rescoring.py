@@ -0,0 +1,80 @@
+from typing import Any, Dict, Sequence, Tuple
+
+import numpy as np
+
+from services.score_model import FEATURE_NAMES, ScoreWeights, rule_penalty_matrix
+
+HISTOGRAM_BINS = np.linspace(0, 100, 11)
+
+def rescore_chunk(
+    rows: Sequence[Any], weights: ScoreWeights
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Dict[str, np.ndarray]]:
+    """
+    Scores a chunk of (id, seo_score, score_features) rows in one vectorized pass.
+
+    Returns (ids, old_scores, new_scores) as arrays, plus the per-rule penalty
+    arrays the new scores are made of (see rule_penalty_matrix).
+    """
+    width = len(FEATURE_NAMES)
+    ids = np.fromiter((row.id for row in rows), dtype=np.int64, count=len(rows))
+    old_scores = np.array([row.seo_score for row in rows], dtype=float)
+    # Vectors stored before a feature existed are shorter; pad them with NaN.
+    features = np.full((len(rows), width), np.nan)
+    for i, row in enumerate(rows):
+        vector = np.array(row.score_features[:width], dtype=float)
+        features[i, :len(vector)] = vector
+    penalties = rule_penalty_matrix(features, weights)
+    new_scores = np.maximum(0.0, 100.0 - sum(np.nan_to_num(values) for values in penalties.values()))
+    return ids, old_scores, new_scores, penalties
+
+def json_number(value: float) -> Any:
+    """Whole numbers as ints, as the analyzer stores them."""
+    return int(value) if float(value).is_integer() else float(value)
+
+def rule_penalties_at(penalties: Dict[str, np.ndarray], index: int) -> Dict[str, Any]:
+    """The rule_penalties entries of one row, leaving out rules whose feature wasn't computed."""
+    return {
+        rule: json_number(values[index])
+        for rule, values in penalties.items()
+        if not np.isnan(values[index])
+    }
+
+class ScoreDistributionDiff:
+    """Accumulates old vs. new score distributions across chunks."""
+    def __init__(self):
+        self.count = 0
+        self.changed = 0
+        self.old_sum = 0.0
+        self.new_sum = 0.0
+        self.delta_min = 0.0
+        self.delta_max = 0.0
+        self.old_histogram = np.zeros(len(HISTOGRAM_BINS) - 1, dtype=np.int64)
+        self.new_histogram = np.zeros(len(HISTOGRAM_BINS) - 1, dtype=np.int64)
+
+    def add(self, old_scores: np.ndarray, new_scores: np.ndarray) -> None:
+        if not len(new_scores):
+            return
+        old_scores = np.nan_to_num(old_scores)
+        delta = new_scores - old_scores
+        self.count += len(new_scores)
+        self.changed += int(np.count_nonzero(delta))
+        self.old_sum += float(old_scores.sum())
+        self.new_sum += float(new_scores.sum())
+        self.delta_min = min(self.delta_min, float(delta.min()))
+        self.delta_max = max(self.delta_max, float(delta.max()))
+        self.old_histogram += np.histogram(old_scores, bins=HISTOGRAM_BINS)[0]
+        self.new_histogram += np.histogram(new_scores, bins=HISTOGRAM_BINS)[0]
+
+    def summary(self) -> Dict[str, Any]:
+        count = self.count or 1
+        return {
+            "reports": self.count,
+            "changed": self.changed,
+            "mean_old_score": round(self.old_sum / count, 2),
+            "mean_new_score": round(self.new_sum / count, 2),
+            "delta_min": self.delta_min,
+            "delta_max": self.delta_max,
+            "histogram_bins": HISTOGRAM_BINS.tolist(),
+            "old_histogram": self.old_histogram.tolist(),
+            "new_histogram": self.new_histogram.tolist(),
+        }
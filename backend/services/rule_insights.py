@@ -0,0 +1,82 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+# rule name -> (finding for the summary, recommendation); both are formatted with the metrics.
+PENALTY_TEMPLATES: Dict[str, Tuple[str, str]] = {
+    "title": (
+        "The title tag is missing or outside the recommended length (current: \"{title}\").",
+        "Write a unique, descriptive title tag between 10 and 60 characters that includes the page's main keyword.",
+    ),
+    "meta_description": (
+        "The page has no meta description.",
+        "Add a meta description of about 150-160 characters summarizing the page to improve search result click-through.",
+    ),
+    "h1": (
+        "The heading structure needs work: the page has {h1_count} H1 tags where exactly one is expected.",
+        "Use exactly one H1 that states the page's main topic, and structure sub-sections with H2/H3 headings.",
+    ),
+    "image_alt": (
+        "{images_missing_alt} of {image_count} images have no alt text.",
+        "Add concise, descriptive alt text to every meaningful image; use an empty alt only for decorative images.",
+    ),
+    "load_time": (
+        "The page is slow to respond.",
+        "Reduce server response time with caching, a CDN and fewer blocking resources; aim for under 2 seconds.",
+    ),
+    "page_weight": (
+        "The page is heavy at about {page_weight_mb} MB in total.",
+        "Compress and resize images, minify scripts and stylesheets, and lazy-load assets below the fold.",
+    ),
+}
+
+class _Metrics(dict):
+    """Template values; metrics a rule set didn't compute render as "?"."""
+    def __missing__(self, key: str) -> str:
+        return "?"
+
+def _format(template: str, metrics: Dict[str, Any]) -> str:
+    values = _Metrics(metrics)
+    page_weight_bytes = metrics.get("page_weight_bytes")
+    if page_weight_bytes:
+        values["page_weight_mb"] = round(page_weight_bytes / 1_000_000, 1)
+    return template.format_map(values)
+
+def _score_band(score: Optional[float]) -> str:
+    if score is None:
+        return "could not be scored"
+    if score >= 90:
+        return "is in excellent shape"
+    if score >= 70:
+        return "is in good shape with a few issues"
+    if score >= 50:
+        return "has several issues holding it back"
+    return "has serious issues that need attention"
+
+def generate_rule_insights(metrics: Dict[str, Any], link_check: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Deterministic insights built from the analyzer's rule penalties, largest
+    penalty first. Used when the LLM is unavailable or misses its latency budget.
+    """
+    score = metrics.get("score")
+    penalties = metrics.get("rule_penalties") or {}
+    failing = sorted(
+        (name for name, penalty in penalties.items() if penalty and name in PENALTY_TEMPLATES),
+        key=lambda name: -penalties[name],
+    )
+
+    findings = [_format(PENALTY_TEMPLATES[name][0], metrics) for name in failing]
+    recommendations: List[str] = [PENALTY_TEMPLATES[name][1] for name in failing]
+
+    if link_check and link_check.get("broken_count"):
+        findings.append(f"{link_check['broken_count']} links on the page are broken.")
+        recommendations.append("Fix or remove the broken links reported in the link check.")
+
+    summary = f"With an SEO score of {score}, this page {_score_band(score)}."
+    if findings:
+        summary += " Key findings: " + " ".join(findings)
+    else:
+        summary += " No penalized issues were found by the automated checks."
+
+    if not recommendations:
+        recommendations = ["Keep titles, descriptions and headings up to date as the content changes."]
+
+    return {"summary": summary, "recommendations": recommendations[:5], "source": "rules"}
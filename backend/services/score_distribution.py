@@ -0,0 +1,108 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+from sqlalchemy import func, literal, literal_column, select, union_all
+
+from models.seo_report import SEOReport
+from services.score_model import FEATURE_NAMES
+
+PERCENTILES = (0.5, 0.9, 0.99)
+
+@dataclass(frozen=True)
+class DistributionMetric:
+    """A numeric report column with fixed histogram bins over [low, high)."""
+    name: str
+    low: float
+    high: float
+    bins: int
+
+def _feature(name: str):
+    # Postgres arrays are 1-based.
+    return SEOReport.score_features[FEATURE_NAMES.index(name) + 1]
+
+DISTRIBUTION_METRICS: List[DistributionMetric] = [
+    # The last bin holds perfect scores, since the upper bound is exclusive.
+    DistributionMetric("seo_score", 0, 110, 11),
+    DistributionMetric("load_time", 0, 10, 20),
+    DistributionMetric("title_missing", 0, 2, 2),
+    DistributionMetric("title_length", 0, 120, 12),
+    DistributionMetric("meta_description_missing", 0, 2, 2),
+    DistributionMetric("h1_count", 0, 10, 10),
+    DistributionMetric("images_missing_alt", 0, 50, 10),
+    DistributionMetric("response_time_ms", 0, 10000, 20),
+    DistributionMetric("page_weight_bytes", 0, 10_000_000, 20),
+    DistributionMetric("largest_asset_bytes", 0, 5_000_000, 20),
+]
+
+def metric_columns() -> Dict[str, Any]:
+    columns = {"seo_score": SEOReport.seo_score, "load_time": SEOReport.load_time}
+    for name in FEATURE_NAMES:
+        columns[name] = _feature(name)
+    return columns
+
+def build_distribution_queries(filtered_query):
+    """
+    Builds the percentile and histogram statements over a filtered report query.
+    Both aggregate in Postgres, so no report rows are sent to Python.
+
+    Returns:
+        A tuple of (percentile_query, histogram_query).
+    """
+    columns = metric_columns()
+    base = filtered_query.with_only_columns(
+        *[columns[metric.name].label(metric.name) for metric in DISTRIBUTION_METRICS]
+    ).cte("filtered_reports")
+
+    # One ordered-set aggregate per metric computes all percentiles from a single sort.
+    fractions = literal_column(f"ARRAY[{', '.join(str(p) for p in PERCENTILES)}]::float8[]")
+    aggregates = [func.count().label("count")]
+    for metric in DISTRIBUTION_METRICS:
+        column = base.c[metric.name]
+        aggregates.append(
+            func.percentile_cont(fractions).within_group(column).label(f"{metric.name}_percentiles")
+        )
+        aggregates.append(func.min(column).label(f"{metric.name}_min"))
+        aggregates.append(func.max(column).label(f"{metric.name}_max"))
+    percentile_query = select(*aggregates).select_from(base)
+
+    bucket_selects = []
+    for metric in DISTRIBUTION_METRICS:
+        column = base.c[metric.name]
+        bucket = func.width_bucket(column, float(metric.low), float(metric.high), metric.bins)
+        bucket_selects.append(
+            select(
+                literal(metric.name).label("metric"),
+                bucket.label("bucket"),
+                func.count().label("count")
+            ).select_from(base).where(column.isnot(None)).group_by(literal_column("bucket"))
+        )
+    histogram_query = union_all(*bucket_selects)
+
+    return percentile_query, histogram_query
+
+def shape_distribution(percentile_row: Any, histogram_rows: List[Any]) -> Dict[str, Any]:
+    """Turns the raw aggregate rows into the response payload."""
+    counts = {metric.name: [0] * (metric.bins + 2) for metric in DISTRIBUTION_METRICS}
+    for row in histogram_rows:
+        counts[row.metric][row.bucket] = row.count
+
+    metrics = {}
+    row = percentile_row._mapping
+    for metric in DISTRIBUTION_METRICS:
+        width = (metric.high - metric.low) / metric.bins
+        bucket_counts = counts[metric.name]
+        percentiles = row[f"{metric.name}_percentiles"] or [None] * len(PERCENTILES)
+        metrics[metric.name] = {
+            **{f"p{int(p * 100)}": value for p, value in zip(PERCENTILES, percentiles)},
+            "min": row[f"{metric.name}_min"],
+            "max": row[f"{metric.name}_max"],
+            "histogram": {
+                "bin_edges": [metric.low + i * width for i in range(metric.bins + 1)],
+                "counts": bucket_counts[1:-1],
+                # width_bucket puts values below the range in 0 and above it in bins + 1.
+                "underflow": bucket_counts[0],
+                "overflow": bucket_counts[-1],
+            },
+        }
+
+    return {"count": row["count"], "metrics": metrics}
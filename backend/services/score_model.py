@@ -0,0 +1,142 @@
+from dataclasses import dataclass, fields
+from typing import Any, Dict, List, Optional
+
+# Order of the numeric feature vector stored on each report. Append new features
+# at the end so previously stored vectors stay aligned.
+FEATURE_NAMES = (
+    "title_missing",
+    "title_length",
+    "meta_description_missing",
+    "h1_count",
+    "images_missing_alt",
+    "response_time_ms",
+    "page_weight_bytes",
+    "largest_asset_bytes",
+)
+
+@dataclass(frozen=True)
+class ScoreWeights:
+    """Penalty weights and thresholds shared by the rule engine and bulk re-scoring."""
+    title_missing: float = 20
+    title_length: float = 10
+    title_min_length: float = 10
+    title_max_length: float = 60
+    meta_description_missing: float = 20
+    h1_missing: float = 20
+    h1_multiple: float = 10
+    missing_alt_each: float = 5
+    missing_alt_cap: float = 20
+    slow_load: float = 15
+    slow_load_ms: float = 2000
+    heavy_page: float = 10
+    heavy_page_bytes: float = 3_000_000
+    heavy_asset: float = 5
+    heavy_asset_bytes: float = 1_000_000
+
+DEFAULT_SCORE_WEIGHTS = ScoreWeights()
+
+def page_weight_penalty(
+    page_weight_bytes: Optional[float],
+    largest_asset_bytes: Optional[float],
+    weights: ScoreWeights = DEFAULT_SCORE_WEIGHTS,
+) -> float:
+    """Penalty for heavy pages and heavy individual assets; unknown sizes add nothing."""
+    penalty = 0
+    if page_weight_bytes is not None and page_weight_bytes > weights.heavy_page_bytes:
+        penalty += weights.heavy_page
+    if largest_asset_bytes is not None and largest_asset_bytes > weights.heavy_asset_bytes:
+        penalty += weights.heavy_asset
+    return penalty
+
+def weights_with_overrides(overrides: Optional[Dict[str, float]]) -> ScoreWeights:
+    """Returns the default weights with the given fields replaced, rejecting unknown names."""
+    if not overrides:
+        return DEFAULT_SCORE_WEIGHTS
+    known = {f.name for f in fields(ScoreWeights)}
+    unknown = set(overrides) - known
+    if unknown:
+        raise ValueError(f"Unknown score weights: {', '.join(sorted(unknown))}")
+    values = {name: getattr(DEFAULT_SCORE_WEIGHTS, name) for name in known}
+    values.update(overrides)
+    return ScoreWeights(**values)
+
+def extract_score_features(metrics: Dict[str, Any], response_time_ms: int) -> List[Optional[float]]:
+    """
+    Builds the feature vector from analyzer metrics. Features a rule set didn't
+    compute are None (NaN once loaded into an array) and add no penalty when re-scored.
+    """
+    def number(key: str) -> Optional[float]:
+        value = metrics.get(key)
+        return float(value) if isinstance(value, (int, float)) else None
+
+    title = metrics.get("title")
+    if title is None:
+        title_missing, title_length = None, None
+    elif title == "Missing":
+        title_missing, title_length = 1.0, 0.0
+    else:
+        title_missing, title_length = 0.0, float(len(title))
+
+    meta_description = metrics.get("meta_description")
+    if meta_description is None:
+        meta_missing = None
+    else:
+        meta_missing = 1.0 if meta_description == "Missing" else 0.0
+
+    return [
+        title_missing,
+        title_length,
+        meta_missing,
+        number("h1_count"),
+        number("images_missing_alt"),
+        float(response_time_ms),
+        number("page_weight_bytes"),
+        number("largest_asset_bytes"),
+    ]
+
+def rule_penalty_matrix(features, weights: ScoreWeights = DEFAULT_SCORE_WEIGHTS):
+    """
+    Per-rule penalties for many reports at once, keyed like the analyzer's
+    rule_penalties. `features` is an (n, len(FEATURE_NAMES)) array; a rule's
+    entry is NaN for reports whose feature wasn't computed.
+    """
+    import numpy as np
+
+    features = np.asarray(features, dtype=float)
+    (
+        title_missing, title_length, meta_missing, h1_count, missing_alt, response_time_ms,
+        page_weight_bytes, largest_asset_bytes,
+    ) = (features[:, i] for i in range(len(FEATURE_NAMES)))
+
+    def unless_missing(penalty, feature):
+        return np.where(np.isnan(feature), np.nan, penalty)
+
+    title_bad_length = (title_length > weights.title_max_length) | (title_length < weights.title_min_length)
+    return {
+        "title": unless_missing(np.where(
+            title_missing == 1, weights.title_missing, np.where(title_bad_length, weights.title_length, 0.0)
+        ), title_missing),
+        "meta_description": unless_missing(np.where(meta_missing == 1, weights.meta_description_missing, 0.0), meta_missing),
+        "h1": unless_missing(
+            np.where(h1_count == 0, weights.h1_missing, np.where(h1_count > 1, weights.h1_multiple, 0.0)), h1_count
+        ),
+        "image_alt": np.minimum(missing_alt * weights.missing_alt_each, weights.missing_alt_cap),
+        "load_time": unless_missing(np.where(response_time_ms > weights.slow_load_ms, weights.slow_load, 0.0), response_time_ms),
+        # An unknown largest asset adds nothing, as in page_weight_penalty.
+        "page_weight": unless_missing(
+            np.where(page_weight_bytes > weights.heavy_page_bytes, weights.heavy_page, 0.0)
+            + np.where(largest_asset_bytes > weights.heavy_asset_bytes, weights.heavy_asset, 0.0),
+            page_weight_bytes,
+        ),
+    }
+
+def score_feature_matrix(features, weights: ScoreWeights = DEFAULT_SCORE_WEIGHTS):
+    """
+    Scores many reports at once. `features` is an (n, len(FEATURE_NAMES)) array;
+    returns an array of n scores computed with the same rules as SEOAnalyzer.
+    """
+    import numpy as np
+
+    # Rules whose features weren't computed add no penalty.
+    penalty = sum(np.nan_to_num(values) for values in rule_penalty_matrix(features, weights).values())
+    return np.maximum(0.0, 100.0 - penalty)
@@ -1,11 +1,42 @@
-from typing import Dict, Any
-from bs4 import BeautifulSoup
+import time
+from typing import Dict, Any, List
+
+from services.score_model import extract_score_features
+from services.seo_rules import DEFAULT_RULE_SET, RuleContext, SEORule, get_rules
 
 class SEOAnalyzer:
     """
     A service class to analyze HTML content for SEO quality and calculate a score.
+    Scoring is driven by the rules registered in services.seo_rules.
     """
 
+    def __init__(self, rule_set: str = DEFAULT_RULE_SET):
+        self.rule_set = rule_set
+        self.rules = get_rules(rule_set)
+
+    def _collect_elements(self, html_content: str, rules: List[SEORule]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Parses only the tags the rules need and reduces each to the requested
+        attributes, in a single pass over the document.
+        """
+        from bs4 import BeautifulSoup, SoupStrainer
+
+        tags = sorted({tag for rule in rules for tag in rule.tags})
+        if not tags:
+            return {}
+
+        attributes = {attr for rule in rules for attr in rule.attributes}
+        text_tags = {tag for rule in rules if rule.needs_text for tag in rule.tags}
+
+        soup = BeautifulSoup(html_content, 'lxml', parse_only=SoupStrainer(tags))
+        elements: Dict[str, List[Dict[str, Any]]] = {tag: [] for tag in tags}
+        for element in soup.find_all(tags):
+            record = {attr: element.get(attr) for attr in attributes}
+            if element.name in text_tags:
+                record["text"] = element.string
+            elements[element.name].append(record)
+        return elements
+
     def analyze(self, html_content: str, response_time_ms: int, url: str) -> Dict[str, Any]:
         """
         Analyzes the HTML content and response time to generate an SEO report.
@@ -16,96 +47,41 @@ class SEOAnalyzer:
             url: The URL of the page being analyzed, used for internal link checking.
 
         Returns:
-            A dictionary containing the SEO score and detailed metrics.
+            A dictionary containing the SEO score, detailed metrics, the
+            penalty and execution time of every rule that ran, and the numeric
+            feature vector used for bulk re-scoring.
         """
         if not html_content:
-            return {
-                "score": 0,
-                "title": "N/A",
-                "meta_description": "N/A",
-                "h1_count": 0,
-                "h2_count": 0,
-                "image_count": 0,
-                "images_missing_alt": 0,
-                "internal_links_count": 0,
-                "external_links_count": 0,
-                "load_time_score": "fail"
-            }
-
-        soup = BeautifulSoup(html_content, 'lxml')
-        score = 100
-        
-        title_tag = soup.find('title')
-        title_text = ""
-        if not title_tag or not title_tag.string:
-            score -= 20
-            title_text = "Missing"
-        else:
-            title_text = title_tag.string.strip()
-            if len(title_text) > 60 or len(title_text) < 10:
-                score -= 10
-
-        meta_tag = soup.find('meta', attrs={'name': 'description'})
-        meta_description_text = ""
-        if not meta_tag or not meta_tag.get('content'):
-            score -= 20
-            meta_description_text = "Missing"
-        else:
-            meta_description_text = meta_tag.get('content', '').strip()
+            results: Dict[str, Any] = {"score": 0}
+            for rule in self.rules:
+                results.update(rule.defaults)
+            results.update({"rule_set": self.rule_set, "rule_penalties": {}, "rule_timings_ms": {}})
+            return results
 
-        h1_tags = soup.find_all('h1')
-        h1_count = len(h1_tags)
-        if h1_count == 0:
-            score -= 20
-        elif h1_count > 1:
-            score -= 10
-        
-        h2_tags = soup.find_all('h2')
-        h2_count = len(h2_tags)
+        traversal_start = time.perf_counter()
+        elements = self._collect_elements(html_content, self.rules)
+        traversal_ms = (time.perf_counter() - traversal_start) * 1000
 
-        images = soup.find_all('img')
-        image_count = len(images)
-        missing_alt_count = 0
-        alt_penalty = 0
-        for img in images:
-            alt = img.get('alt', '').strip()
-            if not alt:
-                missing_alt_count += 1
-                if alt_penalty < 20:
-                    score -= 5
-                    alt_penalty += 5
-        
-        internal_links_count = 0
-        external_links_count = 0
-        parsed_url = urlparse(url)
-        base_url = f"{parsed_url.scheme}://{parsed_url.netloc}"
+        context = RuleContext(elements=elements, response_time_ms=response_time_ms, url=url)
+        metrics: Dict[str, Any] = {}
+        rule_penalties: Dict[str, int] = {}
+        rule_timings_ms: Dict[str, float] = {}
 
-        for a_tag in soup.find_all('a', href=True):
-            href = a_tag['href']
-            if href.startswith('/') or href.startswith(base_url):
-                internal_links_count += 1
-            elif href.startswith('http'):
-                external_links_count += 1
+        for rule in self.rules:
+            rule_start = time.perf_counter()
+            penalty, rule_metrics = rule.evaluate(context)
+            rule_timings_ms[rule.name] = round((time.perf_counter() - rule_start) * 1000, 3)
+            rule_penalties[rule.name] = penalty
+            metrics.update(rule_metrics)
 
-
-        load_time_status = "pass"
-        if response_time_ms > 2000:
-            score -= 15
-            load_time_status = "fail"
-
-        final_score = max(0, score)
+        final_score = max(0, 100 - sum(rule_penalties.values()))
 
         return {
             "score": final_score,
-            "title": title_text,
-            "meta_description": meta_description_text,
-            "h1_count": h1_count,
-            "h2_count": h2_count,
-            "image_count": image_count,
-            "images_missing_alt": missing_alt_count,
-            "internal_links_count": internal_links_count,
-            "external_links_count": external_links_count,
-            "load_time_score": load_time_status
+            **metrics,
+            "rule_set": self.rule_set,
+            "rule_penalties": rule_penalties,
+            "rule_timings_ms": rule_timings_ms,
+            "traversal_ms": round(traversal_ms, 3),
+            "score_features": extract_score_features(metrics, response_time_ms),
         }
-
-from urllib.parse import urlparse
\ No newline at end of file
@@ -0,0 +1,201 @@
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urldefrag, urljoin, urlparse
+
+from services.score_model import DEFAULT_SCORE_WEIGHTS as WEIGHTS
+
+@dataclass
+class RuleContext:
+    """
+    Everything a rule can look at. `elements` maps a tag name to the elements
+    collected for it, each reduced to the attributes the rules asked for
+    (plus "text" when a rule needs the tag's string).
+    """
+    elements: Dict[str, List[Dict[str, Any]]]
+    response_time_ms: int
+    url: str
+
+RuleResult = Tuple[int, Dict[str, Any]]
+
+@dataclass(frozen=True)
+class SEORule:
+    """
+    A single scoring check. A rule declares the tags and attributes it reads so
+    the analyzer can collect the needs of every enabled rule in one traversal.
+    """
+    name: str
+    evaluate: Callable[[RuleContext], RuleResult]
+    tags: Tuple[str, ...] = ()
+    attributes: Tuple[str, ...] = ()
+    needs_text: bool = False
+    expensive: bool = False
+    defaults: Dict[str, Any] = field(default_factory=dict)
+
+RULE_REGISTRY: Dict[str, SEORule] = {}
+
+def register_rule(
+    name: str,
+    tags: Tuple[str, ...] = (),
+    attributes: Tuple[str, ...] = (),
+    needs_text: bool = False,
+    expensive: bool = False,
+    defaults: Optional[Dict[str, Any]] = None,
+):
+    """
+    Decorator that adds a rule function to the registry.
+
+    The function receives a RuleContext and returns (penalty, metrics).
+    `defaults` are the metrics reported when the page has no content at all.
+    """
+    def decorator(func: Callable[[RuleContext], RuleResult]):
+        RULE_REGISTRY[name] = SEORule(
+            name=name,
+            evaluate=func,
+            tags=tags,
+            attributes=attributes,
+            needs_text=needs_text,
+            expensive=expensive,
+            defaults=defaults or {},
+        )
+        return func
+    return decorator
+
+@register_rule("title", tags=("title",), needs_text=True, defaults={"title": "N/A"})
+def _title_rule(ctx: RuleContext) -> RuleResult:
+    titles = ctx.elements.get("title", [])
+    text = titles[0].get("text") if titles else None
+    if not text:
+        return WEIGHTS.title_missing, {"title": "Missing"}
+    text = text.strip()
+    bad_length = len(text) > WEIGHTS.title_max_length or len(text) < WEIGHTS.title_min_length
+    penalty = WEIGHTS.title_length if bad_length else 0
+    return penalty, {"title": text}
+
+@register_rule("meta_description", tags=("meta",), attributes=("name", "content"), defaults={"meta_description": "N/A"})
+def _meta_description_rule(ctx: RuleContext) -> RuleResult:
+    meta = next((m for m in ctx.elements.get("meta", []) if m.get("name") == "description"), None)
+    if not meta or not meta.get("content"):
+        return WEIGHTS.meta_description_missing, {"meta_description": "Missing"}
+    return 0, {"meta_description": meta["content"].strip()}
+
+@register_rule("h1", tags=("h1",), defaults={"h1_count": 0})
+def _h1_rule(ctx: RuleContext) -> RuleResult:
+    h1_count = len(ctx.elements.get("h1", []))
+    if h1_count == 0:
+        penalty = WEIGHTS.h1_missing
+    elif h1_count > 1:
+        penalty = WEIGHTS.h1_multiple
+    else:
+        penalty = 0
+    return penalty, {"h1_count": h1_count}
+
+@register_rule("h2", tags=("h2",), defaults={"h2_count": 0})
+def _h2_rule(ctx: RuleContext) -> RuleResult:
+    return 0, {"h2_count": len(ctx.elements.get("h2", []))}
+
+@register_rule(
+    "image_alt",
+    tags=("img",),
+    attributes=("alt",),
+    expensive=True,
+    defaults={"image_count": 0, "images_missing_alt": 0},
+)
+def _image_alt_rule(ctx: RuleContext) -> RuleResult:
+    images = ctx.elements.get("img", [])
+    missing_alt_count = sum(1 for img in images if not (img.get("alt") or "").strip())
+    penalty = min(missing_alt_count * WEIGHTS.missing_alt_each, WEIGHTS.missing_alt_cap)
+    return penalty, {"image_count": len(images), "images_missing_alt": missing_alt_count}
+
+@register_rule(
+    "links",
+    tags=("a",),
+    attributes=("href", "rel"),
+    expensive=True,
+    defaults={"internal_links_count": 0, "external_links_count": 0, "link_targets": []},
+)
+def _links_rule(ctx: RuleContext) -> RuleResult:
+    parsed_url = urlparse(ctx.url)
+    base_url = f"{parsed_url.scheme}://{parsed_url.netloc}"
+
+    internal_links_count = 0
+    external_links_count = 0
+    link_targets = {}
+    for a_tag in ctx.elements.get("a", []):
+        href = a_tag.get("href")
+        if href is None:
+            continue
+        if href.startswith('/') or href.startswith(base_url):
+            internal_links_count += 1
+        elif href.startswith('http'):
+            external_links_count += 1
+
+        # Resolved, fragment-free http(s) targets for the link-based pipeline stages.
+        try:
+            target = urldefrag(urljoin(ctx.url, href.strip()))[0]
+            target_parts = urlparse(target)
+        except ValueError:
+            # Unparseable href, e.g. "http://[::1"; it isn't a target.
+            continue
+        if target_parts.scheme not in ("http", "https") or target in link_targets:
+            continue
+        link_targets[target] = {
+            "url": target,
+            "internal": target_parts.netloc == parsed_url.netloc,
+            "nofollow": "nofollow" in (a_tag.get("rel") or []),
+        }
+
+    return 0, {
+        "internal_links_count": internal_links_count,
+        "external_links_count": external_links_count,
+        "link_targets": list(link_targets.values()),
+    }
+
+ASSET_SOURCES = {"img": "src", "script": "src", "link": "href"}
+
+@register_rule(
+    "assets",
+    tags=("img", "script", "link"),
+    attributes=("src", "href", "rel"),
+    expensive=True,
+    defaults={"asset_targets": []},
+)
+def _assets_rule(ctx: RuleContext) -> RuleResult:
+    """Collects image, script and stylesheet URLs for the page-weight stage."""
+    asset_targets = {}
+    for tag, attribute in ASSET_SOURCES.items():
+        for element in ctx.elements.get(tag, []):
+            if tag == "link" and "stylesheet" not in (element.get("rel") or []):
+                continue
+            source = element.get(attribute)
+            if not source or source.strip().startswith("data:"):
+                continue
+            try:
+                target = urldefrag(urljoin(ctx.url, source.strip()))[0]
+                scheme = urlparse(target).scheme
+            except ValueError:
+                continue
+            if scheme in ("http", "https") and target not in asset_targets:
+                asset_targets[target] = {"url": target, "type": "stylesheet" if tag == "link" else tag}
+    return 0, {"asset_targets": list(asset_targets.values())}
+
+@register_rule("load_time", defaults={"load_time_score": "fail"})
+def _load_time_rule(ctx: RuleContext) -> RuleResult:
+    if ctx.response_time_ms > WEIGHTS.slow_load_ms:
+        return WEIGHTS.slow_load, {"load_time_score": "fail"}
+    return 0, {"load_time_score": "pass"}
+
+DEFAULT_RULE_SET = "full"
+
+def _rule_sets() -> Dict[str, List[str]]:
+    return {
+        "full": list(RULE_REGISTRY),
+        "quick": [name for name, rule in RULE_REGISTRY.items() if not rule.expensive],
+    }
+
+RULE_SETS: Dict[str, List[str]] = _rule_sets()
+
+def get_rules(rule_set: str = DEFAULT_RULE_SET) -> List[SEORule]:
+    """Returns the rules of a named rule set, raising ValueError for unknown names."""
+    if rule_set not in RULE_SETS:
+        raise ValueError(f"Unknown rule set '{rule_set}'. Available: {', '.join(RULE_SETS)}")
+    return [RULE_REGISTRY[name] for name in RULE_SETS[rule_set]]
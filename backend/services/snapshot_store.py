@@ -0,0 +1,76 @@
+import gzip
+import hashlib
+import os
+import tempfile
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from core.config import settings
+
+class SnapshotStore(ABC):
+    """
+    Content-addressed store for fetched page bodies.
+
+    Keys are the SHA-256 of the response body as fetched (before decoding), so
+    identical pages are kept once.
+    Subclasses only need to implement the byte-level read/write of a key, which
+    lets an object store replace the local filesystem implementation.
+    """
+    def put(self, data: bytes) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        if not self.exists(digest):
+            self._write(digest, gzip.compress(data, compresslevel=settings.SNAPSHOT_COMPRESSION_LEVEL))
+        return digest
+
+    def get(self, digest: str) -> bytes:
+        return gzip.decompress(self._read(digest))
+
+    @abstractmethod
+    def exists(self, digest: str) -> bool:
+        ...
+
+    @abstractmethod
+    def _write(self, digest: str, compressed: bytes) -> None:
+        ...
+
+    @abstractmethod
+    def _read(self, digest: str) -> bytes:
+        ...
+
+class LocalSnapshotStore(SnapshotStore):
+    """Stores snapshots as <root>/<aa>/<bb>/<sha256>.gz files."""
+    def __init__(self, root: str):
+        self.root = root
+
+    def _path(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], digest[2:4], f"{digest}.gz")
+
+    def exists(self, digest: str) -> bool:
+        return os.path.exists(self._path(digest))
+
+    def _write(self, digest: str, compressed: bytes) -> None:
+        path = self._path(digest)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        # Write to a temp file and rename so readers never see a partial snapshot.
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                tmp_file.write(compressed)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _read(self, digest: str) -> bytes:
+        with open(self._path(digest), "rb") as snapshot_file:
+            return snapshot_file.read()
+
+_snapshot_store: Optional[SnapshotStore] = None
+
+def get_snapshot_store() -> SnapshotStore:
+    global _snapshot_store
+    if _snapshot_store is None:
+        _snapshot_store = LocalSnapshotStore(settings.SNAPSHOT_STORE_DIR)
+    return _snapshot_store
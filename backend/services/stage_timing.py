@@ -0,0 +1,78 @@
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+class StageTimings:
+    """
+    Wall-clock durations of the stages of one analysis job, stored on the
+    report as {"<stage>_ms": float, ..., "total_ms": float}.
+    """
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages: Dict[str, float] = {}
+
+    def record(self, stage: str, seconds: float) -> None:
+        key = f"{stage}_ms"
+        self.stages[key] = round(self.stages.get(key, 0.0) + seconds * 1000, 1)
+
+    @contextmanager
+    def stage(self, stage: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start)
+
+    def to_dict(self) -> Dict[str, float]:
+        return {**self.stages, "total_ms": round((time.perf_counter() - self.started) * 1000, 1)}
+
+class SamplingProfiler:
+    """
+    Samples the stack of one thread (by default the caller's, i.e. the event
+    loop) from a background thread and counts collapsed stacks. Jobs share the
+    event loop, so samples also include whatever else the loop ran meanwhile;
+    the stacks that show up most still point at where the time went.
+    """
+    def __init__(self, interval_seconds: float = 0.005, max_depth: int = 40, thread_id: Optional[int] = None):
+        self.interval_seconds = interval_seconds
+        self.max_depth = max_depth
+        self.thread_id = thread_id or threading.get_ident()
+        self.samples = 0
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _collapse(self, frame) -> str:
+        names = []
+        while frame is not None and len(names) < self.max_depth:
+            code = frame.f_code
+            names.append(f"{code.co_filename.rsplit('/', 1)[-1]}:{code.co_name}")
+            frame = frame.f_back
+        return ";".join(reversed(names))
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.stacks[self._collapse(frame)] += 1
+                self.samples += 1
+
+    def start(self) -> "SamplingProfiler":
+        self._thread = threading.Thread(target=self._run, name="stage-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def to_dict(self, top: int = 50) -> Dict[str, Any]:
+        return {
+            "interval_ms": self.interval_seconds * 1000,
+            "samples": self.samples,
+            "stacks": [{"stack": stack, "count": count} for stack, count in self.stacks.most_common(top)],
+        }
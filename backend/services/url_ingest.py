@@ -0,0 +1,151 @@
+import codecs
+import csv
+import re
+from typing import AsyncIterable, AsyncIterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from sqlalchemy import text
+
+from services.url_utils import canonicalize_url, compute_url_key, has_valid_port, url_host
+
+MAX_URL_LENGTH = 500  # seo_reports.url is String(500)
+STAGING_TABLE = "seo_url_staging"
+STAGING_COLUMNS = ["batch_id", "position", "url", "url_key", "host"]
+# "mailto:", "javascript:" etc.; a host with a port ("example.com:8080") is not a scheme.
+OTHER_SCHEME = re.compile(r"^[A-Za-z][A-Za-z0-9+.-]*:(?!\d)")
+
+# (batch_id, position, url, url_key, host), in STAGING_COLUMNS order
+StagedRow = Tuple[str, int, str, str, str]
+
+async def iter_upload_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """Splits a streamed UTF-8 upload into lines without holding the whole body."""
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        # The last piece may be a partial line; keep it for the next chunk.
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+def parse_url_row(line: str) -> Optional[str]:
+    """
+    Returns the canonical URL of one upload row, or None for rows to skip
+    (blank lines, comments, a "url" header). Raises ValueError for invalid URLs.
+
+    Rows may be bare URLs or CSV with the URL in the first column.
+    """
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return None
+    value = next(csv.reader([line]), [""])[0].strip()
+    if not value or value.lower() == "url":
+        return None
+    if "://" not in value:
+        if OTHER_SCHEME.match(value):
+            raise ValueError(f"Not an http(s) URL: {value[:100]}")
+        value = f"http://{value}"
+
+    parts = urlsplit(value)
+    if parts.scheme.lower() not in ("http", "https") or not parts.hostname:
+        raise ValueError(f"Not an http(s) URL: {value[:100]}")
+    if not has_valid_port(value):
+        raise ValueError(f"Invalid port: {value[:100]}")
+    url = canonicalize_url(value)
+    if len(url) > MAX_URL_LENGTH:
+        raise ValueError(f"URL longer than {MAX_URL_LENGTH} characters")
+    return url
+
+async def iter_staged_rows(
+    batch_id: str, lines: AsyncIterable[str], chunk_size: int, stats: dict
+) -> AsyncIterator[List[StagedRow]]:
+    """
+    Validates and canonicalizes rows as they stream in and yields them in
+    chunks ready for COPY. Counts rows and rejects in `stats`.
+    """
+    chunk: List[StagedRow] = []
+    async for line in lines:
+        try:
+            url = parse_url_row(line)
+        except ValueError:
+            stats["invalid"] += 1
+            continue
+        if url is None:
+            continue
+        chunk.append((batch_id, stats["accepted"], url, compute_url_key(url), url_host(url)))
+        stats["accepted"] += 1
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+async def copy_staged_rows(db, rows: List[StagedRow]) -> None:
+    """Loads a chunk into the staging table with COPY on the session's connection."""
+    connection = await db.connection()
+    raw = await connection.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(STAGING_TABLE, records=rows, columns=STAGING_COLUMNS)
+
+# Dedups the staged URLs of a batch and merges them into seo_reports in one
+# statement: new URLs claim an in-flight guard row for the batch's :options and
+# get a pending report, URLs already in flight with those options attach to the
+# existing report, and every resolved report is linked to the batch, flagged
+# when the batch created it. Guards claimed before :stale_before belong to runs
+# that died and are taken over. Only URLs whose in-flight report finished
+# between the claim and the lookup are returned, for the caller to retry; the
+# rest is read back from seo_batch_reports a page at a time.
+MERGE_STAGED_URLS = text("""
+    WITH staged AS (
+        SELECT DISTINCT ON (url_key) url_key, url, host, position,
+               nextval(pg_get_serial_sequence('seo_reports', 'id')) AS new_id
+        FROM seo_url_staging
+        WHERE batch_id = :batch_id
+        ORDER BY url_key, position
+    ),
+    claimed AS (
+        INSERT INTO seo_inflight_reports (url_key, options, report_id)
+        SELECT url_key, :options, new_id FROM staged
+        ON CONFLICT (url_key, options) DO UPDATE
+            SET report_id = EXCLUDED.report_id, claimed_at = now()
+            WHERE seo_inflight_reports.claimed_at < :stale_before
+        RETURNING url_key, report_id
+    ),
+    inserted AS (
+        INSERT INTO seo_reports (id, url, url_key, host, status, metrics_status)
+        SELECT c.report_id, s.url, s.url_key, s.host, 'pending', 'pending'
+        FROM claimed c JOIN staged s ON s.url_key = c.url_key
+    ),
+    resolved AS (
+        SELECT s.position, s.url, COALESCE(c.report_id, g.report_id) AS report_id, c.report_id IS NOT NULL AS created
+        FROM staged s
+        LEFT JOIN claimed c ON c.url_key = s.url_key
+        LEFT JOIN seo_inflight_reports g ON c.url_key IS NULL AND g.url_key = s.url_key AND g.options = :options
+    ),
+    linked AS (
+        INSERT INTO seo_batch_reports (batch_id, report_id, position, created)
+        SELECT :batch_id, report_id, position, created FROM resolved WHERE report_id IS NOT NULL
+        ON CONFLICT DO NOTHING
+    )
+    SELECT position, url FROM resolved WHERE report_id IS NULL ORDER BY position
+""")
+
+COUNT_BATCH_REPORTS = text("""
+    SELECT count(*) AS reports, count(*) FILTER (WHERE created) AS created
+    FROM seo_batch_reports
+    WHERE batch_id = :batch_id
+""")
+
+# One page of the reports a batch created, in primary-key order after :after_report_id.
+CREATED_BATCH_REPORTS = text("""
+    SELECT b.report_id, r.url
+    FROM seo_batch_reports b
+    JOIN seo_reports r ON r.id = b.report_id
+    WHERE b.batch_id = :batch_id AND b.report_id > :after_report_id AND b.created
+    ORDER BY b.report_id
+    LIMIT :limit
+""")
+
+CLEAR_STAGED_URLS = text("DELETE FROM seo_url_staging WHERE batch_id = :batch_id")
@@ -0,0 +1,77 @@
+import hashlib
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Query parameters that only carry campaign/click tracking and never change the page.
+TRACKING_PARAMS = {
+    "gclid", "dclid", "fbclid", "msclkid", "yclid", "mc_cid", "mc_eid", "igshid", "_ga", "ref_src",
+}
+TRACKING_PREFIXES = ("utm_",)
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+def _is_tracking_param(name: str) -> bool:
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+def has_valid_port(url: str) -> bool:
+    """False when the URL's port is out of range or not a number."""
+    try:
+        urlsplit(url.strip()).port
+    except ValueError:
+        return False
+    return True
+
+def canonicalize_url(url: str) -> str:
+    """
+    Normalizes a URL so that trivially different spellings of the same page compare equal.
+
+    Lowercases the scheme and host, drops default ports, fragments and tracking
+    parameters, sorts the remaining query parameters and uses "/" for an empty path.
+    An invalid port is kept as written rather than raising, so stored URLs
+    always get a key; request handlers reject such URLs with has_valid_port().
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower() or "http"
+    host = (parts.hostname or "").lower()
+
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+        host = parts.netloc.rsplit("@", 1)[-1].lower()
+    netloc = host
+    if port and port != DEFAULT_PORTS.get(scheme):
+        netloc = f"{host}:{port}"
+    if parts.username:
+        userinfo = parts.username + (f":{parts.password}" if parts.password else "")
+        netloc = f"{userinfo}@{netloc}"
+
+    path = parts.path or "/"
+    query_pairs = [
+        (name, value)
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not _is_tracking_param(name)
+    ]
+    query = urlencode(sorted(query_pairs))
+
+    return urlunsplit((scheme, netloc, path, query, ""))
+
+def url_host(url: str) -> str:
+    """
+    The lowercased host name of a URL, without userinfo or port; what the
+    domain filters and the link graph group a site by.
+    """
+    if "://" not in url:
+        url = f"http://{url.strip()}"
+    return (urlsplit(url.strip()).hostname or "")[:255]
+
+def compute_url_key(url: str) -> str:
+    """
+    Returns a fixed-width (32 hex chars) key for the canonical form of a URL.
+
+    The scheme is left out of the hash so that http:// and https:// variants
+    of a page share cached reports and history.
+    """
+    canonical = canonicalize_url(url)
+    without_scheme = canonical.split("://", 1)[-1]
+    return hashlib.blake2b(without_scheme.encode("utf-8"), digest_size=16).hexdigest()
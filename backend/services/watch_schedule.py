@@ -0,0 +1,19 @@
+import math
+from datetime import datetime, timezone
+
+def schedule_offset(url_key: str, interval_seconds: int) -> int:
+    """
+    A URL's fixed offset within its interval, derived from its key so it is
+    the same on every replica and after restarts, and spread evenly across URLs.
+    """
+    return int(url_key[:8], 16) % interval_seconds
+
+def next_run_at(url_key: str, interval_seconds: int, after: datetime) -> datetime:
+    """
+    The first run slot strictly after `after`. Slots are
+    offset + k * interval seconds since the epoch, so a URL that falls behind
+    skips to its next slot instead of bunching up with others.
+    """
+    offset = schedule_offset(url_key, interval_seconds)
+    slot = math.floor((after.timestamp() - offset) / interval_seconds) + 1
+    return datetime.fromtimestamp(slot * interval_seconds + offset, tz=timezone.utc)
@@ -1,5 +1,6 @@
 import asyncio
 import sys
+from types import SimpleNamespace
 import os
 import pytest
 import pytest_asyncio
@@ -11,7 +12,7 @@ from httpx import AsyncClient
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from main import app
-from core.database import get_db, Base
+from core.database import get_db, get_read_db, Base
 from core.config import settings 
 
 @pytest.fixture(scope="session")
@@ -60,8 +61,89 @@ async def async_client(db_session):
         yield db_session
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
 
     async with AsyncClient(app=app, base_url="http://test") as client:
         yield client
         
-    app.dependency_overrides.clear()
\ No newline at end of file
+    app.dependency_overrides.clear()
+
+class FakeResult:
+    """The parts of a SQLAlchemy Result the unit tests' fake sessions return."""
+    def __init__(self, rows=(), scalars=()):
+        self.rows = list(rows)
+        self.scalar_values = list(scalars)
+
+    def all(self):
+        return self.rows
+
+    def one(self):
+        return self.rows[0]
+
+    def scalar_one_or_none(self):
+        return self.scalar_values[0] if self.scalar_values else None
+
+    def scalars(self):
+        return SimpleNamespace(
+            all=lambda: self.scalar_values,
+            first=lambda: self.scalar_values[0] if self.scalar_values else None,
+        )
+
+
+class FakeSession:
+    """
+    Stands in for an AsyncSession in unit tests that don't need a database.
+    Records each statement passed to execute() and answers it from `results`: a callable
+    taking (statement, params), a list consumed one result per call, or one
+    result returned every time. `scalar` answers scalar() the same way, and
+    `stream_rows` are the row mappings stream() serves as one partition.
+    """
+    def __init__(self, results=None, scalar=None, stream_rows=()):
+        self.results = results
+        self.scalar_result = scalar
+        self.stream_rows = stream_rows
+        self.statements = []
+        self.params = []
+        self.commits = 0
+        self.rollbacks = 0
+
+    @property
+    def sql(self):
+        return [str(statement) for statement in self.statements]
+
+    def _answer(self, answer, statement, params):
+        if callable(answer):
+            return answer(statement, params)
+        if isinstance(answer, list):
+            return answer.pop(0) if answer else FakeResult()
+        return answer if answer is not None else FakeResult()
+
+    async def execute(self, statement, params=None):
+        self.statements.append(statement)
+        self.params.append(params)
+        return self._answer(self.results, statement, params)
+
+    async def scalar(self, statement, params=None):
+        return self.scalar_result(statement, params) if callable(self.scalar_result) else self.scalar_result
+
+    async def stream(self, statement):
+        self.statements.append(statement)
+        self.params.append(None)
+        rows = [SimpleNamespace(_mapping=row) for row in self.stream_rows]
+
+        async def partitions():
+            yield rows
+
+        return SimpleNamespace(partitions=partitions)
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        self.rollbacks += 1
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
@@ -1,7 +1,11 @@
+from datetime import datetime, timedelta, timezone
 from unittest.mock import patch
 from httpx import AsyncClient
 import pytest
-from models.seo_report import SEOReport
+from sqlalchemy import select, update
+from api.v1.seo_reports import _analysis_options, _create_or_attach_report
+from models.seo_report import InflightReport, SEOReport
+from services.url_utils import compute_url_key
 
 @pytest.mark.asyncio
 async def test_submit_analysis(async_client: AsyncClient):
@@ -36,4 +40,72 @@ async def test_get_pdf_report(async_client: AsyncClient, db_session):
     assert response.status_code == 200
     assert response.headers["content-type"] == "application/pdf"
     sanitized_title = "Test_Title"
-    assert f'attachment; filename="{sanitized_title}.pdf"' in response.headers["content-disposition"]
\ No newline at end of file
+    assert f'attachment; filename="{sanitized_title}.pdf"' in response.headers["content-disposition"]
+@pytest.mark.asyncio
+async def test_submit_analysis_attaches_to_inflight_report(async_client: AsyncClient):
+    """A second submission for a URL still in flight reuses the existing report."""
+    with patch('api.v1.seo_reports.BackgroundTasks.add_task') as mock_add_task:
+        payload = {"url": "http://inflight.example.com", "include_ai_insights": False}
+        first = (await async_client.post("/api/v1/seo-reports/analyze", json=payload)).json()
+        second = (await async_client.post("/api/v1/seo-reports/analyze", json=payload)).json()
+        assert second["report_id"] == first["report_id"]
+        assert second["message"] == "Analysis already in progress for this URL"
+        assert mock_add_task.call_count == 1
+
+@pytest.mark.asyncio
+async def test_completing_a_report_releases_its_inflight_guard(db_session):
+    """The release trigger drops the guard row once the report leaves the in-flight statuses."""
+    url = "http://guard.example.com/"
+    guard_query = select(InflightReport.report_id).filter(InflightReport.url_key == compute_url_key(url))
+
+    report_id, created = await _create_or_attach_report(db_session, url)
+    assert created
+    assert await db_session.scalar(guard_query) == report_id
+
+    await db_session.execute(update(SEOReport).where(SEOReport.id == report_id).values(status="completed"))
+    await db_session.commit()
+    assert await db_session.scalar(guard_query) is None
+
+    next_report_id, created = await _create_or_attach_report(db_session, url)
+    assert created and next_report_id != report_id
+
+@pytest.mark.asyncio
+async def test_abandoned_inflight_guard_is_reclaimed(db_session):
+    """A guard older than the analysis timeout is taken over by the next submission."""
+    url = "http://abandoned.example.com/"
+    guard_query = select(InflightReport.report_id).filter(InflightReport.url_key == compute_url_key(url))
+
+    report_id, created = await _create_or_attach_report(db_session, url)
+    assert created
+    await db_session.execute(
+        update(InflightReport)
+        .where(InflightReport.report_id == report_id)
+        .values(claimed_at=datetime.now(timezone.utc) - timedelta(days=1))
+    )
+    await db_session.commit()
+
+    next_report_id, created = await _create_or_attach_report(db_session, url)
+    assert created and next_report_id != report_id
+    assert await db_session.scalar(guard_query) == next_report_id
+
+@pytest.mark.asyncio
+async def test_runs_with_different_options_are_not_coalesced_or_reused(async_client: AsyncClient, db_session):
+    """A full or link-checked request neither joins a quick run nor reuses its report."""
+    url = "http://options.example.com/"
+    quick_id, created = await _create_or_attach_report(db_session, url, _analysis_options("quick"))
+    assert created
+
+    full_id, created = await _create_or_attach_report(db_session, url, _analysis_options())
+    assert created and full_id != quick_id
+    assert await _create_or_attach_report(db_session, url, _analysis_options("quick")) == (quick_id, False)
+
+    await db_session.execute(
+        update(SEOReport).where(SEOReport.id == quick_id).values(status="completed", rule_set="quick")
+    )
+    await db_session.commit()
+    with patch('api.v1.seo_reports.BackgroundTasks.add_task'):
+        payload = {"url": url, "include_ai_insights": False, "rule_set": "quick"}
+        reused = (await async_client.post("/api/v1/seo-reports/analyze", json=payload)).json()
+        linked = (await async_client.post("/api/v1/seo-reports/analyze", json={**payload, "check_links": True})).json()
+    assert reused["report_id"] == quick_id and reused["status"] == "completed"
+    assert linked["report_id"] != quick_id and linked["status"] == "processing"
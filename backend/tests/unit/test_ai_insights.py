@@ -0,0 +1,72 @@
+import asyncio
+import json
+
+import pytest
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+
+from services.ai_insights import AIInsightGenerator, InsightBatcher
+
+class FakeGenerator:
+    def __init__(self):
+        self.batches = []
+        self.singles = []
+
+    async def generate_insights(self, metrics):
+        self.singles.append(metrics)
+        return {"summary": f"single {metrics['n']}", "recommendations": []}
+
+    async def generate_insights_batch(self, metrics_by_report):
+        self.batches.append(sorted(metrics_by_report))
+        return {
+            report_id: {"summary": f"batch {metrics['n']}", "recommendations": []}
+            for report_id, metrics in metrics_by_report.items()
+        }
+
+@pytest.mark.asyncio
+async def test_insight_batcher_groups_concurrent_requests():
+    generator = FakeGenerator()
+    batcher = InsightBatcher(lambda: generator, window_seconds=0.05, max_items=3, max_input_tokens=10_000)
+
+    results = await asyncio.gather(*(batcher.submit(i, {"n": i}) for i in range(4)))
+
+    assert [r["summary"] for r in results] == ["batch 0", "batch 1", "batch 2", "single 3"]
+    assert generator.batches == [[0, 1, 2]]
+    assert generator.singles == [{"n": 3}]
+
+def _generator_with_replies(*replies):
+    generator = AIInsightGenerator(api_key="test-key", max_input_tokens=4000)
+    generator.model = GenericFakeChatModel(messages=iter([
+        AIMessage(content=json.dumps(reply) if not isinstance(reply, str) else reply,
+                  usage_metadata={"input_tokens": 400, "output_tokens": 100, "total_tokens": 500})
+        for reply in replies
+    ]))
+    generator._build_chains()
+    return generator
+
+@pytest.mark.asyncio
+async def test_generate_insights_records_token_usage():
+    generator = _generator_with_replies({"summary": "ok", "recommendations": ["a"]})
+
+    result = await generator.generate_insights({"score": 80, "title": "Home", "rule_timings_ms": {"title": 0.1}})
+
+    assert result["summary"] == "ok"
+    assert result["token_usage"]["input_tokens"] == 400
+    assert result["token_usage"]["output_tokens"] == 100
+    assert result["token_usage"]["estimated_input_tokens"] > 0
+
+@pytest.mark.asyncio
+async def test_generate_insights_batch_falls_back_per_report():
+    generator = _generator_with_replies(
+        {"results": [{"report_id": 1, "summary": "batched", "recommendations": ["a"]}]},
+        {"summary": "single", "recommendations": ["r"]},
+    )
+
+    results = await generator.generate_insights_batch({1: {"score": 80}, 2: {"score": 60}})
+    assert results[1]["summary"] == "batched"
+    assert results[1]["token_usage"]["batch_size"] == 2
+    assert results[2]["summary"] == "single"
+
+    generator = _generator_with_replies("not json", {"summary": "single", "recommendations": ["r"]})
+    results = await generator.generate_insights_batch({1: {"score": 80}})
+    assert results[1]["summary"] == "single"
@@ -0,0 +1,13 @@
+from core import database
+from core.config import settings
+
+def test_read_engine_falls_back_to_primary():
+    """Without a replica configured, read sessions use the writer engine."""
+    if not settings.READ_DATABASE_URL:
+        assert database.read_engine is database.engine
+
+def test_engine_pool_settings():
+    """The writer engine is created with the configured pool settings."""
+    pool = database.engine.pool
+    assert pool.size() == settings.DB_POOL_SIZE
+    assert database.engine.echo == settings.DB_ECHO
@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+
+from services import insight_stage
+
+@pytest.mark.asyncio
+async def test_insight_stage_stores_rules_first_then_upgrades(monkeypatch):
+    stored = []
+
+    async def fake_store(report_id, insights_status, ai_results=None, ai_ms=None):
+        stored.append((insights_status, ai_results and ai_results["source"]))
+
+    async def slow_llm(report_id, analysis_results):
+        await asyncio.sleep(0.05)
+        return {"summary": "llm", "recommendations": [], "source": "llm"}
+
+    monkeypatch.setattr(insight_stage, "store_insights", fake_store)
+    monkeypatch.setattr(insight_stage, "_request_llm_insights", slow_llm)
+    monkeypatch.setattr(insight_stage.settings, "GOOGLE_API_KEY", "test-key")
+
+    await insight_stage.run_insight_stage(1, {"score": 80, "rule_penalties": {"h1": 20}}, latency_budget_ms=1)
+    assert stored == [("processing", None), ("completed", "rules")]
+
+    await asyncio.gather(*insight_stage._stage_tasks)
+    assert stored[-1] == ("completed", "llm")
+
+@pytest.mark.asyncio
+async def test_insight_stage_without_key_uses_rules(monkeypatch):
+    stored = []
+
+    async def fake_store(report_id, insights_status, ai_results=None, ai_ms=None):
+        stored.append((insights_status, ai_results and ai_results["source"]))
+
+    monkeypatch.setattr(insight_stage, "store_insights", fake_store)
+    monkeypatch.setattr(insight_stage.settings, "GOOGLE_API_KEY", "")
+
+    await insight_stage.run_insight_stage(1, {"score": 100})
+    assert stored == [("processing", None), ("completed", "rules")]
+
+@pytest.mark.asyncio
+async def test_llm_upgrade_waits_for_the_rules_write(monkeypatch):
+    """An LLM answer arriving while the rule-based write is in progress is stored after it."""
+    stored = []
+    llm_done = asyncio.Event()
+
+    async def slow_store(report_id, insights_status, ai_results=None, ai_ms=None):
+        if ai_results and ai_results["source"] == "rules":
+            await llm_done.wait()
+            await asyncio.sleep(0)
+        stored.append((insights_status, ai_results and ai_results["source"]))
+
+    async def slow_llm(report_id, analysis_results):
+        await asyncio.sleep(0.02)
+        llm_done.set()
+        return {"summary": "llm", "recommendations": [], "source": "llm"}
+
+    monkeypatch.setattr(insight_stage, "store_insights", slow_store)
+    monkeypatch.setattr(insight_stage, "_request_llm_insights", slow_llm)
+    monkeypatch.setattr(insight_stage.settings, "GOOGLE_API_KEY", "test-key")
+
+    await insight_stage.run_insight_stage(1, {"score": 80}, latency_budget_ms=1)
+    await asyncio.gather(*insight_stage._stage_tasks)
+    assert stored == [("processing", None), ("completed", "rules"), ("completed", "llm")]
@@ -0,0 +1,41 @@
+import pytest
+import respx
+from httpx import Response
+
+from services.link_checker import LinkChecker
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_link_checker_reports_broken_links_and_caches():
+    """HEAD results are cached across pages, and a 405 falls back to GET."""
+    ok = respx.head("http://example.com/ok").mock(return_value=Response(200))
+    respx.head("http://example.com/missing").mock(return_value=Response(404))
+    respx.head("http://example.com/no-head").mock(return_value=Response(405))
+    fallback = respx.get("http://example.com/no-head").mock(return_value=Response(200))
+
+    checker = LinkChecker(max_concurrency=5, per_host_concurrency=2, timeout=5, cache_ttl=60, error_cache_ttl=60)
+    targets = [{"url": f"http://example.com/{path}"} for path in ("ok", "missing", "no-head")]
+
+    summary = await checker.check_page(targets, max_links=10)
+    assert summary["checked"] == 3
+    assert summary["broken"] == [{"url": "http://example.com/missing", "status": 404}]
+    assert fallback.call_count == 1
+
+    await checker.check_page(targets[:1], max_links=10)
+    assert ok.call_count == 1
+    await checker.close()
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_malformed_links_count_as_broken():
+    """Hrefs httpx can't even build a request for don't fail the page's check."""
+    respx.head("http://example.com/ok").mock(return_value=Response(200))
+    checker = LinkChecker(max_concurrency=5, per_host_concurrency=2, timeout=5, cache_ttl=60, error_cache_ttl=60)
+    malformed = ["http://xn--zz.com/", "http://example.com/a\x00b", "http://[::1/"]
+    targets = [{"url": url} for url in malformed + ["http://example.com/ok"]]
+
+    summary = await checker.check_page(targets, max_links=10)
+
+    assert summary["checked"] == 4
+    assert summary["broken"] == [{"url": url, "status": None} for url in malformed]
+    await checker.close()
@@ -0,0 +1,41 @@
+from services.link_graph import link_rows
+from services.seo_analyzer import SEOAnalyzer
+from services.url_utils import compute_url_key
+
+HTML = """
+<html><head><title>Home</title></head><body>
+  <a href="/pricing">Pricing</a>
+  <a href="https://example.com/pricing?utm_source=nav#plans">Pricing again</a>
+  <a href="/blog" rel="nofollow">Blog</a>
+  <a href="https://other.example/">Partner</a>
+  <a href="mailto:hi@example.com">Mail</a>
+  <a href="http://[::1">Broken</a>
+</body></html>
+"""
+
+def test_link_rows_from_analyzer_targets():
+    url = "https://example.com/"
+    results = SEOAnalyzer().analyze(HTML, 100, url)
+
+    rows = link_rows(7, url, results["link_targets"], max_links=100)
+
+    by_target = {row["target_url_key"]: row for row in rows}
+    assert len(rows) == 3
+    pricing = by_target[compute_url_key("https://example.com/pricing")]
+    assert pricing["internal"] and not pricing["nofollow"]
+    assert pricing["source_url_key"] == compute_url_key(url)
+    assert pricing["source_host"] == "example.com"
+    assert pricing["source_report_id"] == 7
+    assert by_target[compute_url_key("https://example.com/blog")]["nofollow"]
+    assert not by_target[compute_url_key("https://other.example/")]["internal"]
+
+def test_link_rows_are_capped():
+    targets = [{"url": f"https://example.com/p{i}", "internal": True} for i in range(10)]
+    assert len(link_rows(1, "https://example.com/", targets, max_links=4)) == 4
+
+def test_unparseable_targets_are_skipped():
+    targets = [{"url": "http://example.com:99999/x", "internal": True}, {"url": "https://example.com/ok", "internal": True}]
+
+    rows = link_rows(1, "https://example.com/", targets, max_links=10)
+
+    assert [row["target_url"] for row in rows] == ["https://example.com/ok"]
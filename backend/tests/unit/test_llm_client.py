@@ -0,0 +1,62 @@
+import asyncio
+
+import pytest
+
+from services.llm_client import ResilientLLMCaller
+
+class RateLimited(Exception):
+    status_code = 429
+
+def _caller(**overrides):
+    options = dict(deadline_seconds=5, max_retries=2, backoff_seconds=0.001, backoff_max_seconds=0.01)
+    options.update(overrides)
+    return ResilientLLMCaller(**options)
+
+@pytest.mark.asyncio
+async def test_retries_retryable_errors_only():
+    caller = _caller()
+    outcomes = [RateLimited(), "ok"]
+
+    async def flaky():
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    assert await caller.call(flaky) == "ok"
+    assert caller.stats.retries == 1
+
+    async def broken():
+        raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        await caller.call(broken)
+    assert caller.stats.retries == 1
+    assert caller.stats.failures == 1
+
+@pytest.mark.asyncio
+async def test_hedges_slow_requests_past_p95():
+    caller = _caller(hedge=True, hedge_min_samples=3)
+    for _ in range(3):
+        caller.stats.record_latency(0.01)
+    delays = [1.0, 0.0]
+
+    async def call():
+        delay = delays.pop(0)
+        await asyncio.sleep(delay)
+        return delay
+
+    assert await caller.call(call) == 0.0
+    assert caller.stats.hedges == 1
+    assert caller.stats.hedge_wins == 1
+
+@pytest.mark.asyncio
+async def test_deadline_bounds_the_whole_call():
+    caller = _caller(deadline_seconds=0.05)
+
+    async def hang():
+        await asyncio.sleep(1)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await caller.call(hang)
+    assert caller.stats.timeouts == 1
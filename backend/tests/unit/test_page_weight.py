@@ -0,0 +1,47 @@
+import pytest
+import respx
+from httpx import Response
+
+from services.page_weight import AssetProber, apply_page_weight
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_asset_prober_sizes_assets_and_caches():
+    """HEAD Content-Length is used when present, otherwise a ranged GET's Content-Range."""
+    head = respx.head("http://example.com/app.js").mock(
+        return_value=Response(200, headers={"Content-Length": "2000000"})
+    )
+    respx.head("http://example.com/hero.jpg").mock(return_value=Response(405))
+    respx.get("http://example.com/hero.jpg").mock(
+        return_value=Response(206, headers={"Content-Range": "bytes 0-0/1500000"}, content=b"x")
+    )
+    respx.head("http://example.com/gone.css").mock(return_value=Response(404))
+    respx.get("http://example.com/gone.css").mock(return_value=Response(404))
+
+    prober = AssetProber(max_concurrency=5, timeout=5, cache_ttl=60)
+    targets = [
+        {"url": "http://example.com/app.js", "type": "script"},
+        {"url": "http://example.com/hero.jpg", "type": "img"},
+        {"url": "http://example.com/gone.css", "type": "stylesheet"},
+    ]
+
+    page_weight = await prober.audit_page(500, targets, max_assets=10, time_budget=5)
+    assert page_weight["total_bytes"] == 3_500_500
+    assert page_weight["largest_asset"] == {"url": "http://example.com/app.js", "bytes": 2_000_000}
+    assert page_weight["by_type"] == {"html": 500, "script": 2_000_000, "img": 1_500_000}
+    assert page_weight["assets_sized"] == 2
+    assert page_weight["assets_unknown"] == 1
+
+    await prober.audit_page(500, targets[:1], max_assets=10, time_budget=5)
+    assert head.call_count == 1
+    await prober.close()
+
+def test_apply_page_weight_penalizes_heavy_pages():
+    analysis_results = {"score": 90, "title": "A reasonable page title", "rule_penalties": {"title": 0}}
+    page_weight = {"total_bytes": 3_500_500, "largest_asset": {"url": "http://example.com/app.js", "bytes": 2_000_000}}
+
+    apply_page_weight(analysis_results, page_weight, response_time_ms=100)
+
+    assert analysis_results["rule_penalties"]["page_weight"] == 15
+    assert analysis_results["score"] == 75
+    assert analysis_results["score_features"][-2:] == [3_500_500.0, 2_000_000.0]
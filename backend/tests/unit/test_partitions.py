@@ -0,0 +1,77 @@
+from datetime import date, datetime, timezone
+
+import pytest
+
+from conftest import FakeSession
+from services.partitions import (
+    add_months,
+    archive_partition,
+    ensure_partitions,
+    partition_month,
+    partition_name,
+    read_archived_reports,
+)
+
+def test_partition_names_round_trip():
+    assert partition_name(date(2026, 3, 1)) == "seo_reports_y2026m03"
+    assert partition_month("seo_reports_y2026m03") == date(2026, 3, 1)
+    assert partition_month("seo_reports_default") is None
+    assert add_months(date(2026, 11, 1), 3) == date(2027, 2, 1)
+    assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+
+@pytest.mark.asyncio
+async def test_archived_partition_can_be_read_back(tmp_path):
+    month = date(2025, 1, 1)
+    rows = [
+        {"id": 1, "url_key": "a", "status": "completed", "seo_score": 80.0,
+         "created_at": datetime(2025, 1, 5, tzinfo=timezone.utc)},
+        {"id": 2, "url_key": "b", "status": "completed", "seo_score": 60.0,
+         "created_at": datetime(2025, 1, 6, tzinfo=timezone.utc)},
+        {"id": 3, "url_key": "a", "status": "failed", "seo_score": None,
+         "created_at": datetime(2025, 1, 31, 23, 59, tzinfo=timezone.utc)},
+    ]
+    db = FakeSession(scalar=True, stream_rows=rows)
+
+    archived = await archive_partition(db, partition_name(month), month, archive_dir=str(tmp_path))
+
+    assert archived == 3
+    assert db.sql[0].startswith("ALTER TABLE seo_reports DETACH PARTITION seo_reports_y2025m01")
+    assert "DELETE FROM seo_links WHERE source_report_id IN (SELECT id FROM seo_reports_y2025m01)" in db.sql
+    assert db.sql[-1] == "DROP TABLE seo_reports_y2025m01"
+    assert (tmp_path / "seo_reports_y2025m01.ndjson.gz").exists()
+
+    found = list(read_archived_reports(
+        datetime(2024, 12, 1, tzinfo=timezone.utc),
+        datetime(2025, 3, 1, tzinfo=timezone.utc),
+        url_key="a",
+        archive_dir=str(tmp_path),
+    ))
+    assert [report["id"] for report in found] == [1, 3]
+    assert found[0]["created_at"] == rows[0]["created_at"]
+    assert all(report["archived"] for report in found)
+
+    completed = list(read_archived_reports(
+        datetime(2025, 1, 6, tzinfo=timezone.utc), status="completed", archive_dir=str(tmp_path)
+    ))
+    assert [report["id"] for report in completed] == [2]
+
+def _default_partition_has_rows(stranded):
+    """Answers existence checks: no month partitions yet, and maybe stranded rows in the default partition."""
+    return lambda statement, params: "seo_reports_default" in str(statement) and stranded
+
+@pytest.mark.asyncio
+async def test_ensure_partitions_moves_rows_out_of_the_default_partition():
+    db = FakeSession(scalar=_default_partition_has_rows(True))
+
+    created = await ensure_partitions(db, months_ahead=0, today=date(2026, 10, 19))
+
+    assert created == ["seo_reports_y2026m10"]
+    assert db.sql[0] == "ALTER TABLE seo_reports DETACH PARTITION seo_reports_default"
+    assert db.sql[1].startswith("CREATE TABLE seo_reports_y2026m10 PARTITION OF seo_reports")
+    assert db.sql[2].startswith("INSERT INTO seo_reports_y2026m10 SELECT * FROM seo_reports_default")
+    assert db.sql[3].startswith("DELETE FROM seo_reports_default")
+    assert db.sql[4] == "ALTER TABLE seo_reports ATTACH PARTITION seo_reports_default DEFAULT"
+
+    db = FakeSession(scalar=_default_partition_has_rows(False))
+    await ensure_partitions(db, months_ahead=0, today=date(2026, 10, 19))
+    assert len(db.sql) == 1 and db.sql[0].startswith("CREATE TABLE seo_reports_y2026m10")
@@ -0,0 +1,75 @@
+import json
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from services import portfolio_pdf
+from services.portfolio_pdf import LazyStory, PortfolioStats, generate_portfolio_pdf, portfolio_record
+
+def _row(report_id: int, score: float) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=report_id,
+        url=f"https://example.com/page-{report_id}?a=1&b=<2>",
+        title=None if report_id % 2 else f"Page {report_id}",
+        seo_score=score,
+        accessibility_score=70.0,
+        performance_score=None,
+        load_time=0.4,
+        ai_insights="Fine & dandy.",
+        ai_recommendations=["Add <alt> text"],
+        raw_metrics='{"meta_description": "Desc", "h1_count": 1, "images_missing_alt": 2}',
+        created_at=datetime(2026, 10, 1, tzinfo=timezone.utc),
+    )
+
+def test_portfolio_stats():
+    stats = PortfolioStats()
+    for report_id, score in enumerate([5, 55, 59, 100]):
+        stats.add(portfolio_record(_row(report_id, score)))
+
+    summary = stats.to_dict()
+    assert summary["count"] == 4
+    assert summary["averages"] == {"seo_score": 54.8, "accessibility_score": 70.0, "performance_score": None}
+    assert summary["histogram"] == [1, 0, 0, 0, 0, 2, 0, 0, 0, 1]
+
+def test_lazy_story_keeps_a_bounded_window():
+    pulled = []
+
+    def source():
+        for i in range(100):
+            pulled.append(i)
+            yield i
+
+    story = LazyStory(source(), lookahead=5)
+    seen = []
+    while len(story):
+        assert len(pulled) - len(seen) <= 5
+        seen.append(story[0])
+        del story[0]
+    assert seen == list(range(100))
+
+def test_generate_portfolio_pdf_streams_records(tmp_path, monkeypatch):
+    records_path = tmp_path / "reports.ndjson"
+    stats = PortfolioStats()
+    with open(records_path, "w", encoding="utf-8") as spool:
+        for report_id in range(1, 101):
+            record = portfolio_record(_row(report_id, report_id % 100))
+            stats.add(record)
+            spool.write(json.dumps(record) + "\n")
+
+    max_window = 0
+    original_len = LazyStory.__len__
+
+    def tracking_len(self):
+        nonlocal max_window
+        size = original_len(self)
+        max_window = max(max_window, size)
+        return size
+
+    monkeypatch.setattr(portfolio_pdf.LazyStory, "__len__", tracking_len)
+    output_path = tmp_path / "portfolio.pdf"
+
+    pages = generate_portfolio_pdf(str(records_path), str(output_path), "example.com", stats.to_dict())
+
+    assert output_path.read_bytes().startswith(b"%PDF")
+    # overview, summary table pages and one appendix per report
+    assert pages > 100
+    assert max_window <= portfolio_pdf.STORY_LOOKAHEAD + 2
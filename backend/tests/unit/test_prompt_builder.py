@@ -0,0 +1,30 @@
+import json
+
+from services.prompt_builder import PromptBuilder, compact_metrics, estimate_tokens
+
+def test_compact_metrics_drops_bookkeeping_and_empty_values():
+    metrics = {
+        "score": 0,
+        "title": "Home",
+        "h2_count": 0,
+        "link_check": None,
+        "rule_penalties": {"title": 0, "h1": 20},
+        "rule_timings_ms": {"title": 0.01},
+        "score_features": [0.0, 4.0],
+    }
+    assert compact_metrics(metrics) == {"score": 0, "title": "Home", "rule_penalties": {"h1": 20}}
+
+def test_prompt_builder_enforces_budget_keeping_essentials():
+    metrics = {
+        "score": 70,
+        "title": "Home",
+        "rule_penalties": {"h1": 20},
+        "link_check": {"broken": [{"url": f"http://example.com/{i}", "status": 404} for i in range(200)]},
+    }
+    builder = PromptBuilder(max_input_tokens=200, static_tokens=50)
+
+    encoded, estimated = builder.build(metrics)
+
+    assert json.loads(encoded) == {"score": 70, "title": "Home", "rule_penalties": {"h1": 20}}
+    assert estimated == 50 + estimate_tokens(encoded)
+    assert estimated <= 200
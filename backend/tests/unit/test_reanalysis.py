@@ -0,0 +1,41 @@
+from unittest.mock import patch
+
+from services import reanalysis
+from services.snapshot_store import LocalSnapshotStore
+
+HTML = b"<html><head><title>This is a Perfect Title for SEO</title></head><body><h1>Hi</h1></body></html>"
+
+def test_snapshots_are_reanalyzed_without_refetching(tmp_path):
+    """Stored snapshots are re-analyzed; a missing one yields None and page weight is applied again."""
+    store = LocalSnapshotStore(str(tmp_path))
+    digest = store.put(HTML)
+
+    page_weight = {"total_bytes": 4_000_000, "largest_asset": {"url": "http://example.com/a.jpg", "bytes": 10}}
+    items = [
+        (1, digest, "utf-8", 500, "http://example.com", None),
+        (2, "0" * 64, "utf-8", 500, "http://example.com", None),
+        (3, digest, None, 500, "http://example.com", page_weight),
+    ]
+    with patch("services.reanalysis.get_snapshot_store", return_value=store):
+        results = reanalysis.reanalyze_snapshots(items, "full")
+    assert results[0][1]["title"] == "This is a Perfect Title for SEO"
+    assert results[1] == (2, None)
+    assert results[2][1]["rule_penalties"]["page_weight"] == 10
+    assert results[2][1]["score"] == results[0][1]["score"] - 10
+    assert results[2][1]["page_weight_bytes"] == 4_000_000
+
+def test_snapshots_are_decoded_with_the_original_charset(tmp_path):
+    """Non-UTF-8 pages keep their title instead of turning into replacement characters."""
+    store = LocalSnapshotStore(str(tmp_path))
+    latin1 = store.put("<html><head><title>Café crème</title></head></html>".encode("latin-1"))
+    shift_jis = store.put("<html><head><title>東京の天気</title></head></html>".encode("shift_jis"))
+    items = [
+        (1, latin1, "ISO-8859-1", 500, "http://example.com", None),
+        (2, shift_jis, "shift_jis", 500, "http://example.jp", None),
+        (3, latin1, "no-such-charset", 500, "http://example.com", None),
+    ]
+    with patch("services.reanalysis.get_snapshot_store", return_value=store):
+        results = dict(reanalysis.reanalyze_snapshots(items, "full"))
+    assert results[1]["title"] == "Café crème"
+    assert results[2]["title"] == "東京の天気"
+    assert results[3]["title"] == "Caf� cr�me"
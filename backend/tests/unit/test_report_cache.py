@@ -0,0 +1,92 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from starlette.requests import Request
+
+from conftest import FakeResult, FakeSession
+from api.v1 import seo_reports
+from services import report_cache
+from services.report_cache import etag_matches, make_etag, report_response_cache
+from services.report_events import report_event_broker
+
+def _request(if_none_match=None):
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+def _report(status="completed", insights_status="completed"):
+    return SimpleNamespace(
+        id=1, url="https://example.com/", title="Example", meta_description=None, h1_tags=None, h2_tags=None,
+        images=None, links=None, load_time=0.2, accessibility_score=None, performance_score=None, seo_score=90.0,
+        ai_insights=None, ai_recommendations=None, ai_token_usage=None, insights_source=None, link_check=None,
+        page_weight=None, status=status, metrics_status=status, insights_status=insights_status,
+        error_message=None, created_at=datetime(2026, 10, 1, tzinfo=timezone.utc), updated_at=None,
+    )
+
+@pytest.fixture
+def primary(monkeypatch):
+    """The primary's session; cached bodies are read from it."""
+    session = FakeSession(FakeResult(scalars=[_report()]))
+    monkeypatch.setattr(seo_reports, "SessionLocal", lambda: session)
+    return session
+
+@pytest.fixture(autouse=True)
+def _empty_cache(monkeypatch, primary):
+    async def no_listener():
+        pass
+    monkeypatch.setattr(seo_reports, "ensure_invalidation_listener", no_listener)
+    report_response_cache.clear()
+    yield
+    report_response_cache.clear()
+
+def test_etag_matching():
+    etag = make_etag(b"body")
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"other"', etag)
+    assert not etag_matches(None, etag)
+
+@pytest.mark.asyncio
+async def test_settled_report_is_served_from_cache_with_304():
+    db = FakeSession(FakeResult(scalars=[_report()]))
+
+    first = await seo_reports.get_report(1, _request(), None, db)
+    assert first.status_code == 200
+    assert first.headers["cache-control"].startswith("public")
+
+    etag = first.headers["etag"]
+    second = await seo_reports.get_report(1, _request(etag), None, db)
+    assert second.status_code == 304
+    assert second.headers["etag"] == etag
+    assert len(db.statements) == 1
+
+    # A status event from any process evicts the entry.
+    report_event_broker._on_notify(None, 0, "seo_report_status", '{"report_id": 1, "status": "processing"}')
+    await seo_reports.get_report(1, _request(), None, db)
+    assert len(db.statements) == 2
+
+    # So does a bulk rewrite (re-analysis, re-scoring) in another process.
+    report_event_broker._on_notify(None, 0, "seo_report_status", '{"report_id": 1, "rewritten": true}')
+    await seo_reports.get_report(1, _request(), None, db)
+    assert len(db.statements) == 3
+
+@pytest.mark.asyncio
+async def test_stale_replica_copy_is_not_cached(primary):
+    """A report the replica still shows as settled is cached only if the primary agrees."""
+    primary.results = FakeResult(scalars=[_report(insights_status="processing")])
+    db = FakeSession(FakeResult(scalars=[_report()]))
+
+    response = await seo_reports.get_report(1, _request(), None, db)
+    assert response.headers["cache-control"] == "no-cache"
+    assert report_cache.report_response_cache.get(1) is None
+
+@pytest.mark.asyncio
+async def test_report_with_pending_insights_is_not_cached():
+    db = FakeSession(FakeResult(scalars=[_report(insights_status="pending")]))
+
+    response = await seo_reports.get_report(1, _request(), None, db)
+    assert response.headers["cache-control"] == "no-cache"
+    await seo_reports.get_report(1, _request(), None, db)
+    assert len(db.statements) == 2
+    assert report_cache.report_response_cache.get(1) is None
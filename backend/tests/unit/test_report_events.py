@@ -0,0 +1,45 @@
+import json
+from unittest.mock import AsyncMock, patch
+import pytest
+from services.report_events import RESYNC_EVENT, ReportEventBroker
+
+@pytest.mark.asyncio
+async def test_broker_fans_out_only_to_matching_subscribers():
+    """A notification reaches subscribers of that report id and nobody else."""
+    broker = ReportEventBroker("postgresql://unused")
+    with patch.object(broker, "start", new=AsyncMock()):
+        async with broker.subscribe([1, 2]) as first, broker.subscribe([3]) as second:
+            broker._on_notify(None, 0, "seo_report_status", json.dumps({"report_id": 2, "status": "completed"}))
+            broker._on_notify(None, 0, "seo_report_status", "not json")
+
+            assert first.get_nowait() == {"report_id": 2, "status": "completed"}
+            assert second.empty()
+
+    assert broker._subscribers == {}
+
+@pytest.mark.asyncio
+async def test_overflow_and_disconnect_leave_a_resync_marker():
+    """A full queue or a dropped LISTEN connection is replaced by a single resync marker."""
+    broker = ReportEventBroker("postgresql://unused", queue_size=2)
+    with patch.object(broker, "start", new=AsyncMock()):
+        async with broker.subscribe([1]) as queue:
+            for status in ("processing", "completed", "failed"):
+                broker._on_notify(None, 0, "seo_report_status", json.dumps({"report_id": 1, "status": status}))
+            assert queue.get_nowait() is RESYNC_EVENT
+            assert queue.empty()
+
+            broker._on_notify(None, 0, "seo_report_status", json.dumps({"report_id": 1, "status": "completed"}))
+            broker._on_terminate(None)
+            assert queue.get_nowait() is RESYNC_EVENT
+            assert queue.empty()
+
+@pytest.mark.asyncio
+async def test_rewrite_events_reach_listeners_but_not_subscribers():
+    broker = ReportEventBroker("postgresql://unused")
+    seen = []
+    broker.add_event_listener(seen.append)
+    with patch.object(broker, "start", new=AsyncMock()):
+        async with broker.subscribe([1]) as queue:
+            broker._on_notify(None, 0, "seo_report_status", json.dumps({"report_id": 1, "rewritten": True}))
+            assert queue.empty()
+    assert seen == [{"report_id": 1, "rewritten": True}]
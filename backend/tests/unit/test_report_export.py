@@ -0,0 +1,29 @@
+import io
+import zipfile
+from types import SimpleNamespace
+
+from services.report_export import EXPORT_COLUMNS, ZipStreamWriter, flatten_report_row, format_csv
+
+def test_flatten_report_row_for_export():
+    """Export rows flatten selected raw_metrics fields and decode the stored JSON string."""
+    row = SimpleNamespace(**{column: None for column in EXPORT_COLUMNS})
+    row.id = 7
+    row.url = "http://example.com/"
+    row.raw_metrics = '{"h1_count": 1, "images_missing_alt": 3}'
+
+    record = flatten_report_row(row, ["h1_count", "images_missing_alt", "missing"])
+    assert record["id"] == 7
+    assert record["h1_count"] == 1
+    assert record["missing"] is None
+
+    csv_text = format_csv([record], EXPORT_COLUMNS + ["h1_count"], include_header=True)
+    assert csv_text.splitlines()[0].endswith(",h1_count")
+
+def test_zip_stream_writer_produces_valid_archive():
+    """Chunks returned by ZipStreamWriter concatenate into a readable ZIP."""
+    writer = ZipStreamWriter()
+    chunks = [writer.add("1_report.pdf", b"%PDF-one"), writer.add("2_report.pdf", b"%PDF-two"), writer.close()]
+
+    archive = zipfile.ZipFile(io.BytesIO(b"".join(chunks)))
+    assert archive.namelist() == ["1_report.pdf", "2_report.pdf"]
+    assert archive.read("2_report.pdf") == b"%PDF-two"
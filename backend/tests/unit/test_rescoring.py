@@ -0,0 +1,28 @@
+from types import SimpleNamespace
+
+from services.rescoring import rescore_chunk, rule_penalties_at
+from services.score_model import DEFAULT_SCORE_WEIGHTS, weights_with_overrides
+from services.seo_analyzer import SEOAnalyzer
+
+def test_vectorized_rescoring_matches_analyzer():
+    """Scores computed from stored feature vectors match the analyzer's own scores."""
+    analyzer = SEOAnalyzer()
+    pages = [
+        ("<html><head><title>This is a Perfect Title for SEO</title></head><body><h1>A</h1></body></html>", 500),
+        ("<html><body><h1>A</h1><h1>B</h1><img src='a'><img src='b'></body></html>", 2500),
+        ("<html><head><title>Short</title><meta name='description' content='x'></head></html>", 100),
+    ]
+    rows = []
+    for i, (html, response_time_ms) in enumerate(pages):
+        results = analyzer.analyze(html, response_time_ms, "http://example.com")
+        rows.append(SimpleNamespace(id=i, seo_score=results['score'], score_features=results['score_features']))
+
+    ids, old_scores, new_scores, penalties = rescore_chunk(rows, DEFAULT_SCORE_WEIGHTS)
+    assert list(new_scores) == list(old_scores)
+    for i, row in enumerate(rows):
+        expected = analyzer.analyze(pages[i][0], pages[i][1], "http://example.com")['rule_penalties']
+        assert rule_penalties_at(penalties, i) == {rule: expected[rule] for rule in rule_penalties_at(penalties, i)}
+
+    _, _, harsher, harsher_penalties = rescore_chunk(rows, weights_with_overrides({"h1_missing": 40}))
+    assert harsher[2] == new_scores[2] - 20
+    assert rule_penalties_at(harsher_penalties, 2)["h1"] == 40
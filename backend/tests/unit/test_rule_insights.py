@@ -0,0 +1,24 @@
+from services.rule_insights import generate_rule_insights
+
+def test_rule_insights_follow_penalties_largest_first():
+    metrics = {
+        "score": 55,
+        "title": "Hi",
+        "h1_count": 0,
+        "rule_penalties": {"title": 10, "meta_description": 0, "h1": 20, "load_time": 15},
+    }
+
+    insights = generate_rule_insights(metrics, link_check={"broken_count": 2})
+
+    assert insights["source"] == "rules"
+    assert insights["summary"].startswith("With an SEO score of 55")
+    assert "0 H1 tags" in insights["summary"]
+    assert "2 links on the page are broken." in insights["summary"]
+    assert insights["recommendations"][0].startswith("Use exactly one H1")
+    assert len(insights["recommendations"]) == 4
+    assert insights == generate_rule_insights(metrics, link_check={"broken_count": 2})
+
+def test_rule_insights_without_penalties_or_metrics():
+    insights = generate_rule_insights({"score": 100, "rule_penalties": {"page_weight": 10}})
+    assert "about ? MB" in insights["summary"]
+    assert generate_rule_insights({"score": 100})["recommendations"]
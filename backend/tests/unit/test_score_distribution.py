@@ -0,0 +1,30 @@
+from types import SimpleNamespace
+
+from sqlalchemy import select
+
+from models.seo_report import SEOReport
+from services.score_distribution import DISTRIBUTION_METRICS, build_distribution_queries, shape_distribution
+
+def test_shape_distribution_splits_overflow_buckets():
+    """width_bucket's out-of-range buckets are reported separately from the histogram."""
+    percentile_query, histogram_query = build_distribution_queries(select(SEOReport))
+    assert "percentile_cont" in str(percentile_query)
+    assert "width_bucket" in str(histogram_query)
+
+    values = {"count": 3}
+    for metric in DISTRIBUTION_METRICS:
+        values[f"{metric.name}_percentiles"] = [50.0, 90.0, 99.0]
+        values[f"{metric.name}_min"] = 0
+        values[f"{metric.name}_max"] = 100
+    percentile_row = SimpleNamespace(_mapping=values)
+    histogram_rows = [
+        SimpleNamespace(metric="seo_score", bucket=1, count=2),
+        SimpleNamespace(metric="seo_score", bucket=12, count=1),
+    ]
+
+    result = shape_distribution(percentile_row, histogram_rows)
+    seo_score = result["metrics"]["seo_score"]
+    assert seo_score["p90"] == 90.0
+    assert seo_score["histogram"]["counts"][0] == 2
+    assert seo_score["histogram"]["overflow"] == 1
+    assert len(seo_score["histogram"]["bin_edges"]) == 12
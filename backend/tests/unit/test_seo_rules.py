@@ -0,0 +1,13 @@
+from services.seo_analyzer import SEOAnalyzer
+
+def test_seo_analyzer_reports_rule_penalties_and_timings():
+    """Each rule reports its penalty and timing, and the quick rule set skips expensive rules."""
+    html_content = "<html><head><title>Short</title></head><body><img src='a.jpg'></body></html>"
+    results = SEOAnalyzer().analyze(html_content, 500, "http://example.com")
+    assert results['rule_penalties']['title'] == 10
+    assert results['rule_penalties']['image_alt'] == 5
+    assert set(results['rule_timings_ms']) == set(results['rule_penalties'])
+
+    quick = SEOAnalyzer(rule_set="quick").analyze(html_content, 500, "http://example.com")
+    assert 'image_alt' not in quick['rule_penalties']
+    assert quick['score'] == results['score'] + 5
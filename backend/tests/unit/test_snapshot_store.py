@@ -0,0 +1,14 @@
+import pytest
+
+from services.snapshot_store import LocalSnapshotStore, SnapshotStore
+
+def test_snapshot_store_deduplicates(tmp_path):
+    """Identical bodies are stored once and read back unchanged."""
+    with pytest.raises(TypeError):
+        SnapshotStore()
+    store = LocalSnapshotStore(str(tmp_path))
+    html = b"<html><head><title>This is a Perfect Title for SEO</title></head><body><h1>Hi</h1></body></html>"
+    digest = store.put(html)
+    assert store.put(html) == digest
+    assert len(list(tmp_path.rglob("*.gz"))) == 1
+    assert store.get(digest) == html
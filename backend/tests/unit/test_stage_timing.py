@@ -0,0 +1,30 @@
+import time
+
+from services.stage_timing import SamplingProfiler, StageTimings
+
+def test_stage_timings_accumulate_per_stage():
+    timings = StageTimings()
+    with timings.stage("fetch"):
+        time.sleep(0.01)
+    with timings.stage("fetch"):
+        time.sleep(0.01)
+    timings.record("queue_wait", 0.5)
+
+    result = timings.to_dict()
+    assert result["fetch_ms"] >= 20
+    assert result["queue_wait_ms"] == 500.0
+    assert result["total_ms"] >= result["fetch_ms"]
+
+def _busy_loop(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+def test_sampling_profiler_finds_the_hot_function():
+    profiler = SamplingProfiler(interval_seconds=0.001).start()
+    _busy_loop(0.1)
+    profiler.stop()
+
+    result = profiler.to_dict(top=5)
+    assert result["samples"] > 10
+    assert "_busy_loop" in result["stacks"][0]["stack"]
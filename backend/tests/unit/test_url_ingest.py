@@ -0,0 +1,65 @@
+from types import SimpleNamespace
+
+import pytest
+
+from conftest import FakeResult, FakeSession
+from services.url_ingest import iter_staged_rows, iter_upload_lines, parse_url_row
+from services.url_utils import compute_url_key
+
+async def _chunks(*parts):
+    for part in parts:
+        yield part
+
+async def _collect(aiter):
+    return [item async for item in aiter]
+
+@pytest.mark.asyncio
+async def test_upload_lines_are_split_across_chunk_boundaries():
+    # "é" is split between chunks on purpose.
+    chunks = _chunks(b"url\r\nhttp://a.example/caf\xc3", b"\xa9\nb.exa", b"mple\n", b"http://c.example")
+    lines = await _collect(iter_upload_lines(chunks))
+    assert lines == ["url", "http://a.example/café", "b.example", "http://c.example"]
+
+def test_parse_url_row():
+    assert parse_url_row("url") is None
+    assert parse_url_row("   ") is None
+    assert parse_url_row("# comment") is None
+    assert parse_url_row("Example.com/page?utm_source=x,Some label") == "http://example.com/page"
+    assert parse_url_row('"https://example.com/a,b",label') == "https://example.com/a,b"
+    assert parse_url_row("example.com:8080/x") == "http://example.com:8080/x"
+    with pytest.raises(ValueError):
+        parse_url_row("ftp://example.com/file")
+    with pytest.raises(ValueError):
+        parse_url_row("http://")
+    with pytest.raises(ValueError):
+        parse_url_row("http://example.com:99999/x")
+
+@pytest.mark.asyncio
+async def test_staged_rows_are_chunked_and_counted():
+    stats = {"accepted": 0, "invalid": 0}
+    lines = _chunks("url", "a.example", "mailto:someone@example.com", "b.example", "c.example")
+
+    chunks = await _collect(iter_staged_rows("batch_1", lines, chunk_size=2, stats=stats))
+
+    assert stats == {"accepted": 3, "invalid": 1}
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    assert chunks[0][0] == ("batch_1", 0, "http://a.example/", compute_url_key("http://a.example/"), "a.example")
+    assert chunks[1][0][1] == 2
+
+@pytest.mark.asyncio
+async def test_created_batch_reports_are_read_a_page_at_a_time(monkeypatch):
+    from api.v1 import seo_reports
+
+    pages = [
+        FakeResult(rows=[SimpleNamespace(report_id=3, url="https://a.example/"), SimpleNamespace(report_id=7, url="https://b.example/")]),
+        FakeResult(rows=[SimpleNamespace(report_id=9, url="https://c.example/")]),
+        FakeResult(),
+    ]
+    db = FakeSession(pages)
+    monkeypatch.setattr(seo_reports, "SessionLocal", lambda: db)
+
+    reports = await _collect(seo_reports._iter_created_batch_reports("batch_1"))
+
+    assert reports == [(3, "https://a.example/"), (7, "https://b.example/"), (9, "https://c.example/")]
+    # Each page starts after the last report of the previous one.
+    assert [params["after_report_id"] for params in db.params] == [0, 7, 9]
@@ -0,0 +1,26 @@
+from services.url_utils import canonicalize_url, compute_url_key, has_valid_port, url_host
+
+def test_canonicalize_url_normalizes_host_path_and_tracking():
+    """Case, default ports, fragments and tracking params don't change the canonical URL."""
+    assert canonicalize_url("HTTP://Example.com:80") == "http://example.com/"
+    assert canonicalize_url("http://example.com/page?b=2&utm_source=x&a=1#top") == "http://example.com/page?a=1&b=2"
+
+def test_compute_url_key_matches_equivalent_urls():
+    """Equivalent URLs share a key, different pages don't."""
+    key = compute_url_key("http://Example.com/")
+    assert len(key) == 32
+    assert compute_url_key("http://example.com") == key
+    assert compute_url_key("https://example.com/?utm_source=x") == key
+    assert compute_url_key("http://example.com/#section") == key
+    assert compute_url_key("http://example.com/other") != key
+
+def test_invalid_port_keeps_raw_netloc():
+    """An out-of-range port doesn't raise; the URL still gets a key but fails validation."""
+    assert canonicalize_url("http://Example.com:99999/x") == "http://example.com:99999/x"
+    assert len(compute_url_key("http://example.com:99999/x")) == 32
+    assert not has_valid_port("http://example.com:99999/x")
+    assert has_valid_port("http://example.com:8080/x")
+
+def test_url_host_ignores_userinfo_and_port():
+    assert url_host("https://user:pw@Example.com:8443/page") == "example.com"
+    assert url_host("Example.com") == "example.com"
@@ -0,0 +1,65 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from conftest import FakeResult, FakeSession
+from services.url_utils import compute_url_key
+from services.watch_schedule import next_run_at, schedule_offset
+
+NOW = datetime(2026, 10, 19, 12, 0, tzinfo=timezone.utc)
+
+def test_next_run_keeps_a_stable_offset_within_the_interval():
+    url_key = compute_url_key("https://example.com/pricing")
+    first = next_run_at(url_key, 3600, NOW)
+    assert NOW < first <= NOW + timedelta(hours=1)
+    assert first.timestamp() % 3600 == schedule_offset(url_key, 3600)
+
+    # Running late skips to the next slot; running exactly on time moves one interval on.
+    assert next_run_at(url_key, 3600, first + timedelta(minutes=90)) == first + timedelta(hours=2)
+    assert next_run_at(url_key, 3600, first) == first + timedelta(hours=1)
+
+def test_runs_are_spread_across_the_interval():
+    minutes = [0] * 60
+    for i in range(6000):
+        run = next_run_at(compute_url_key(f"https://example.com/page-{i}"), 3600, NOW)
+        minutes[run.minute] += 1
+    # Roughly 100 per minute instead of everything at the top of the hour.
+    assert max(minutes) < 160
+    assert min(minutes) > 50
+
+def _watch(watch_id, url):
+    return SimpleNamespace(
+        id=watch_id, url=url, url_key=compute_url_key(url), interval_seconds=3600, next_run_at=NOW,
+        last_run_at=None, include_ai_insights=False, rule_set="quick", check_links=False, audit_page_weight=False,
+    )
+
+@pytest.mark.asyncio
+async def test_watch_tick_keeps_going_after_a_failed_run(monkeypatch):
+    from api.v1 import seo_reports
+
+    db = FakeSession(FakeResult(scalars=[_watch(1, "https://a.example/"), _watch(2, "https://b.example/")]))
+    started = []
+
+    async def create_or_attach(session, url, options):
+        assert options == "quick"
+        if url == "https://a.example/":
+            raise RuntimeError("database hiccup")
+        return 42, True
+
+    async def analyze(report_id, url, *options, enqueued_at=None):
+        started.append((report_id, url))
+
+    monkeypatch.setattr(seo_reports, "SessionLocal", lambda: db)
+    monkeypatch.setattr(seo_reports, "_create_or_attach_report", create_or_attach)
+    monkeypatch.setattr(seo_reports, "process_seo_analysis", analyze)
+
+    assert await seo_reports.run_watch_tick(NOW) == 2
+    await asyncio.gather(*seo_reports._watch_tasks)
+
+    assert started == [(42, "https://b.example/")]
+    assert db.rollbacks == 1
+    # The failed run goes back to its due time for the next tick.
+    reset = db.statements[1].compile().params
+    assert reset["next_run_at"] == NOW
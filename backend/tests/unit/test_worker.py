@@ -1,12 +1,16 @@
+from unittest.mock import patch
+
 import pytest
 import respx
 from httpx import Response
 
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import sessionmaker
 
-from api.v1.seo_reports import process_seo_analysis
-from models.seo_report import SEOReport
+from api.v1.seo_reports import _create_or_attach_report, process_seo_analysis
+from models.seo_report import InflightReport, SEOReport
+from services.url_utils import compute_url_key
 
 @pytest.mark.asyncio
 @respx.mock
@@ -37,5 +41,27 @@ async def test_process_seo_analysis_integration(db_session: AsyncSession):
         fresh_report = await new_session.get(SEOReport, report.id)
         
         assert fresh_report.status == "completed"
+        assert fresh_report.metrics_status == "completed"
+        assert fresh_report.insights_status == "not_requested"
         assert fresh_report.title == "Test Title"
-        assert fresh_report.seo_score is not None
\ No newline at end of file
+        assert fresh_report.seo_score is not None
+        assert {"status_update_ms", "fetch_ms", "analyze_ms", "commit_ms", "total_ms"} <= set(fresh_report.stage_timings)
+@pytest.mark.asyncio
+@respx.mock
+async def test_failed_metrics_commit_marks_report_failed(db_session: AsyncSession):
+    """A commit that fails mid-analysis is rolled back and the report ends up failed, not stuck processing."""
+    url = "http://commit-fails.example.com/"
+    report_id, _ = await _create_or_attach_report(db_session, url)
+    respx.get(url).mock(return_value=Response(200, text="<html><head><title>T</title></head><body></body></html>"))
+
+    async def add_unwritable_row(db, *args):
+        db.add(SEOReport(url="http://example.com/" + "x" * 600))  # longer than String(500)
+
+    with patch("api.v1.seo_reports.replace_page_links", add_unwritable_row):
+        await process_seo_analysis(report_id=report_id, url=url, include_ai_insights=False)
+
+    db_session.expire_all()
+    report = await db_session.get(SEOReport, report_id)
+    assert report.status == "failed" and report.metrics_status == "failed"
+    guard = await db_session.scalar(select(InflightReport).filter(InflightReport.url_key == compute_url_key(url)))
+    assert guard is None